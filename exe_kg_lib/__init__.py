@@ -1,4 +1,19 @@
 # Copyright (c) 2022 Robert Bosch GmbH
 # SPDX-License-Identifier: AGPL-3.0
 
-from .classes import *
+import importlib
+from typing import Any, List
+
+__all__ = ["ExeKGConstructor", "ExeKGExecutor", "ExeKGConExe", "ExeKGEditor"]
+
+
+def __getattr__(name: str) -> Any:
+    # the actors are imported on first access, so that e.g. importing exe_kg_lib.config or the CLI stays fast, see PEP 562
+    if name in __all__:
+        return getattr(importlib.import_module(".classes", __name__), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -1,7 +1,19 @@
 # Copyright (c) 2022 Robert Bosch GmbH
 # SPDX-License-Identifier: AGPL-3.0
 
-from .exe_kg_actors import (ExeKGConExe, ExeKGConstructor, ExeKGEditor,
-                            ExeKGExecutor)
+import importlib
+from typing import Any, List
 
 __all__ = ["ExeKGConstructor", "ExeKGExecutor", "ExeKGConExe", "ExeKGEditor"]
+
+
+def __getattr__(name: str) -> Any:
+    # the actors (and with them rdflib, pandas and the task modules) are imported on first access, see PEP 562
+    if name in __all__:
+        return getattr(importlib.import_module(".exe_kg_actors", __name__), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
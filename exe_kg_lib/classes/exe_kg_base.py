@@ -1,35 +1,30 @@
 # Copyright (c) 2022 Robert Bosch GmbH
 # SPDX-License-Identifier: AGPL-3.0
 
-from typing import List
+from typing import Iterable, List, Optional, Union
 
-from rdflib import Graph
+from rdflib import Graph, URIRef
 
 from exe_kg_lib.classes.exe_kg_serialization.pipeline import Pipeline
-from exe_kg_lib.config import KG_SCHEMAS
 
-from ..utils.query_utils import query_subclasses_of
 from .entity import Entity
-from .kg_schema import KGSchema
+from .schema_registry import get_schema_registry
+from .validation_policy import ValidationPolicy
 
 
 class ExeKGBase:
-    def __init__(self):
+    def __init__(self, validation_policy: Union[ValidationPolicy, str] = None):
         """
 
         Args:
-            input_exe_kg_path: path of KG to be executed
-                               acts as switch for KG execution mode (if filled, mode is on)
+            validation_policy: when the ExeKG is validated during construction, execution, editing and saving,
+                               either a ValidationPolicy or its mode ("always", "once" or "never")
+                               defaults to config.VALIDATION_POLICY
         """
-        self.top_level_schema = KGSchema.from_schema_info(KG_SCHEMAS["Data Science"])  # top-level KG schema
-        self.bottom_level_schemata = {}
-        for schema_name, schema_info in KG_SCHEMAS.items():  # search for used bottom-level schema
-            if (
-                schema_name == "Data Science"  # or schema_name == "Visualization"
-            ):  # skip top-level KG schema and Visualization schema that is always used
-                continue
-
-            self.bottom_level_schemata[schema_info["namespace_prefix"]] = KGSchema.from_schema_info(schema_info)
+        # KG schemata are parsed once per process and shared among all ExeKGBase objects
+        self.schema_registry = get_schema_registry()
+        self.top_level_schema = self.schema_registry.top_level_schema  # top-level KG schema
+        self.bottom_level_schemata = self.schema_registry.bottom_level_schemata
 
         # top-level KG schema entities
         self.atomic_task = Entity(self.top_level_schema.namespace.AtomicTask)
@@ -41,29 +36,23 @@ class ExeKGBase:
         self.data_semantics = Entity(self.top_level_schema.namespace.DataSemantics)
         self.data_structure = Entity(self.top_level_schema.namespace.DataStructure)
 
-        # self.input_kg: KG eventually filled with 3 KG schemas and the input executable KG in case of KG execution
-        self.input_kg = Graph(bind_namespaces="rdflib")
+        # self.input_kg: shared read-only graph with all KG schemas
+        #                in case of KG execution, it is replaced by a view with the input executable KG layered on top
+        self.input_kg = self.schema_registry.kg
 
         # self.shacl_shapes_s: string containing SHACL shapes of all KG schemas
-        self.shacl_shapes_s = self.top_level_schema.shacl_shapes_s
-
-        # bottom_level_schemata_kgs = [kg_schema.kg for kg_schema in self.bottom_level_schemata.values()]
-        bottom_level_schemata_kgs = []
-        for kg_schema in self.bottom_level_schemata.values():
-            bottom_level_schemata_kgs.append(kg_schema.kg)
-            bottom_level_schemata_kgs.append(kg_schema.generated_schema_kg)
-            self.shacl_shapes_s += kg_schema.shacl_shapes_s
+        self.shacl_shapes_s = self.schema_registry.shacl_shapes_s
 
-        self.input_kg += self.top_level_schema.kg  # + self.visu_schema.kg  # combine all KG schemas in input KG
+        # self.shacl_shapes_kg: shared read-only graph with the parsed SHACL shapes of all KG schemas, used for validation
+        self.shacl_shapes_kg = self.schema_registry.shacl_shapes_kg
 
-        for bottom_level_schema_kg in bottom_level_schemata_kgs:
-            self.input_kg += bottom_level_schema_kg
+        self.validation_policy = ValidationPolicy.create(validation_policy)
 
         self.exe_kg = Graph(bind_namespaces="rdflib")  # variable to store the constructed ExeKG
         self.pipeline_instance = None  # variable to store pipeline's metadata
         self.pipeline_serializable = Pipeline()  # simplified version of pipeline for serialization purposes
 
-        self._bind_used_namespaces([self.input_kg, self.exe_kg])
+        self._bind_used_namespaces([self.exe_kg])
 
         # below variables are filled in self._parse_kgs()
         self.task_type_dict = {}  # dict for uniquely naming each new pipeline task
@@ -100,37 +89,47 @@ class ExeKGBase:
                     bottom_level_kg_schema.namespace,
                 )
 
+    def _check_executability(self, focus_nodes: Optional[Iterable[URIRef]] = None) -> None:
+        """
+        Validates the ExeKG according to self.validation_policy
+
+        Args:
+            focus_nodes: if given, only these nodes are validated (see check_pipeline_executability())
+        """
+        self.validation_policy.check_pipeline_executability(
+            self.exe_kg,
+            self.input_kg,
+            self.shacl_shapes_kg,
+            self.schema_registry.validation_fingerprint,
+            focus_nodes,
+        )
+
     def _parse_kgs(self) -> None:
         """
         Fills lists with subclasses of top-level KG schema classes and initializes dicts used for unique naming
         """
-        atomic_task_subclasses = query_subclasses_of(self.atomic_task.iri, self.input_kg)
-        for t in list(atomic_task_subclasses):
-            task = Entity(t[0], self.atomic_task)
+        for t in self.schema_registry.get_subclasses(self.atomic_task.iri):
+            task = Entity(t, self.atomic_task)
             self.atomic_task_list.append(task)
             self.task_type_dict[task.name] = 1
 
-        atomic_method_subclasses = query_subclasses_of(self.atomic_method.iri, self.input_kg)
-        for m in list(atomic_method_subclasses):
-            method = Entity(m[0], self.atomic_method)
+        for m in self.schema_registry.get_subclasses(self.atomic_method.iri):
+            method = Entity(m, self.atomic_method)
             self.atomic_method_list.append(method)
             self.method_type_dict[method.name] = 1
 
-        data_type_subclasses = query_subclasses_of(self.data_entity.iri, self.input_kg)
-        for d in list(data_type_subclasses):
-            data_type = Entity(d[0], self.data_entity)
+        for d in self.schema_registry.get_subclasses(self.data_entity.iri):
+            data_type = Entity(d, self.data_entity)
             self.data_type_list.append(data_type)
 
-        data_semantics_subclasses = query_subclasses_of(self.data_semantics.iri, self.top_level_schema.kg)
-        for d in list(data_semantics_subclasses):
-            if d[0] == self.data_entity.iri:
+        for d in self.schema_registry.get_subclasses(self.data_semantics.iri, top_level_only=True):
+            if d == self.data_entity.iri:
                 continue
-            data_semantics = Entity(d[0], self.data_semantics)
+            data_semantics = Entity(d, self.data_semantics)
             self.data_semantics_list.append(data_semantics)
 
-        data_structure_subclasses = query_subclasses_of(self.data_structure.iri, self.top_level_schema.kg)
-        for d in list(data_structure_subclasses):
-            if d[0] == self.data_entity.iri:
+        for d in self.schema_registry.get_subclasses(self.data_structure.iri, top_level_only=True):
+            if d == self.data_entity.iri:
                 continue
-            data_structure = Entity(d[0], self.data_structure)
+            data_structure = Entity(d, self.data_structure)
             self.data_structure_list.append(data_structure)
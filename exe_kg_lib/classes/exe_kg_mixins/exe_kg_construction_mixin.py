@@ -4,7 +4,7 @@
 import os
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Union
 
 from rdflib import XSD, Graph, Literal, Namespace
 
@@ -18,7 +18,6 @@ from exe_kg_lib.utils.kg_creation_utils import (
     add_and_attach_data_entity, add_data_entity_instance,
     add_instance_from_parent_with_relation, add_literal, create_pipeline_task,
     deserialize_input_entity_info_dict, field_value_to_literal, save_exe_kg)
-from exe_kg_lib.utils.kg_validation_utils import check_kg_executability
 from exe_kg_lib.utils.query_utils import (NoResultsError,
                                           get_grouped_inherited_inputs,
                                           get_grouped_inherited_outputs,
@@ -55,6 +54,8 @@ class ExeKGConstructionMixin:
     last_created_task: Union[None, Task]
     canvas_task_created: bool
     shacl_shapes_s: str
+    shacl_shapes_kg: Graph
+    _check_executability: Callable[..., None]
 
     def create_pipeline_task(self, pipeline_name: str, input_data_path: str, plots_output_dir: str) -> Task:
         """
@@ -444,16 +445,19 @@ class ExeKGConstructionMixin:
 
         Args:
             dir_path (str): The directory path where the files will be saved.
+            check_executability (bool, optional): Whether to validate the ExeKG according to self.validation_policy before saving it.
         """
+        if check_executability:
+            self._check_executability()
 
         save_exe_kg(
             self.exe_kg,
             self.input_kg,
-            self.shacl_shapes_s,
+            self.shacl_shapes_kg,
             self.pipeline_serializable,
             dir_path,
             self.pipeline_serializable.name,
-            check_executability,
+            check_executability=False,
         )
 
     def name_instance(
@@ -547,7 +551,7 @@ class ExeKGConstructionMixin:
 
             pos_per_task_type[task.task_type] = pos + 1
 
-        check_kg_executability(self.exe_kg + self.input_kg, self.shacl_shapes_s)
+        self._check_executability()
 
         return self.exe_kg
 
@@ -4,7 +4,7 @@
 import os
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Set, Tuple, Union
 
 from rdflib import RDF, Graph, URIRef
 
@@ -14,6 +14,7 @@ from exe_kg_lib.classes.exe_kg_serialization.pipeline import Pipeline
 from exe_kg_lib.classes.kg_schema import KGSchema
 from exe_kg_lib.classes.method import Method
 from exe_kg_lib.classes.task import Task
+from exe_kg_lib.classes.validation_policy import ValidationPolicy
 from exe_kg_lib.utils.kg_creation_utils import (add_data_entity_instance,
                                                 add_relation,
                                                 field_value_to_literal,
@@ -27,6 +28,8 @@ class ExeKGEditMixin:
     # see exe_kg_lib/classes/exe_kg_base.py for the definition of these attributes
     exe_kg: Graph
     input_kg: Graph
+    shacl_shapes_kg: Graph
+    _check_executability: Callable[..., None]
     top_level_schema: KGSchema
     bottom_level_schemata: Dict[str, KGSchema]
     atomic_task: Entity
@@ -48,8 +51,9 @@ class ExeKGEditMixin:
     ]
     clear_created_kg: Callable[[], None]
 
-    def __init__(self, input_exe_kg_path: str = None) -> None:
-        super().__init__()
+    def __init__(self, input_exe_kg_path: str = None, validation_policy: Union[ValidationPolicy, str] = None) -> None:
+        super().__init__(validation_policy)
+        self.saved_triples = set()
 
         if input_exe_kg_path:
             self.load_exe_kg(input_exe_kg_path)
@@ -70,6 +74,27 @@ class ExeKGEditMixin:
         self.exe_kg = load_exe_kg(
             input_exe_kg_path, self.create_exe_kg_from_json if input_exe_kg_path.endswith(".json") else None
         )
+        # triples of the ExeKG as last loaded or saved, used for finding the nodes touched by edits
+        self.saved_triples = set(self.exe_kg)
+
+    def get_touched_nodes(self) -> Set[URIRef]:
+        """
+        Returns the nodes of the ExeKG that were touched by edits since it was last loaded or saved,
+        i.e. the subjects and IRI objects of the triples that were added or removed,
+        and the nodes that refer to them (whose shapes may constrain the touched nodes, e.g. with sh:class).
+
+        Returns:
+            Set[URIRef]: The IRIs of the touched nodes.
+        """
+        touched_nodes = set()
+        for s, _, o in set(self.exe_kg) ^ self.saved_triples:
+            touched_nodes.add(s)
+            if isinstance(o, URIRef):
+                touched_nodes.add(o)
+        touched_nodes.update({subject for node in touched_nodes for subject in self.exe_kg.subjects(None, node)})
+
+        # nodes that were removed completely cannot be validated
+        return {node for node in touched_nodes if isinstance(node, URIRef) and (node, None, None) in self.exe_kg}
 
     def update_metric_values(self, output_name_value_dict: Dict[str, Union[str, int, float, bool]]) -> None:
         """
@@ -252,25 +277,34 @@ class ExeKGEditMixin:
 
         return old_name, new_name
 
-    def apply_changes_to_ttl(self, new_path: str = None, check_executability: bool = True) -> None:
+    def apply_changes_to_ttl(
+        self, new_path: str = None, check_executability: bool = True, incremental_check: bool = False
+    ) -> None:
         """
         Applies the changes made to the ExeKG and saves it to a TTL file.
 
         Args:
             new_path (str, optional): The new path to save the TTL file. If not provided, the input_exe_kg_path will be used. Defaults to None.
-            check_executability (bool, optional): Flag indicating whether to check the executability of the saved TTL file. Defaults to True.
+            check_executability (bool, optional): Flag indicating whether to check the executability of the saved TTL file
+                                                  according to self.validation_policy. Defaults to True.
+            incremental_check (bool, optional): Flag indicating whether to validate only the nodes touched by edits (see get_touched_nodes()),
+                                                assuming that the loaded ExeKG was executable. Defaults to False.
         """
         path_to_save = self.input_exe_kg_path if not new_path else new_path
         pipeline_name = os.path.basename(path_to_save).split(".")[0]
 
+        if check_executability:
+            self._check_executability(self.get_touched_nodes() if incremental_check else None)
+
         save_exe_kg(
             self.exe_kg,
             self.input_kg,
-            self.shacl_shapes_s,
+            self.shacl_shapes_kg,
             None,
             os.path.dirname(path_to_save),
             pipeline_name,
-            check_executability,
+            check_executability=False,
             save_to_ttl=True,
             save_to_json=False,
         )
+        self.saved_triples = set(self.exe_kg)
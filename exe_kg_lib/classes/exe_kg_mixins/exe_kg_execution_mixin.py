@@ -7,34 +7,26 @@ import os
 import pickle
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Callable, Dict, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
-import pandas as pd
-from rdflib import XSD, Graph, Literal, URIRef
+from rdflib import RDF, XSD, Graph, Literal, URIRef
 
+from exe_kg_lib import config
 from exe_kg_lib.classes.data_entity import DataEntity
 from exe_kg_lib.classes.entity import Entity
 from exe_kg_lib.classes.exe_kg_mixins.exe_kg_construction_mixin import \
     ExeKGConstructionMixin
+from exe_kg_lib.classes.execution_batch import run_execution_plans
+from exe_kg_lib.classes.execution_plan import ExecutionPlan
 from exe_kg_lib.classes.kg_schema import KGSchema
 from exe_kg_lib.classes.method import Method
+from exe_kg_lib.classes.schema_registry import SchemaRegistry
 from exe_kg_lib.classes.task import Task
 from exe_kg_lib.classes.tasks import ml_tasks, statistic_tasks, visual_tasks
 from exe_kg_lib.utils.kg_creation_utils import load_exe_kg, save_exe_kg
 from exe_kg_lib.utils.kg_edit_utils import update_metric_values
-from exe_kg_lib.utils.kg_validation_utils import check_kg_executability
 from exe_kg_lib.utils.query_utils import (NoResultsError,
-                                          get_converted_module_hierarchy_chain,
-                                          get_first_query_result_if_exists,
-                                          get_method_by_task_iri,
-                                          get_pipeline_and_first_task_iri,
-                                          query_data_entity_reference_iri,
-                                          query_input_triples,
-                                          query_instance_parent_iri,
-                                          query_method_params,
-                                          query_output_triples,
-                                          query_parameters_triples,
-                                          query_top_level_task_iri)
+                                          get_pipeline_and_first_task_iri)
 from exe_kg_lib.utils.string_utils import property_iri_to_field_name
 
 
@@ -42,12 +34,53 @@ class ExeKGExecutionMixin:
     # see exe_kg_lib/classes/exe_kg_base.py for the definition of these attributes
     input_kg: Graph
     exe_kg: Graph
+    schema_registry: SchemaRegistry
     top_level_schema: KGSchema
     bottom_level_schemata: Dict[str, KGSchema]
     shacl_shapes_s: str
+    shacl_shapes_kg: Graph
+    _check_executability: Callable[..., None]
     # see exe_kg_lib/classes/exe_kg_mixins/exe_kg_construction_mixin.py for the definition of this attribute
     create_exe_kg_from_json: Callable[[ExeKGConstructionMixin, Union[Path, TextIOWrapper, str]], Graph]
 
+    def _get_instance_parent_iri(
+        self, instance_iri: str, upper_class_iri: URIRef, negation_of_inheritance: bool = False
+    ) -> Optional[str]:
+        """
+        Returns the first type of the given instance that is a subclass of the given upper class.
+        Equivalent of query_instance_parent_iri() that uses the precomputed schema index instead of SPARQL.
+
+        Args:
+            instance_iri (str): The IRI of the instance.
+            upper_class_iri (URIRef): The IRI of the upper class.
+            negation_of_inheritance (bool, optional): If True, the first type that is NOT a subclass of the upper class is returned.
+                                                      Defaults to False.
+
+        Returns:
+            Optional[str]: The IRI of the type if it exists, otherwise None.
+        """
+        for type_iri in self.input_kg.objects(URIRef(instance_iri), RDF.type):
+            if self.schema_registry.index.is_subclass_of(type_iri, upper_class_iri) != negation_of_inheritance:
+                return str(type_iri)
+
+        return None
+
+    def _get_triples_by_properties(self, subject_iri: str, property_iris: Set[URIRef]) -> List[Tuple]:
+        """
+        Returns the triples of the given subject whose property is one of the given properties.
+
+        Args:
+            subject_iri (str): The IRI of the subject.
+            property_iris (Set[URIRef]): The IRIs of the properties.
+
+        Returns:
+            List[Tuple]: The matching triples without duplicates.
+        """
+        subject = URIRef(subject_iri)
+        return list(
+            dict.fromkeys((subject, p, o) for p, o in self.input_kg.predicate_objects(subject) if p in property_iris)
+        )
+
     def _property_value_to_field_value(self, property_value: Union[str, Literal]) -> Union[str, DataEntity, Method]:
         """
         Converts a property value (from the KG) to a Python field value.
@@ -67,38 +100,24 @@ class ExeKGExecutionMixin:
         property_value_s = str(property_value)
 
         # fetch type of entity with given IRI, assuming it's a DataEntity instance
-        query_result = get_first_query_result_if_exists(
-            query_instance_parent_iri,
-            self.input_kg,
-            property_value_s,
-            self.top_level_schema.namespace.DataEntity,
+        data_entity_parent_iri = self._get_instance_parent_iri(
+            property_value_s, self.top_level_schema.namespace.DataEntity
         )
-        if query_result is not None:
-            data_entity_parent_iri = str(query_result[0])
+        if data_entity_parent_iri is not None:
             return self._parse_data_entity_by_iri(property_value_s, data_entity_parent_iri)
 
         # fetch type of entity with given IRI, assuming it's an AtomicMethod instance
-        query_result = get_first_query_result_if_exists(
-            query_instance_parent_iri,
-            self.input_kg,
-            property_value_s,
-            self.top_level_schema.namespace.AtomicMethod,
-        )
+        method_parent_iri = self._get_instance_parent_iri(property_value_s, self.top_level_schema.namespace.AtomicMethod)
 
-        if query_result is None:
+        if method_parent_iri is None:
             return property_value_s
 
-        method_parent_iri = str(query_result[0])
-
         # fetch another type associated with the entity identified by the given IRI
-        query_result = get_first_query_result_if_exists(
-            query_instance_parent_iri,
-            self.input_kg,
+        method_extra_parent_iri = self._get_instance_parent_iri(
             property_value_s,
             self.top_level_schema.namespace.AtomicMethod,
             True,  # negation of inheritance, so the parent that does not inherit AtomicMethod is returned
         )
-        method_extra_parent_iri = str(query_result[0]) if query_result is not None else None
         if method_extra_parent_iri is None:
             raise NoResultsError(
                 f"For method with iri {property_value_s}, cannot retrieve extra parent entity that is not a subclass of AtomicMethod"
@@ -108,13 +127,11 @@ class ExeKGExecutionMixin:
         #       this is important for correctly parsing each task's inputs during pipeline execution (see get_inputs() in Task class)
         method = Method(property_value_s, Entity(method_extra_parent_iri))
 
-        method.module_chain = get_converted_module_hierarchy_chain(
-            self.input_kg, self.top_level_schema.namespace_prefix, method_parent_iri
-        )
+        method.module_chain = self.schema_registry.index.get_module_chain(method_parent_iri)
 
         # triples for the parameters attached to the method of this task
-        method_related_triples = list(
-            query_parameters_triples(self.input_kg, self.top_level_schema.namespace_prefix, method.iri)
+        method_related_triples = self._get_triples_by_properties(
+            method.iri, self.schema_registry.index.parameter_properties
         )
         for s, p, o in method_related_triples:
             # parse property IRI and value
@@ -166,17 +183,14 @@ class ExeKGExecutionMixin:
             DataEntity: The parsed DataEntity object.
         """
         # fetch IRI of data entity that is referenced by the given entity
-        query_result = get_first_query_result_if_exists(
-            query_data_entity_reference_iri,
-            self.input_kg,
-            self.top_level_schema.namespace_prefix,
-            data_entity_instance_iri,
+        data_entity_ref_iri = self.input_kg.value(
+            URIRef(data_entity_instance_iri), self.top_level_schema.namespace.hasReference
         )
 
-        if query_result is None:  # no referenced data entity found
+        if data_entity_ref_iri is None:  # no referenced data entity found
             data_entity_ref_iri = data_entity_instance_iri
         else:
-            data_entity_ref_iri = str(query_result[0])
+            data_entity_ref_iri = str(data_entity_ref_iri)
 
         # create DataEntity object to store all the parsed properties
         data_entity = DataEntity(data_entity_instance_iri, Entity(data_entity_parent_iri))
@@ -190,6 +204,15 @@ class ExeKGExecutionMixin:
             field_value = self._property_value_to_field_value(str(o))
             setattr(data_entity, field_name, field_value)  # set field value dynamically
 
+        # data semantics and data structure are attached to the referenced data entity as additional types
+        for type_iri in self.input_kg.objects(URIRef(data_entity_ref_iri), RDF.type):
+            if self.schema_registry.index.is_strict_subclass_of(type_iri, self.top_level_schema.namespace.DataSemantics):
+                data_entity.data_semantics = str(type_iri)
+            elif self.schema_registry.index.is_strict_subclass_of(
+                type_iri, self.top_level_schema.namespace.DataStructure
+            ):
+                data_entity.data_structure = str(type_iri)
+
         return data_entity
 
     def _parse_method_of_task(self, task_iri: str) -> Method:
@@ -201,17 +224,24 @@ class ExeKGExecutionMixin:
 
         Returns:
             Method: The parsed method object.
+
+        Raises:
+            NoResultsError: If the task is not connected with any method or the method doesn't have a type that is a subclass of AtomicMethod.
         """
-        method = get_method_by_task_iri(
-            self.input_kg,
-            self.top_level_schema.namespace_prefix,
-            self.top_level_schema.namespace,
-            task_iri,
-        )
+        method_triples = self._get_triples_by_properties(task_iri, self.schema_registry.index.method_properties)
+        if not method_triples:
+            raise NoResultsError(f"Task with IRI {task_iri} isn't connected with any method in the KG")
 
-        method.module_chain = get_converted_module_hierarchy_chain(
-            self.input_kg, self.top_level_schema.namespace_prefix, method.parent_entity.iri
-        )
+        method_iri = str(method_triples[0][2])
+
+        method_parent_iri = self._get_instance_parent_iri(method_iri, self.top_level_schema.namespace.AtomicMethod)
+        if method_parent_iri is None:
+            raise NoResultsError(
+                f"Method with IRI {method_iri} doesn't have a type that is a subclass of {str(self.top_level_schema.namespace.AtomicMethod)}"
+            )
+
+        method = Method(method_iri, Entity(method_parent_iri))
+        method.module_chain = self.schema_registry.index.get_module_chain(method.parent_entity.iri)
 
         return method
 
@@ -234,33 +264,16 @@ class ExeKGExecutionMixin:
             NoResultsError: If the given IRI does not belong to an instance of a sub-class of self.top_level_schema.namespace.AtomicTask.
         """
         # fetch type of entity with given IRI
-        query_result = get_first_query_result_if_exists(
-            query_instance_parent_iri,
-            self.input_kg,
-            task_iri,
-            self.top_level_schema.namespace.AtomicTask,
-        )
+        task_parent_iri = self._get_instance_parent_iri(task_iri, self.top_level_schema.namespace.AtomicTask)
 
         if (
-            query_result is None
+            task_parent_iri is None
         ):  # given IRI does not belong to an instance of a sub-class of self.top_level_schema.namespace.AtomicTask
             raise NoResultsError(f"Cannot retrieve parent of task with iri {task_iri}")
 
-        task_parent_iri = str(query_result[0])
-
-        query_result = get_first_query_result_if_exists(
-            query_top_level_task_iri,
-            self.input_kg,
-            task_parent_iri,
-            self.top_level_schema.namespace_prefix,
-        )
-
-        if (
-            query_result is None
-        ):  # given IRI does not belong to an instance of a sub-class of self.top_level_schema.namespace.AtomicTask
+        task_top_level_parent_iri = self.schema_registry.index.get_top_level_task_iri(task_parent_iri)
+        if task_top_level_parent_iri is None:
             task_top_level_parent_iri = task_parent_iri
-        else:
-            task_top_level_parent_iri = str(query_result[0])
 
         task_top_level_parent = Entity(task_top_level_parent_iri, None)
 
@@ -286,32 +299,24 @@ class ExeKGExecutionMixin:
         method = self._parse_method_of_task(task_iri)
         task.method = method
 
+        schema_index = self.schema_registry.index
         # input triples
-        task_related_triples = list(
-            query_input_triples(self.input_kg, self.top_level_schema.namespace_prefix, task_iri)
-        )
+        task_related_triples = self._get_triples_by_properties(task_iri, schema_index.input_properties)
         # output triples
-        task_related_triples += list(
-            query_output_triples(self.input_kg, self.top_level_schema.namespace_prefix, task_iri)
-        )
+        task_related_triples += self._get_triples_by_properties(task_iri, schema_index.output_properties)
         # triple connecting this task with the next one in the pipeline
-        task_related_triples += list(
-            self.input_kg.triples((URIRef(task_iri), self.top_level_schema.namespace.hasNextTask, None))
+        task_related_triples += self._get_triples_by_properties(
+            task_iri, {self.top_level_schema.namespace.hasNextTask}
         )
         # triples for the parameters attached to the method of this task
         method_related_triples = (
-            list(query_parameters_triples(self.input_kg, self.top_level_schema.namespace_prefix, method.iri))
+            self._get_triples_by_properties(method.iri, schema_index.parameter_properties)
             if method is not None
             else []
         )
 
         # data properties attached to the method's class
-        method_class_data_properties = list(
-            query_method_params(method.parent_entity.iri, self.top_level_schema.namespace_prefix, self.input_kg)
-        )
-        method_class_data_property_iris = None
-        if method_class_data_properties:
-            method_class_data_property_iris = [str(pair[0]) for pair in method_class_data_properties]
+        method_class_data_property_iris = schema_index.get_method_params(method.parent_entity.iri)
         for s, p, o in itertools.chain(task_related_triples, method_related_triples):
             # parse property IRI and value
             field_name = property_iri_to_field_name(str(p))
@@ -325,66 +330,208 @@ class ExeKGExecutionMixin:
                 setattr(task, field_name, field_value)
             else:  # method parameter
                 # separate method class data properties from inherited ones
-                if method_class_data_property_iris and str(p) in method_class_data_property_iris:
+                if p in method_class_data_property_iris:
                     task.method.params_dict[field_name] = field_value
                 else:
                     task.method.inherited_params_dict[field_name] = field_value
 
         return task
 
-    def execute_pipeline(self, input_exe_kg_path: str) -> None:
+    def compile_pipeline(self, input_exe_kg_path: str) -> ExecutionPlan:
         """
-        Executes the pipeline by parsing the input ExeKG task-by-task.
+        Compiles the pipeline of the input ExeKG into an execution plan by validating the ExeKG and parsing it task-by-task.
 
         Args:
             input_exe_kg_path (str): The path to the input ExeKG file.
 
         Raises:
-            ValueError: If the input data file format is not supported.
+            RuntimeError: If the parsing of a task fails.
 
         Returns:
-            None
+            ExecutionPlan: The compiled execution plan.
         """
         self.exe_kg = load_exe_kg(
             input_exe_kg_path, self.create_exe_kg_from_json if input_exe_kg_path.endswith(".json") else None
         )
 
-        self.input_kg += self.exe_kg
-        check_kg_executability(self.input_kg, self.shacl_shapes_s)
+        # layer the ExeKG on top of the shared KG schemata instead of copying them
+        self.input_kg = self.schema_registry.layer(self.exe_kg)
+        self._check_executability()
 
         pipeline_iri, input_data_path, plots_output_dir, next_task_iri = get_pipeline_and_first_task_iri(
             self.input_kg, self.top_level_schema.namespace_prefix
         )
-        if input_data_path.endswith(".csv"):
-            input_data = pd.read_csv(input_data_path, delimiter=",", encoding="ISO-8859-1")
-        elif input_data_path.endswith(".pq") or input_data_path.endswith(".parquet"):
-            input_data = pd.read_parquet(input_data_path)
-        else:
-            raise ValueError(f"Unsupported file format for input data: {input_data_path}")
 
         canvas_task = None  # stores Task object that corresponds to a task of type CanvasTask
-        task_output_dict = {}  # gradually filled with outputs of executed tasks
+        tasks = []
         while next_task_iri is not None:
             try:
                 next_task = self._parse_task_by_iri(next_task_iri, plots_output_dir, canvas_task)
             except NoResultsError as e:
                 raise RuntimeError(f"{e}\n\nParsing of task with IRI {next_task_iri} failed with the above exception")
 
-            try:
-                output = next_task.run_method(task_output_dict, input_data)
-            except NotImplementedError as e:
-                raise RuntimeError(
-                    f"{e}\n\nExecution of method for task {next_task_iri} failed with the above exception"
-                )
-
-            if output:
-                task_output_dict.update(output)
+            tasks.append(next_task)
 
             if next_task.type == "CanvasCreation":
                 canvas_task = next_task
 
             next_task_iri = next_task.next_task
 
+        return ExecutionPlan(
+            str(pipeline_iri),
+            str(input_data_path),
+            str(plots_output_dir),
+            tasks,
+            source_hash=ExecutionPlan.hash_source(input_exe_kg_path),
+            schema_fingerprint=self.schema_registry.fingerprint,
+        )
+
+    def execute_pipeline(
+        self,
+        input_exe_kg_path: str,
+        use_plan_cache: bool = True,
+        save_results: bool = True,
+        pool_type: str = None,
+        max_workers: int = None,
+        stream_chunk_size: int = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes the pipeline of the input ExeKG.
+        The pipeline is first compiled into an execution plan that is cached in config.CACHE_DIR (see ExecutionPlan.get_path()).
+        If the cached plan is up-to-date (same ExeKG content and KG schemata), parsing and validation of the ExeKG are skipped.
+
+        Args:
+            input_exe_kg_path (str): The path to the input ExeKG file.
+            use_plan_cache (bool, optional): Whether to use and update the cached execution plan. Defaults to True.
+            save_results (bool, optional): Whether to store the metric values in the ExeKG and save it. Defaults to True.
+            pool_type (str, optional): The pool for executing independent tasks concurrently ("thread", "process" or "sequential").
+                                       Defaults to config.EXECUTION_POOL_TYPE.
+            max_workers (int, optional): The maximum number of concurrently executed tasks. Defaults to config.EXECUTION_MAX_WORKERS.
+            stream_chunk_size (int, optional): If given, the input data are read and processed in chunks of this many rows
+                                               (see ExecutionPlan.run_streaming()). Defaults to config.STREAM_CHUNK_SIZE.
+
+        Raises:
+            ValueError: If the input data file format is not supported, or if a task cannot be executed on chunks of data.
+
+        Returns:
+            Dict[str, Any]: The outputs of the executed tasks that are still held at the end (see ExecutionPlan.run()), keyed by output name.
+        """
+        plan, is_plan_cached = self._get_execution_plan(input_exe_kg_path, use_plan_cache)
+
+        if stream_chunk_size is None:
+            stream_chunk_size = config.STREAM_CHUNK_SIZE
+        if stream_chunk_size is not None:
+            task_output_dict = plan.run_streaming(stream_chunk_size)
+        else:
+            task_output_dict = plan.run(
+                pool_type=pool_type, max_workers=max_workers, retained_output_names=_get_metric_output_names(plan)
+            )
+
+        if save_results:
+            # the ExeKG has not been loaded if the plan was cached
+            self._save_pipeline_results(input_exe_kg_path, plan, task_output_dict, is_plan_cached, use_plan_cache)
+
+        return task_output_dict
+
+    def execute_pipelines(
+        self,
+        input_exe_kg_paths: List[str],
+        use_plan_cache: bool = True,
+        save_results: bool = True,
+        max_workers: int = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Executes the pipelines of multiple input ExeKGs as a batch (see execution_batch.run_execution_plans()).
+        The KG schemata and each input data file are loaded once, tasks that are identical in several pipelines
+        (e.g. a common Concatenation and DataSplitting prefix) are executed once, and the remaining tasks of each pipeline
+        are executed in a process pool.
+
+        Args:
+            input_exe_kg_paths (List[str]): The paths to the input ExeKG files (.ttl or .json).
+            use_plan_cache (bool, optional): Whether to use and update the cached execution plans. Defaults to True.
+            save_results (bool, optional): Whether to store the metric values in the ExeKGs and save them. Defaults to True.
+            max_workers (int, optional): The maximum number of worker processes. Defaults to config.EXECUTION_MAX_WORKERS.
+
+        Raises:
+            ValueError: If an input data file format is not supported.
+
+        Returns:
+            List[Dict[str, Any]]: The outputs of the executed tasks of each pipeline that are still held at the end
+                                  (see ExecutionPlan.run()), in the order of input_exe_kg_paths.
+        """
+        plans = []
+        is_plan_cached_list = []
+        for input_exe_kg_path in input_exe_kg_paths:
+            plan, is_plan_cached = self._get_execution_plan(input_exe_kg_path, use_plan_cache)
+            plans.append(plan)
+            is_plan_cached_list.append(is_plan_cached)
+
+        task_output_dicts = run_execution_plans(
+            plans, max_workers=max_workers, retained_output_names=[_get_metric_output_names(plan) for plan in plans]
+        )
+
+        if save_results:
+            for input_exe_kg_path, plan, task_output_dict in zip(input_exe_kg_paths, plans, task_output_dicts):
+                # self.exe_kg holds at most the ExeKG that was compiled last, so each ExeKG is reloaded
+                self._save_pipeline_results(input_exe_kg_path, plan, task_output_dict, True, use_plan_cache)
+
+        return task_output_dicts
+
+    def _get_execution_plan(self, input_exe_kg_path: str, use_plan_cache: bool) -> Tuple[ExecutionPlan, bool]:
+        """
+        Loads the cached execution plan of the input ExeKG if it is up-to-date, otherwise compiles (and caches) it.
+
+        Args:
+            input_exe_kg_path (str): The path to the input ExeKG file.
+            use_plan_cache (bool): Whether to use and update the cached execution plan.
+
+        Returns:
+            Tuple[ExecutionPlan, bool]: The plan, and whether it was loaded from the cache.
+        """
+        plan = None
+        if use_plan_cache:
+            source_hash = ExecutionPlan.hash_source(input_exe_kg_path)
+            plan = ExecutionPlan.load(
+                ExecutionPlan.get_path(source_hash),
+                source_hash=source_hash,
+                schema_fingerprint=self.schema_registry.fingerprint,
+            )
+        if plan is not None:
+            print(f"Using cached execution plan at {ExecutionPlan.get_path(plan.source_hash)}")
+            return plan, True
+
+        plan = self.compile_pipeline(input_exe_kg_path)
+        if use_plan_cache:
+            plan.save(ExecutionPlan.get_path(plan.source_hash))
+
+        return plan, False
+
+    def _save_pipeline_results(
+        self,
+        input_exe_kg_path: str,
+        plan: ExecutionPlan,
+        task_output_dict: Dict[str, Any],
+        reload_exe_kg: bool,
+        use_plan_cache: bool,
+    ) -> None:
+        """
+        Stores the metric values of an executed pipeline in its ExeKG and saves it next to the input ExeKG file.
+
+        Args:
+            input_exe_kg_path (str): The path to the input ExeKG file.
+            plan (ExecutionPlan): The executed plan.
+            task_output_dict (Dict[str, Any]): The outputs of the executed tasks.
+            reload_exe_kg (bool): Whether to load the ExeKG from input_exe_kg_path instead of using self.exe_kg.
+            use_plan_cache (bool): Whether to update the cached execution plan.
+
+        Returns:
+            None
+        """
+        if reload_exe_kg:
+            self.exe_kg = load_exe_kg(
+                input_exe_kg_path, self.create_exe_kg_from_json if input_exe_kg_path.endswith(".json") else None
+            )
+
         update_metric_values(
             self.exe_kg,
             task_output_dict,
@@ -392,13 +539,25 @@ class ExeKGExecutionMixin:
             self.top_level_schema.namespace,
         )
 
+        output_dir = os.path.dirname(input_exe_kg_path)
         save_exe_kg(
             self.exe_kg,
             self.input_kg,
-            self.shacl_shapes_s,
+            self.shacl_shapes_kg,
             None,
-            os.path.dirname(input_exe_kg_path),
-            pipeline_iri.split("#")[-1],
+            output_dir,
+            plan.pipeline_name,
             check_executability=False,
             save_to_json=False,
         )
+
+        saved_exe_kg_path = os.path.join(output_dir, f"{plan.pipeline_name}.ttl")
+        if use_plan_cache and os.path.abspath(saved_exe_kg_path) == os.path.abspath(input_exe_kg_path):
+            # the saved ExeKG differs only in the metric values, so the plan stays valid for it
+            plan.source_hash = ExecutionPlan.hash_source(input_exe_kg_path)
+            plan.save(ExecutionPlan.get_path(plan.source_hash))
+
+
+def _get_metric_output_names(plan: ExecutionPlan) -> Set[str]:
+    # metric values are written back to the ExeKG, so they are never freed during execution
+    return {output_name for output_name in plan.get_output_producers() if "DataOutScore" in output_name}
@@ -0,0 +1,149 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from exe_kg_lib import config
+from exe_kg_lib.utils.data_utils import read_input_data
+
+from .execution_plan import ExecutionPlan
+from .result_cache import ResultCache, SharedResultCache
+
+# state of the worker processes of run_execution_plans(), set once per process by _init_worker()
+_worker_input_data: Dict[str, pd.DataFrame] = {}
+_worker_input_data_hashes: Dict[str, str] = {}
+_worker_shared_outputs: Dict[str, Dict[str, Any]] = {}
+
+
+def run_execution_plans(
+    plans: List[ExecutionPlan],
+    max_workers: int = None,
+    retained_output_names: List[Optional[Set[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Executes the plans of several pipelines as a batch:
+        - the input data of all plans with the same input data path are read once
+        - tasks that are identical in several plans, i.e. that have the same result cache key (same task, method and inputs,
+          e.g. a common Concatenation and DataSplitting prefix) are executed once in the main process
+        - the remaining tasks of each plan are executed in a process pool, one plan per worker at a time,
+          reusing the outputs of the shared tasks
+    The persistent result cache is used as in ExecutionPlan.run() if config.RESULT_CACHE_ENABLED is True.
+
+    Args:
+        plans (List[ExecutionPlan]): The plans to execute.
+        max_workers (int, optional): The maximum number of worker processes. Defaults to config.EXECUTION_MAX_WORKERS.
+                                     With 1, all plans are executed in the main process.
+        retained_output_names (List[Optional[Set[str]]], optional): The retained_output_names of each plan (see ExecutionPlan.run()).
+
+    Returns:
+        List[Dict[str, Any]]: The retained outputs of each plan (see ExecutionPlan.run()), in the order of plans.
+
+    Raises:
+        RuntimeError: If the execution of a task fails.
+    """
+    if max_workers is None:
+        max_workers = config.EXECUTION_MAX_WORKERS
+    if retained_output_names is None:
+        retained_output_names = [None] * len(plans)
+
+    # overlaps the imports with reading the input data
+    preload_threads = [plan.preload_modules() for plan in plans]
+
+    input_data = {}
+    input_data_hashes = {}
+    for input_data_path in dict.fromkeys(plan.input_data_path for plan in plans):
+        input_data[input_data_path] = _read_shared_input_data(
+            [plan for plan in plans if plan.input_data_path == input_data_path]
+        )
+        input_data_hashes[input_data_path] = ResultCache.hash_input_data(input_data[input_data_path])
+        print(f"Read input data for batch execution: {input_data_path}")
+
+    task_cache_keys = [plan.get_task_cache_keys(input_data_hashes[plan.input_data_path]) for plan in plans]
+
+    # tasks that occur in more than one plan; since keys depend on the keys of upstream tasks, their producers are shared as well
+    plan_counts = Counter(key for keys in task_cache_keys for key in set(keys))
+    shared_keys = {key for key, plan_count in plan_counts.items() if plan_count > 1}
+
+    persistent_cache = ResultCache(max_size=config.RESULT_CACHE_MAX_SIZE) if config.RESULT_CACHE_ENABLED else None
+    shared_cache = SharedResultCache(persistent_cache, keys=shared_keys)
+    for plan, keys in zip(plans, task_cache_keys):
+        shared_task_is = [
+            i for i, task in enumerate(plan.tasks) if keys[i] in shared_keys and not task.is_side_effectful
+        ]
+        if shared_task_is:
+            # tasks whose outputs are already held are not executed again
+            plan.select_tasks(shared_task_is).run(
+                input_data[plan.input_data_path],
+                result_cache=shared_cache,
+                input_data_hash=input_data_hashes[plan.input_data_path],
+            )
+    if shared_keys:
+        print(f"Executed {len(shared_cache.outputs_by_key)} tasks shared by multiple pipelines")
+
+    for preload_thread in preload_threads:
+        if preload_thread is not None:
+            preload_thread.join()  # forking while a module is being imported can deadlock the worker processes
+
+    if max_workers == 1 or len(plans) == 1:
+        _init_worker(input_data, input_data_hashes, shared_cache.outputs_by_key)
+        return [
+            _run_plan(plan, plan_retained_output_names)
+            for plan, plan_retained_output_names in zip(plans, retained_output_names)
+        ]
+
+    # the input data and shared outputs are sent once per worker process instead of once per plan
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(input_data, input_data_hashes, shared_cache.outputs_by_key),
+    ) as pool:
+        futures = [
+            pool.submit(_run_plan, plan, plan_retained_output_names)
+            for plan, plan_retained_output_names in zip(plans, retained_output_names)
+        ]
+        return [future.result() for future in futures]
+
+
+def _read_shared_input_data(plans: List[ExecutionPlan]) -> pd.DataFrame:
+    # union of the columns that the plans use, with the dtypes of the first plan that uses each column
+    columns = {}
+    dtypes = {}
+    for plan in plans:
+        plan_columns, plan_dtypes = plan.get_input_columns_and_dtypes()
+        if plan_columns is None:
+            columns = None
+        elif columns is not None:
+            columns.update(dict.fromkeys(plan_columns))
+        for column, dtype in (plan_dtypes or {}).items():
+            dtypes.setdefault(column, dtype)
+
+    return read_input_data(plans[0].input_data_path, list(columns) if columns else None, dtypes)
+
+
+def _init_worker(
+    input_data: Dict[str, pd.DataFrame],
+    input_data_hashes: Dict[str, str],
+    shared_outputs: Dict[str, Dict[str, Any]],
+) -> None:
+    global _worker_input_data, _worker_input_data_hashes, _worker_shared_outputs
+    _worker_input_data = input_data
+    _worker_input_data_hashes = input_data_hashes
+    _worker_shared_outputs = shared_outputs
+
+
+def _run_plan(plan: ExecutionPlan, retained_output_names: Optional[Set[str]]) -> Dict[str, Any]:
+    persistent_cache = ResultCache(max_size=config.RESULT_CACHE_MAX_SIZE) if config.RESULT_CACHE_ENABLED else None
+    # only the outputs of the shared tasks are held in memory
+    result_cache = SharedResultCache(persistent_cache, keys=set(), outputs_by_key=_worker_shared_outputs)
+
+    return plan.run(
+        _worker_input_data[plan.input_data_path],
+        pool_type="sequential",
+        retained_output_names=retained_output_names,
+        result_cache=result_cache,
+        input_data_hash=_worker_input_data_hashes[plan.input_data_path],
+    )
@@ -0,0 +1,728 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import heapq
+import pickle
+import threading
+from collections import ChainMap
+from concurrent.futures import (FIRST_COMPLETED, Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from pathlib import Path
+from typing import (Any, Callable, Dict, Iterator, List, MutableMapping,
+                    Optional, Set, Tuple)
+
+import numpy as np
+import pandas as pd
+
+from exe_kg_lib import config
+from exe_kg_lib.config import EXECUTION_PLAN_SUFFIX
+from exe_kg_lib.utils.cache_utils import (get_cache_dir, hash_bytes,
+                                          write_atomically)
+from exe_kg_lib.utils.data_utils import (get_data_semantics_dtypes,
+                                         read_input_data,
+                                         read_input_data_chunks)
+from exe_kg_lib.utils.memory_utils import (format_size, get_object_sizes,
+                                           get_peak_rss_in_bytes)
+from exe_kg_lib.utils.plot_utils import wait_for_plot_writes
+
+from .data_entity import DataEntity
+from .method import Method, preload_modules
+from .output_store import OutputStore
+from .result_cache import ResultCache
+from .task import Task
+
+# input data of the worker processes of ExecutionPlan.run(), set once per process by _init_worker()
+_worker_input_data: Optional[pd.DataFrame] = None
+
+
+class ExecutionPlan:
+    """
+    Compiled form of an ExeKG pipeline, i.e. the parsed Task objects (with resolved task classes, module chains,
+    method parameters and input/output bindings) in the order of hasNextTask.
+    It can be cached to disk (see get_path()) and executed without parsing or validating any KG.
+    """
+
+    # increased whenever the pickled structure of the plan changes, so that outdated cached plans are discarded
+    FORMAT_VERSION = 2
+
+    def __init__(
+        self,
+        pipeline_iri: str,
+        input_data_path: str,
+        plots_output_dir: str,
+        tasks: List[Task],
+        source_hash: str = None,
+        schema_fingerprint: str = None,
+    ):
+        self.pipeline_iri = pipeline_iri
+        self.input_data_path = input_data_path
+        self.plots_output_dir = plots_output_dir
+        self.tasks = tasks  # Task objects in execution order
+        self.source_hash = source_hash  # content hash of the ExeKG file that the plan was compiled from
+        self.schema_fingerprint = schema_fingerprint  # version of the KG schemata that the plan was compiled with
+        self.format_version = self.FORMAT_VERSION
+
+    @property
+    def pipeline_name(self) -> str:
+        return self.pipeline_iri.split("#")[-1]
+
+    @staticmethod
+    def get_path(source_hash: str) -> Path:
+        """
+        Returns the path of the cached plan of an ExeKG file with the given content hash.
+        Plans are only stored in the "plans" sub-directory of config.CACHE_DIR, and never next to the ExeKG file,
+        since loading a plan unpickles it and the directories of ExeKG files may be shared with other users.
+
+        Args:
+            source_hash (str): The content hash of the ExeKG file (see hash_source()).
+
+        Returns:
+            Path: The path of the plan file.
+        """
+        return get_cache_dir("plans") / f"{source_hash}{EXECUTION_PLAN_SUFFIX}"
+
+    @staticmethod
+    def hash_source(exe_kg_path: str) -> str:
+        """
+        Computes the content hash of an ExeKG file that is used for checking if a cached plan is up-to-date.
+
+        Args:
+            exe_kg_path (str): The path to the ExeKG file.
+
+        Returns:
+            str: The content hash.
+        """
+        with open(exe_kg_path, "rb") as f:
+            return hash_bytes(f.read())
+
+    def save(self, plan_path: Path) -> None:
+        """
+        Serializes the plan to the given path.
+
+        Args:
+            plan_path (Path): The path of the plan file.
+
+        Returns:
+            None
+        """
+        write_atomically(Path(plan_path), pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def load(
+        cls, plan_path: Path, source_hash: str = None, schema_fingerprint: str = None
+    ) -> Optional["ExecutionPlan"]:
+        """
+        Loads a plan from the given path.
+
+        Args:
+            plan_path (Path): The path of the plan file.
+            source_hash (str, optional): If given, the plan is only returned if it was compiled from an ExeKG file with this content hash.
+            schema_fingerprint (str, optional): If given, the plan is only returned if it was compiled with this version of the KG schemata.
+
+        Returns:
+            Optional[ExecutionPlan]: The plan if it exists and is up-to-date, otherwise None.
+        """
+        plan_path = Path(plan_path)
+        if not plan_path.exists():
+            return None
+
+        try:
+            with open(plan_path, "rb") as f:
+                plan = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None  # corrupted plan or plan of incompatible library version
+
+        if not isinstance(plan, cls) or getattr(plan, "format_version", None) != cls.FORMAT_VERSION:
+            return None
+        if source_hash is not None and plan.source_hash != source_hash:
+            return None
+        if schema_fingerprint is not None and plan.schema_fingerprint != schema_fingerprint:
+            return None
+
+        return plan
+
+    def select_tasks(self, task_is: List[int]) -> "ExecutionPlan":
+        """
+        Returns a plan with a subset of the tasks. The Task objects are shared with this plan.
+
+        Args:
+            task_is (List[int]): The indices of the tasks (in self.tasks) to select. The tasks that produce their inputs should be selected as well.
+
+        Returns:
+            ExecutionPlan: The plan with the selected tasks in the order of self.tasks.
+        """
+        return ExecutionPlan(
+            self.pipeline_iri,
+            self.input_data_path,
+            self.plots_output_dir,
+            [self.tasks[i] for i in sorted(task_is)],
+            source_hash=self.source_hash,
+            schema_fingerprint=self.schema_fingerprint,
+        )
+
+    def preload_modules(self) -> Optional[threading.Thread]:
+        """
+        Starts importing the Python modules of the tasks' methods (including methods that are task inputs) in a background thread
+        (see preload_modules() in exe_kg_lib/classes/method.py), if config.PRELOAD_METHOD_MODULES is True.
+
+        Returns:
+            Optional[threading.Thread]: The started thread, or None if preloading is disabled.
+        """
+        if not config.PRELOAD_METHOD_MODULES:
+            return None
+
+        methods = [task.method for task in self.tasks if task.method is not None]
+        methods += [input for task in self.tasks for input in task.inputs if isinstance(input, Method)]
+        return preload_modules(methods)
+
+    def get_output_producers(self) -> Dict[str, int]:
+        """
+        Returns the names of the outputs that the tasks produce.
+
+        Returns:
+            Dict[str, int]: The index of the producing task (in self.tasks) for each output name.
+        """
+        producer_dict = {}
+        for i, task in enumerate(self.tasks):
+            output_names = [output.name for output in task.outputs] if task.outputs else [task.name]
+            for output_name in output_names:
+                producer_dict[output_name] = i
+
+        return producer_dict
+
+    def get_output_consumers(self) -> Dict[str, Set[int]]:
+        """
+        Returns the tasks that consume each output, i.e. the tasks with an input DataEntity that refers to the output.
+
+        Returns:
+            Dict[str, Set[int]]: The indices of the consuming tasks (in self.tasks) for each output name.
+        """
+        producer_dict = self.get_output_producers()
+        consumer_dict = {output_name: set() for output_name in producer_dict}
+        for i, task in enumerate(self.tasks):
+            for input in task.inputs:
+                if isinstance(input, DataEntity) and producer_dict.get(input.reference, i) < i:
+                    consumer_dict[input.reference].add(i)
+
+        return consumer_dict
+
+    def get_input_columns(self) -> Dict[str, Optional[str]]:
+        """
+        Returns the columns of the input data that the tasks use, i.e. the sources of the input DataEntity objects
+        that do not refer to outputs of other tasks.
+
+        Returns:
+            Dict[str, Optional[str]]: The IRI of the DataSemantics sub-class of each column, if known.
+        """
+        producer_dict = self.get_output_producers()
+        column_dict = {}
+        for i, task in enumerate(self.tasks):
+            for input in task.inputs:
+                if not isinstance(input, DataEntity) or not input.source:
+                    continue
+                if producer_dict.get(input.reference, i) < i:  # refers to an output of another task
+                    continue
+                if column_dict.get(input.source) is None:
+                    column_dict[input.source] = input.data_semantics
+
+        return column_dict
+
+    def read_input_data(self) -> pd.DataFrame:
+        """
+        Reads the input data of the pipeline from self.input_data_path.
+        If config.PROJECT_INPUT_COLUMNS is True, only the columns that the tasks use are read,
+        and they are converted to dtypes based on their data semantics (see config.DATA_SEMANTICS_DTYPES).
+
+        Returns:
+            pd.DataFrame: The input data.
+        """
+        return read_input_data(self.input_data_path, *self.get_input_columns_and_dtypes())
+
+    def read_input_data_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Reads the input data of the pipeline from self.input_data_path in chunks of rows, like read_input_data().
+
+        Args:
+            chunk_size (int): The maximum number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: The chunks of the input data.
+        """
+        return read_input_data_chunks(self.input_data_path, chunk_size, *self.get_input_columns_and_dtypes())
+
+    def get_input_columns_and_dtypes(self) -> Tuple[Optional[List[str]], Optional[Dict[str, str]]]:
+        """
+        Returns the columns of the input data to read and the dtypes to convert them to (see read_input_data()).
+
+        Returns:
+            Tuple[Optional[List[str]], Optional[Dict[str, str]]]: The columns (None for all columns) and their dtypes (None for no conversion).
+        """
+        if not config.PROJECT_INPUT_COLUMNS:
+            return None, None
+
+        column_dict = self.get_input_columns()
+        return list(column_dict) or None, get_data_semantics_dtypes(column_dict, config.DATA_SEMANTICS_DTYPES)
+
+    def get_task_cache_keys(self, input_data_hash: str) -> List[str]:
+        """
+        Computes the keys of the tasks for the result cache (see ResultCache.get_task_key()).
+
+        Args:
+            input_data_hash (str): The fingerprint of the input data of the pipeline.
+
+        Returns:
+            List[str]: The key of each task in self.tasks.
+        """
+        producer_dict = self.get_output_producers()
+        output_type_dict = {output.name: output.type for task in self.tasks for output in task.outputs}
+
+        task_keys = []
+        for i, task in enumerate(self.tasks):
+            input_keys = []
+            for input in task.inputs:
+                producer_i = producer_dict.get(input.reference) if isinstance(input, DataEntity) else None
+                if producer_i is not None and producer_i < i:
+                    input_keys.append(
+                        ResultCache.get_input_identifier(
+                            input, task_keys[producer_i], output_type_dict.get(input.reference), input_data_hash
+                        )
+                    )
+                else:
+                    input_keys.append(ResultCache.get_input_identifier(input, None, None, input_data_hash))
+            task_keys.append(ResultCache.get_task_key(task, input_keys))
+
+        return task_keys
+
+    def get_task_dependencies(self) -> List[Set[int]]:
+        """
+        Derives the dependency graph of the tasks from their inputs and outputs.
+        A task depends on the tasks that produce the outputs its input DataEntity objects refer to.
+        Additionally, each side-effectful task depends on the previous side-effectful task in the order of hasNextTask
+        that modifies the same state (see Task.shared_state).
+
+        Returns:
+            List[Set[int]]: The indices of the tasks that each task (identified by its index in self.tasks) depends on.
+        """
+        producer_dict = self.get_output_producers()
+        dependencies = [set() for _ in self.tasks]
+        for output_name, consumer_is in self.get_output_consumers().items():
+            for consumer_i in consumer_is:
+                dependencies[consumer_i].add(producer_dict[output_name])
+
+        last_task_is = {}  # id of shared state -> index of the last task that modifies it
+        last_global_task_i = None  # index of the last task that modifies process-wide state
+        for i, task in enumerate(self.tasks):
+            if not task.is_side_effectful:
+                continue
+            if task.shared_state is None:
+                dependencies[i].update(last_task_is.values())
+                if last_global_task_i is not None:
+                    dependencies[i].add(last_global_task_i)
+                last_task_is.clear()
+                last_global_task_i = i
+            else:
+                last_task_i = last_task_is.get(id(task.shared_state), last_global_task_i)
+                if last_task_i is not None:
+                    dependencies[i].add(last_task_i)
+                last_task_is[id(task.shared_state)] = i
+
+        return dependencies
+
+    def run(
+        self,
+        input_data: pd.DataFrame = None,
+        pool_type: str = None,
+        max_workers: int = None,
+        retained_output_names: Set[str] = None,
+        output_store: MutableMapping = None,
+        result_cache: ResultCache = None,
+        input_data_hash: str = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes the tasks of the plan.
+        Tasks that do not depend on each other (see get_task_dependencies()) are executed concurrently.
+        Side-effectful tasks are executed in the main process, and in the main thread unless they modify state of their own
+        (see Task.shared_state), e.g. plots of different canvases are rendered concurrently in a thread pool.
+        The PNG files of plots are written in the background and are complete when this method returns.
+        If config.FREE_INTERMEDIATE_OUTPUTS is True, each output is freed as soon as all tasks that consume it have finished.
+
+        Args:
+            input_data (pd.DataFrame, optional): The input data of the pipeline. If not given, it is read with self.read_input_data().
+            pool_type (str, optional): "thread", "process" or "sequential" (i.e. one task at a time in the order of hasNextTask).
+                                       Defaults to config.EXECUTION_POOL_TYPE.
+            max_workers (int, optional): The maximum number of concurrently executed tasks. Defaults to config.EXECUTION_MAX_WORKERS.
+            retained_output_names (Set[str], optional): Names of outputs that are never freed. Outputs that no task consumes are always retained.
+            output_store (MutableMapping, optional): The store that holds the outputs during execution (i.e. task_output_dict).
+                                                     Defaults to an OutputStore if config.OUTPUT_STORE_MEMORY_LIMIT is set, otherwise to a dict.
+            result_cache (ResultCache, optional): The cache for reusing outputs of unchanged tasks across runs. Side-effectful tasks are never cached.
+                                                  Defaults to a ResultCache in config.CACHE_DIR if config.RESULT_CACHE_ENABLED is True.
+            input_data_hash (str, optional): The fingerprint of the input data (see ResultCache.hash_input_data()). Computed if not given.
+
+        Returns:
+            Dict[str, Any]: The retained outputs of the executed tasks, keyed by output name.
+
+        Raises:
+            ValueError: If the pool type is not supported.
+            RuntimeError: If the execution of a task fails.
+        """
+        if pool_type is None:
+            pool_type = config.EXECUTION_POOL_TYPE
+        if max_workers is None:
+            max_workers = config.EXECUTION_MAX_WORKERS
+
+        preload_thread = None
+        if input_data is None:
+            preload_thread = self.preload_modules()  # overlaps the imports with reading the input data
+            input_data = self.read_input_data()
+
+        if pool_type == "sequential" or max_workers == 1:
+            pool = None
+        elif pool_type == "thread":
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        elif pool_type == "process":
+            if preload_thread is not None:
+                preload_thread.join()  # forking while a module is being imported can deadlock the worker processes
+            # the input data are sent once per worker process instead of once per task
+            pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(input_data,))
+        else:
+            raise ValueError(f"Unsupported pool type for executing tasks: {pool_type}")
+
+        if result_cache is None and config.RESULT_CACHE_ENABLED:
+            result_cache = ResultCache(max_size=config.RESULT_CACHE_MAX_SIZE)
+
+        is_own_output_store = output_store is None
+        if is_own_output_store:
+            output_store = (
+                OutputStore(config.OUTPUT_STORE_MEMORY_LIMIT, config.OUTPUT_STORE_SPILL_DIR)
+                if config.OUTPUT_STORE_MEMORY_LIMIT is not None
+                else {}
+            )
+
+        try:
+            if pool is None:
+                output_dict = self._run_tasks(
+                    None, input_data, retained_output_names, output_store, result_cache, input_data_hash
+                )
+            else:
+                with pool:
+                    output_dict = self._run_tasks(
+                        pool, input_data, retained_output_names, output_store, result_cache, input_data_hash
+                    )
+            wait_for_plot_writes()
+            return output_dict
+        finally:
+            if result_cache is not None:
+                result_cache.report()
+            if isinstance(output_store, OutputStore):
+                output_store.report()
+                if is_own_output_store:
+                    output_store.close()
+
+    def run_streaming(self, chunk_size: int) -> Dict[str, Any]:
+        """
+        Executes the tasks of the plan on the input data read in chunks of rows, so that all rows are never held in memory at once.
+        Each task is executed according to its stream_kind (see Task) if its inputs are chunked, i.e. if they are input data columns
+        or outputs of "map" tasks with chunked inputs:
+            - "map" tasks are executed on each chunk and their outputs are only held for the current chunk
+            - "fit" and "reduce" tasks consume all chunks and produce their outputs afterwards
+            - other tasks cannot be executed on chunked inputs
+        Tasks without chunked inputs (e.g. plotting of scores) are executed once, as soon as their inputs are available.
+        The input data are read once for each group of "fit" and "reduce" tasks that need the outputs of a previous group
+        (e.g. a model that is trained on the outputs of a transformer prepared on the same data), and once more per
+        additional pass that such a task needs (see Task.get_stream_pass_count()).
+        Tasks are executed sequentially, and the result cache and the output store are not used.
+
+        Args:
+            chunk_size (int): The maximum number of rows per chunk.
+
+        Returns:
+            Dict[str, Any]: The outputs of the tasks that are not chunked, keyed by output name.
+
+        Raises:
+            ValueError: If a task cannot be executed on chunked inputs.
+            RuntimeError: If the execution of a task fails.
+        """
+        self.preload_modules()  # overlaps the imports with computing the stages and reading the first chunk
+
+        dependencies = self.get_task_dependencies()
+        producer_dict = self.get_output_producers()
+
+        is_chunked = []  # whether the outputs of each task are chunks
+        is_streamed = []  # whether each task consumes chunks
+        pass_is = []  # index of the pass over the input data in (or before) which each task is executed
+        for i, task in enumerate(self.tasks):
+            reads_input_columns = any(
+                isinstance(input, DataEntity) and producer_dict.get(input.reference, i) >= i for input in task.inputs
+            )
+            has_chunked_inputs = reads_input_columns or any(
+                is_chunked[dependency_i] for dependency_i in dependencies[i]
+            )
+            if has_chunked_inputs and task.stream_kind not in ("map", "fit", "reduce"):
+                raise ValueError(
+                    f"Task {task.name} needs all rows of its inputs at once and cannot be executed on chunks of data. "
+                    f"Execute the pipeline without streaming"
+                )
+
+            is_chunked.append(has_chunked_inputs and task.stream_kind == "map")
+            is_streamed.append(has_chunked_inputs and task.stream_kind != "map")
+            pass_is.append(
+                max(
+                    (
+                        pass_is[dependency_i] + (1 if is_streamed[dependency_i] else 0)
+                        for dependency_i in dependencies[i]
+                    ),
+                    default=0,
+                )
+            )
+
+        # "map" tasks that each group of "fit" and "reduce" tasks needs
+        pass_count = max(pass_is, default=0) + 1
+        map_task_is_per_pass = [set() for _ in range(pass_count)]
+        for i in range(len(self.tasks)):
+            if not is_streamed[i]:
+                continue
+            to_visit = [i]
+            while to_visit:
+                for dependency_i in dependencies[to_visit.pop()]:
+                    if is_chunked[dependency_i] and dependency_i not in map_task_is_per_pass[pass_is[i]]:
+                        map_task_is_per_pass[pass_is[i]].add(dependency_i)
+                        to_visit.append(dependency_i)
+
+        needed_map_task_is = set().union(*map_task_is_per_pass)
+        for i, task in enumerate(self.tasks):
+            if is_chunked[i] and i not in needed_map_task_is:
+                print(f"Skipping task {task.name} since no task consumes its outputs on chunks of data")
+
+        task_output_dict = {}  # outputs that are not chunked
+        for pass_i in range(pass_count):
+            for i, task in enumerate(self.tasks):
+                if pass_is[i] == pass_i and not is_chunked[i] and not is_streamed[i]:
+                    task_output_dict.update(_run_task(task, task_output_dict, None) or {})
+
+            streamed_tasks = [task for i, task in enumerate(self.tasks) if is_streamed[i] and pass_is[i] == pass_i]
+            if not streamed_tasks:
+                continue
+
+            map_tasks = [self.tasks[i] for i in sorted(map_task_is_per_pass[pass_i])]
+            for task in streamed_tasks:
+                _call_task_method(task, task.start_stream, task_output_dict)
+            stream_pass_counts = [task.get_stream_pass_count() for task in streamed_tasks]
+
+            for stream_pass_i in range(max(stream_pass_counts)):
+                chunk_count = 0
+                for input_chunk in self.read_input_data_chunks(chunk_size):
+                    chunk_output_dict = ChainMap(
+                        {}, task_output_dict
+                    )  # outputs of the current chunk are discarded after it
+                    for task in map_tasks:
+                        chunk_output_dict.maps[0].update(_run_task(task, chunk_output_dict, input_chunk) or {})
+                    for task, stream_pass_count in zip(streamed_tasks, stream_pass_counts):
+                        if stream_pass_i < stream_pass_count:
+                            _call_task_method(task, task.consume_chunk, chunk_output_dict, input_chunk, stream_pass_i)
+                    chunk_count += 1
+
+                print(
+                    f"Processed {chunk_count} chunks of input data for tasks: {', '.join(t.name for t in streamed_tasks)}"
+                )
+
+            for task in streamed_tasks:
+                task_output_dict.update(_call_task_method(task, task.finish_stream) or {})
+
+        wait_for_plot_writes()
+        return task_output_dict
+
+    def _run_tasks(
+        self,
+        pool: Optional[Executor],
+        input_data: pd.DataFrame,
+        retained_output_names: Optional[Set[str]],
+        task_output_dict: MutableMapping,
+        result_cache: Optional[ResultCache],
+        input_data_hash: Optional[str],
+    ) -> Dict[str, Any]:
+        dependencies = self.get_task_dependencies()
+        dependents = [[] for _ in self.tasks]
+        for i, task_dependencies in enumerate(dependencies):
+            for dependency_i in task_dependencies:
+                dependents[dependency_i].append(i)
+
+        # number of unfinished consumers of each output that is freed after its last consumer has finished
+        remaining_consumer_counts = {}
+        if config.FREE_INTERMEDIATE_OUTPUTS:
+            remaining_consumer_counts = {
+                output_name: len(consumer_is)
+                for output_name, consumer_is in self.get_output_consumers().items()
+                if consumer_is and output_name not in (retained_output_names or ())
+            }
+        consumed_output_names = [
+            {
+                input.reference
+                for input in task.inputs
+                if isinstance(input, DataEntity) and input.reference in remaining_consumer_counts
+            }
+            for task in self.tasks
+        ]
+
+        task_cache_keys = None
+        if result_cache is not None:
+            if input_data_hash is None:
+                input_data_hash = ResultCache.hash_input_data(input_data)
+            task_cache_keys = self.get_task_cache_keys(input_data_hash)
+
+        memory_tracker = _OutputMemoryTracker()
+        futures = {}  # future -> index of task
+        # tasks are started in the order of hasNextTask among the ready ones, so without a pool the order is unchanged
+        ready_task_is = [i for i, task_dependencies in enumerate(dependencies) if not task_dependencies]
+        heapq.heapify(ready_task_is)
+        remaining_dependency_counts = [len(task_dependencies) for task_dependencies in dependencies]
+
+        def finish(task_i: int, output: Optional[Dict[str, Any]], is_cached: bool = False):
+            if task_cache_keys is not None and not is_cached and not self.tasks[task_i].is_side_effectful:
+                result_cache.put(task_cache_keys[task_i], self.tasks[task_i], output)
+
+            if output:
+                task_output_dict.update(output)
+                memory_tracker.add(output)
+
+            for output_name in consumed_output_names[task_i]:
+                remaining_consumer_counts[output_name] -= 1
+                if remaining_consumer_counts[output_name] == 0 and output_name in task_output_dict:
+                    # no task needs the output anymore
+                    memory_tracker.remove(output_name)
+                    del task_output_dict[output_name]
+
+            memory_tracker.update_peak(self.tasks[task_i].name)
+
+            for dependent_i in dependents[task_i]:
+                remaining_dependency_counts[dependent_i] -= 1
+                if remaining_dependency_counts[dependent_i] == 0:
+                    heapq.heappush(ready_task_is, dependent_i)
+
+        try:
+            while ready_task_is or futures:
+                while ready_task_is:
+                    task_i = heapq.heappop(ready_task_is)
+                    task = self.tasks[task_i]
+                    if task_cache_keys is not None and not task.is_side_effectful:
+                        cached_output = result_cache.get(task_cache_keys[task_i], task)
+                        if cached_output is not None:
+                            finish(task_i, cached_output, is_cached=True)
+                            continue
+
+                    if pool is None or (
+                        task.is_side_effectful
+                        and (task.shared_state is None or not isinstance(pool, ThreadPoolExecutor))
+                    ):
+                        # process-wide state is only safe to use from the main thread,
+                        # and changes of other shared state would be lost in worker processes
+                        finish(task_i, _run_task(task, task_output_dict, input_data))
+                        continue
+
+                    task_inputs = _select_task_inputs(task, task_output_dict)
+                    if isinstance(pool, ProcessPoolExecutor):
+                        future = pool.submit(_run_task_in_worker, task, task_inputs)
+                    else:
+                        future = pool.submit(_run_task, task, task_inputs, input_data)
+                    futures[future] = task_i
+
+                if not futures:
+                    continue
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(futures.pop(future), future.result())
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        memory_tracker.report()
+
+        # keep the order of hasNextTask for the final outputs, as if the tasks had been executed sequentially
+        producer_dict = self.get_output_producers()
+        return {
+            output_name: _to_in_memory(task_output_dict[output_name])
+            for output_name in sorted(task_output_dict, key=lambda name: producer_dict.get(name, len(self.tasks)))
+        }
+
+
+class _OutputMemoryTracker:
+    """
+    Keeps track of the estimated memory held by the outputs in task_output_dict and of its high-water mark.
+    """
+
+    def __init__(self):
+        # objects shared by several outputs (e.g. the base of SplitView objects) are counted once
+        self.object_ids = {}  # output name -> ids of the objects that the output holds
+        self.object_refs = {}  # object id -> [number of outputs holding the object, estimated size in bytes]
+        self.current_size = 0
+        self.peak_size = 0
+        self.peak_task_name = None
+
+    def add(self, output: Dict[str, Any]) -> None:
+        for output_name, value in output.items():
+            self.remove(output_name)
+            object_sizes = get_object_sizes(value)
+            self.object_ids[output_name] = list(object_sizes)
+            for object_id, size in object_sizes.items():
+                if object_id not in self.object_refs:
+                    self.object_refs[object_id] = [0, size]
+                    self.current_size += size
+                self.object_refs[object_id][0] += 1
+
+    def remove(self, output_name: str) -> None:
+        for object_id in self.object_ids.pop(output_name, ()):
+            self.object_refs[object_id][0] -= 1
+            if self.object_refs[object_id][0] == 0:
+                self.current_size -= self.object_refs.pop(object_id)[1]
+
+    def update_peak(self, task_name: str) -> None:
+        if self.current_size > self.peak_size:
+            self.peak_size = self.current_size
+            self.peak_task_name = task_name
+
+    def report(self) -> None:
+        if not config.REPORT_MEMORY_USAGE:
+            return
+
+        print(
+            f"Peak memory of task outputs: {format_size(self.peak_size)} (after task {self.peak_task_name}), "
+            f"at the end: {format_size(self.current_size)}"
+        )
+        peak_rss = get_peak_rss_in_bytes()
+        if peak_rss is not None:
+            print(f"Peak memory of process: {format_size(peak_rss)}")
+
+
+def _run_task(task: Task, task_output_dict: Dict[str, Any], input_data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    return _call_task_method(task, task.run_method, task_output_dict, input_data)
+
+
+def _init_worker(input_data: pd.DataFrame) -> None:
+    global _worker_input_data
+    _worker_input_data = input_data
+
+
+def _run_task_in_worker(task: Task, task_output_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return _run_task(task, task_output_dict, _worker_input_data)
+
+
+def _call_task_method(task: Task, method: Callable, *args) -> Any:
+    try:
+        return method(*args)
+    except NotImplementedError as e:
+        raise RuntimeError(f"{e}\n\nExecution of method for task {task.iri} failed with the above exception")
+
+
+def _to_in_memory(value: Any) -> Any:
+    # memory-mapped arrays of the output store would become invalid once its files are removed
+    return np.array(value) if isinstance(value, np.memmap) else value
+
+
+def _select_task_inputs(task: Task, task_output_dict: Dict[str, Any]) -> Dict[str, Any]:
+    # only the outputs that the task refers to are passed to the worker, which keeps the data sent to worker processes small
+    return {
+        input.reference: task_output_dict[input.reference]
+        for input in task.inputs
+        if isinstance(input, DataEntity) and input.reference in task_output_dict
+    }
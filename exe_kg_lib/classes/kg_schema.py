@@ -3,9 +3,10 @@
 
 from typing import Dict
 
-import requests
 from rdflib import Graph, Namespace
 
+from exe_kg_lib.utils.cache_utils import load_cached_graph, read_cached_text
+
 
 class KGSchema:
     """
@@ -28,12 +29,18 @@ class KGSchema:
         self.namespace = Namespace(namespace)
         self.namespace_prefix = namespace_prefix
 
-        self.kg = Graph(bind_namespaces="rdflib")
-        self.kg.parse(self.path, format="n3")
+        # schemata are loaded via the local cache, see exe_kg_lib/utils/cache_utils.py
+        self.kg, kg_hash = load_cached_graph(self.path, format="n3")
 
+        generated_schema_kg_hash = ""
         self.generated_schema_kg = Graph(bind_namespaces="rdflib")
         if self.generated_schema_path:
-            self.generated_schema_kg.parse(self.generated_schema_path, format="n3")
+            self.generated_schema_kg, generated_schema_kg_hash = load_cached_graph(
+                self.generated_schema_path, format="n3"
+            )
+
+        # identifies the version of the schema files, changes whenever any of them changes
+        self.fingerprint = kg_hash + generated_schema_kg_hash
 
         # shacl
         self.shacl_shapes_path = shacl_shapes_path  # path of file containing main shacl shapes, can be local or remote
@@ -43,8 +50,19 @@ class KGSchema:
 
         self.shacl_shapes_s = self.read_shacl_shapes(self.shacl_shapes_path)  # shacl shapes are stored as string
 
+        # parsed shacl shapes, loaded via the local cache so that each version of the shapes is parsed only once
+        self.shacl_shapes_kg, shacl_shapes_hash = load_cached_graph(self.shacl_shapes_path, format="turtle")
+
+        generated_shacl_shapes_hash = ""
         if self.generated_shacl_shapes_path:
             self.shacl_shapes_s += self.read_shacl_shapes(self.generated_shacl_shapes_path)
+            generated_shacl_shapes_kg, generated_shacl_shapes_hash = load_cached_graph(
+                self.generated_shacl_shapes_path, format="turtle"
+            )
+            self.shacl_shapes_kg += generated_shacl_shapes_kg
+
+        # identifies the version of the shacl shapes files
+        self.shacl_shapes_fingerprint = shacl_shapes_hash + generated_shacl_shapes_hash
 
     @classmethod
     def from_schema_info(cls, schema_info: Dict[str, str]):
@@ -59,8 +77,4 @@ class KGSchema:
 
     @staticmethod
     def read_shacl_shapes(path: str):
-        if path.startswith("http"):
-            return requests.get(path).text
-        else:
-            with open(path) as f:
-                return f.read()
+        return read_cached_text(path)
@@ -2,7 +2,9 @@
 # SPDX-License-Identifier: AGPL-3.0
 
 import importlib
-from typing import Any, Dict, List, Union
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
 from exe_kg_lib.classes.entity import Entity
 from exe_kg_lib.utils.string_utils import camel_to_snake
@@ -54,12 +56,49 @@ class Method(Entity):
         if not self.module_chain:
             raise NotImplementedError(f"Method module chain not defined for task {self.name}.")
 
-        module_chain = self.module_chain
-        if module_name_to_snakecase:
-            module_chain = self.module_chain[:-1] + [camel_to_snake(self.module_chain[-1])]
+        return _resolve_module(tuple(self.module_chain), module_name_to_snakecase)
 
-        module_chain_parents = ".".join(module_chain[:-1])
-        module_chain_child = module_chain[-1]
-        module_container = importlib.import_module(module_chain_parents)
-        module = getattr(module_container, module_chain_child)
-        return module
+
+def preload_modules(methods: Iterable[Method]) -> threading.Thread:
+    """
+    Imports the Python modules that contain the given methods in a background thread,
+    e.g. while the input data of a pipeline are being read, so that the first resolve_module() calls do not wait for them.
+    Import errors are ignored here and raised when the method is resolved.
+
+    Args:
+        methods (Iterable[Method]): The methods.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    module_names = list(
+        dict.fromkeys(
+            ".".join(method.module_chain[:-1])
+            for method in methods
+            if method.module_chain and len(method.module_chain) > 1
+        )
+    )
+
+    def preload():
+        for module_name in module_names:
+            try:
+                importlib.import_module(module_name)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=preload, name="exe_kg_lib_module_preload", daemon=True)
+    thread.start()
+    return thread
+
+
+@lru_cache(maxsize=None)
+def _resolve_module(module_chain: Tuple[str, ...], module_name_to_snakecase: bool) -> Any:
+    # cached per module chain, since tasks may resolve the same methods many times (e.g. once per split)
+    if module_name_to_snakecase:
+        module_chain = module_chain[:-1] + (camel_to_snake(module_chain[-1]),)
+
+    module_chain_parents = ".".join(module_chain[:-1])
+    module_chain_child = module_chain[-1]
+    module_container = importlib.import_module(module_chain_parents)
+    module = getattr(module_container, module_chain_child)
+    return module
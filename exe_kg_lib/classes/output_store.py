@@ -0,0 +1,160 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from exe_kg_lib.utils.cache_utils import hash_bytes
+from exe_kg_lib.utils.memory_utils import format_size, get_size_in_bytes
+
+
+class OutputStore(MutableMapping):
+    """
+    Store for task outputs that can be used in place of task_output_dict.
+    It keeps the most recently used outputs in memory and spills the least recently used ones to disk
+    once their estimated size exceeds memory_limit:
+        - DataFrame and Series objects as Parquet files (requires pyarrow, otherwise pickled)
+        - numpy arrays as .npy files that are memory-mapped when read
+        - any other object (e.g. fitted sklearn estimators) as pickle files
+    Spilled outputs are loaded back into memory when they are accessed.
+    """
+
+    def __init__(self, memory_limit: int, spill_dir: Optional[str] = None):
+        """
+        Args:
+            memory_limit (int): The maximum estimated size in bytes of the outputs held in memory.
+            spill_dir (str, optional): The directory in which a temporary directory for spilled outputs is created.
+                                       Defaults to the system's temporary directory.
+        """
+        self.memory_limit = memory_limit
+        self.spill_dir = Path(tempfile.mkdtemp(prefix="exe_kg_lib_outputs_", dir=spill_dir))
+
+        self._memory_tier: "OrderedDict[str, Any]" = OrderedDict()  # in order of last use
+        self._sizes: Dict[str, int] = {}  # estimated size of each output in the memory tier
+        self._memory_size = 0
+        self._spilled_paths: Dict[str, Path] = {}  # disk tier
+        self._lock = threading.RLock()
+
+        self.spill_count = 0
+        self.spilled_size = 0
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key in self._memory_tier:
+                self._memory_tier.move_to_end(key)
+                return self._memory_tier[key]
+
+            if key not in self._spilled_paths:
+                raise KeyError(key)
+
+            value = self._load(self._spilled_paths[key])
+            if not isinstance(value, np.memmap):  # memory-mapped arrays are read from disk on demand
+                self._add_to_memory_tier(key, value)
+
+            return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._discard(key)
+            self._add_to_memory_tier(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            self._discard(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._memory_tier or key in self._spilled_paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._memory_tier) + [key for key in self._spilled_paths if key not in self._memory_tier])
+
+    def __len__(self) -> int:
+        return len(set(self._memory_tier) | set(self._spilled_paths))
+
+    def close(self) -> None:
+        """
+        Removes the spilled outputs from disk. The store must not be used afterwards.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def report(self) -> None:
+        """
+        Prints statistics about the spilled outputs.
+
+        Returns:
+            None
+        """
+        if self.spill_count:
+            print(f"Spilled {self.spill_count} task outputs ({format_size(self.spilled_size)}) to {self.spill_dir}")
+
+    def _add_to_memory_tier(self, key: str, value: Any) -> None:
+        self._memory_tier[key] = value
+        self._sizes[key] = get_size_in_bytes(value)
+        self._memory_size += self._sizes[key]
+        self._evict()
+
+    def _discard(self, key: str) -> None:
+        if key in self._memory_tier:
+            del self._memory_tier[key]
+            self._memory_size -= self._sizes.pop(key)
+        spilled_path = self._spilled_paths.pop(key, None)
+        if spilled_path is not None:
+            spilled_path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        # keep at least the most recently used output in memory, since it is about to be used
+        while self._memory_size > self.memory_limit and len(self._memory_tier) > 1:
+            key, value = self._memory_tier.popitem(last=False)
+            size = self._sizes.pop(key)
+            self._memory_size -= size
+            if key not in self._spilled_paths:  # outputs loaded back from disk are still there
+                self._spilled_paths[key] = self._spill(key, value)
+                self.spill_count += 1
+                self.spilled_size += size
+
+    def _spill(self, key: str, value: Any) -> Path:
+        file_stem = self.spill_dir / hash_bytes(key.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            try:
+                file_path = file_stem.with_suffix(".series.parquet" if isinstance(value, pd.Series) else ".parquet")
+                frame = value.to_frame() if isinstance(value, pd.Series) else value
+                frame.to_parquet(file_path)
+                return file_path
+            except (ImportError, ValueError, TypeError):
+                pass  # pyarrow is not installed or cannot store the value (e.g. non-string column names)
+        elif isinstance(value, np.ndarray) and value.dtype != object:
+            file_path = file_stem.with_suffix(".npy")
+            np.save(file_path, value)
+            return file_path
+
+        file_path = file_stem.with_suffix(".pickle")
+        with open(file_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return file_path
+
+    @staticmethod
+    def _load(file_path: Path) -> Any:
+        if file_path.name.endswith(".series.parquet"):
+            frame = pd.read_parquet(file_path)
+            return frame[frame.columns[0]]
+        if file_path.suffix == ".parquet":
+            return pd.read_parquet(file_path)
+        if file_path.suffix == ".npy":
+            return np.load(file_path, mmap_mode="r")
+
+        with open(file_path, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,339 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from exe_kg_lib import config
+from exe_kg_lib.utils.cache_utils import (get_cache_dir, hash_bytes,
+                                          write_atomically)
+from exe_kg_lib.utils.memory_utils import format_size
+
+from .data_entity import DataEntity
+from .method import Method
+from .task import Task
+
+# output type under which the output of a task without declared outputs is stored, see Task.create_output_dict()
+_UNNAMED_OUTPUT_TYPE = ""
+
+
+class ResultCache:
+    """
+    Persistent, content-addressed cache for the outputs of tasks across pipeline runs.
+    A task's key is derived from its task class, method (module chain and parameters), the keys of its inputs,
+    which are either the keys of the upstream tasks that produce them (Merkle-style) or the fingerprint of the input data,
+    and the configuration that changes the structure of outputs (e.g. config.FOLD_PARALLEL_TRAINING).
+    Outputs are stored by their type (e.g. DataOutTrainModel) instead of their name, so that they can be reused
+    by an identical task of another pipeline. The least recently used entries are evicted once the cache exceeds max_size.
+    """
+
+    # increased whenever the key derivation or the stored structure changes, so that outdated entries are not used
+    FORMAT_VERSION = 3
+
+    def __init__(self, cache_dir: Path = None, max_size: int = None):
+        """
+        Args:
+            cache_dir (Path, optional): The directory of the cache entries. Defaults to the "results" sub-directory of config.CACHE_DIR.
+            max_size (int, optional): The maximum size of the cache in bytes. Defaults to no limit.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir("results")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_input_data(input_data: pd.DataFrame) -> str:
+        """
+        Computes the fingerprint of the input data of a pipeline.
+
+        Args:
+            input_data (pd.DataFrame): The input data.
+
+        Returns:
+            str: The fingerprint.
+        """
+        row_hashes = pd.util.hash_pandas_object(input_data, index=True).values
+        column_dtypes = [[str(column), str(dtype)] for column, dtype in input_data.dtypes.items()]
+        return hash_bytes(row_hashes.tobytes() + json.dumps(column_dtypes).encode())
+
+    @classmethod
+    def get_task_key(cls, task: Task, input_keys: List[Any]) -> str:
+        """
+        Computes the key of a task.
+
+        Args:
+            task (Task): The task.
+            input_keys (List[Any]): JSON-serializable identifiers of the task's inputs, in the order of task.inputs.
+
+        Returns:
+            str: The key.
+        """
+        key_components = {
+            "format_version": cls.FORMAT_VERSION,
+            "task": str(task.parent_entity.iri) if task.parent_entity else task.__class__.__name__,
+            "method": _get_method_identifier(task.method) if task.method else None,
+            # in the order of the input names, in which Task.get_inputs() passes inputs of the same type to the task
+            # (e.g. the columns to concatenate). The names themselves contain the pipeline name, so they are not part
+            # of the key, which keeps identical tasks of different pipelines sharing their outputs
+            "inputs": [
+                [input.type, input_key]
+                for input, input_key in sorted(zip(task.inputs, input_keys), key=lambda pair: pair[0].name)
+            ],
+            "config": _get_output_affecting_config(),
+        }
+        return hash_bytes(json.dumps(key_components, sort_keys=True, default=str).encode())
+
+    @staticmethod
+    def get_input_identifier(
+        input: Any, upstream_key: Optional[str], upstream_output_type: Optional[str], input_data_hash: str
+    ) -> Any:
+        """
+        Returns the identifier of a task input that is used for computing the task's key.
+
+        Args:
+            input (Any): The input, i.e. a DataEntity or a Method.
+            upstream_key (Optional[str]): The key of the task that produces the input, if any.
+            upstream_output_type (Optional[str]): The type of the upstream task's output that the input refers to, if any.
+            input_data_hash (str): The fingerprint of the input data of the pipeline.
+
+        Returns:
+            Any: The JSON-serializable identifier.
+        """
+        if isinstance(input, Method):
+            return ["method", _get_method_identifier(input)]
+        if isinstance(input, DataEntity) and upstream_key is not None:
+            return ["output", upstream_key, upstream_output_type]
+        if isinstance(input, DataEntity):
+            return ["column", input.source, input_data_hash]
+
+        return ["other", str(input)]
+
+    def get(self, key: str, task: Task) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached outputs of a task.
+
+        Args:
+            key (str): The key of the task.
+            task (Task): The task, used for mapping the stored output types to the task's output names.
+
+        Returns:
+            Optional[Dict[str, Any]]: The outputs keyed by the task's output names, or None if they are not cached.
+        """
+        entry_path = self._get_entry_path(key)
+        outputs_by_type = None
+        if entry_path.exists():
+            try:
+                with open(entry_path, "rb") as f:
+                    outputs_by_type = pickle.load(f)
+                os.utime(entry_path)  # mark as recently used
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                outputs_by_type = None  # corrupted entry or entry of incompatible library version
+
+        output_dict = _to_output_dict(task, outputs_by_type) if outputs_by_type is not None else None
+
+        with self._lock:
+            if output_dict is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return output_dict
+
+    def put(self, key: str, task: Task, output_dict: Optional[Dict[str, Any]]) -> None:
+        """
+        Stores the outputs of a task. Outputs that cannot be pickled are not cached.
+
+        Args:
+            key (str): The key of the task.
+            task (Task): The task, used for mapping the task's output names to output types.
+            output_dict (Optional[Dict[str, Any]]): The outputs of the task keyed by output name.
+
+        Returns:
+            None
+        """
+        if not output_dict:
+            return
+
+        outputs_by_type = _to_outputs_by_type(task, output_dict)
+        try:
+            content = pickle.dumps(outputs_by_type, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+
+        if self.max_size is not None and len(content) > self.max_size:
+            return
+
+        write_atomically(self._get_entry_path(key), content)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache does not exceed self.max_size.
+
+        Returns:
+            None
+        """
+        if self.max_size is None:
+            return
+
+        entries = []
+        for entry_path in self.cache_dir.glob("*.pickle"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue  # removed concurrently
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+
+    def report(self) -> None:
+        """
+        Prints the hit/miss statistics of the cache.
+
+        Returns:
+            None
+        """
+        if self.hits or self.misses:
+            cache_size = sum(entry_path.stat().st_size for entry_path in self.cache_dir.glob("*.pickle"))
+            print(
+                f"Task result cache: {self.hits} hits, {self.misses} misses, "
+                f"{format_size(cache_size)} in {self.cache_dir}"
+            )
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pickle"
+
+
+class SharedResultCache:
+    """
+    In-memory cache for the outputs of tasks that are shared by several pipelines executed as a batch
+    (see exe_kg_lib/classes/execution_batch.py). It has the interface of ResultCache and uses the same keys,
+    so that a task is executed once for all pipelines that contain it with identical method and inputs.
+    Lookups that miss in memory are passed to an optional ResultCache, which also receives all stored outputs.
+    """
+
+    def __init__(
+        self,
+        persistent_cache: ResultCache = None,
+        keys: Set[str] = None,
+        outputs_by_key: Dict[str, Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            persistent_cache (ResultCache, optional): The cache to pass missed lookups and stored outputs to.
+            keys (Set[str], optional): The keys of the tasks whose outputs are held in memory. Defaults to all keys.
+            outputs_by_key (Dict[str, Dict[str, Any]], optional): Outputs keyed by output type that are already held,
+                                                                  e.g. the outputs_by_key of another SharedResultCache.
+        """
+        self.persistent_cache = persistent_cache
+        self.keys = keys
+        self.outputs_by_key = dict(outputs_by_key) if outputs_by_key else {}
+        self.reuse_count = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, task: Task) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached outputs of a task.
+
+        Args:
+            key (str): The key of the task.
+            task (Task): The task, used for mapping the stored output types to the task's output names.
+
+        Returns:
+            Optional[Dict[str, Any]]: The outputs keyed by the task's output names, or None if they are not cached.
+        """
+        outputs_by_type = self.outputs_by_key.get(key)
+        if outputs_by_type is not None:
+            output_dict = _to_output_dict(task, outputs_by_type)
+            if output_dict is not None:
+                with self._lock:
+                    self.reuse_count += 1
+                return output_dict
+
+        if self.persistent_cache is None:
+            return None
+
+        output_dict = self.persistent_cache.get(key, task)
+        if output_dict is not None:
+            self._hold(key, task, output_dict)
+
+        return output_dict
+
+    def put(self, key: str, task: Task, output_dict: Optional[Dict[str, Any]]) -> None:
+        """
+        Stores the outputs of a task.
+
+        Args:
+            key (str): The key of the task.
+            task (Task): The task, used for mapping the task's output names to output types.
+            output_dict (Optional[Dict[str, Any]]): The outputs of the task keyed by output name.
+
+        Returns:
+            None
+        """
+        if not output_dict:
+            return
+
+        self._hold(key, task, output_dict)
+        if self.persistent_cache is not None:
+            self.persistent_cache.put(key, task, output_dict)
+
+    def report(self) -> None:
+        """
+        Prints how often the held outputs were reused and the statistics of the persistent cache.
+
+        Returns:
+            None
+        """
+        if self.reuse_count:
+            print(f"Shared task results: {self.reuse_count} reused")
+        if self.persistent_cache is not None:
+            self.persistent_cache.report()
+
+    def _hold(self, key: str, task: Task, output_dict: Dict[str, Any]) -> None:
+        if self.keys is None or key in self.keys:
+            self.outputs_by_key[key] = _to_outputs_by_type(task, output_dict)
+
+
+def _to_outputs_by_type(task: Task, output_dict: Dict[str, Any]) -> Dict[str, Any]:
+    if not task.outputs:
+        return {_UNNAMED_OUTPUT_TYPE: output_dict[task.name]}
+
+    return {output.type: output_dict[output.name] for output in task.outputs if output.name in output_dict}
+
+
+def _to_output_dict(task: Task, outputs_by_type: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # None if the outputs of the task are not all stored
+    if not task.outputs:
+        return {task.name: outputs_by_type[_UNNAMED_OUTPUT_TYPE]} if _UNNAMED_OUTPUT_TYPE in outputs_by_type else None
+    if all(output.type in outputs_by_type for output in task.outputs):
+        return {output.name: outputs_by_type[output.type] for output in task.outputs}
+
+    return None
+
+
+def _get_output_affecting_config() -> Dict[str, Any]:
+    # configuration that changes the structure of task outputs, e.g. a list of per-split models instead of one model
+    return {"fold_parallel_training": config.FOLD_PARALLEL_TRAINING}
+
+
+def _get_method_identifier(method: Method) -> List[Any]:
+    return [
+        str(method.parent_entity.iri) if method.parent_entity else None,
+        method.module_chain,
+        sorted([name, repr(value)] for name, value in method.params_dict.items()),
+        sorted([name, repr(value)] for name, value in method.inherited_params_dict.items()),
+    ]
@@ -0,0 +1,238 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import pickle
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from rdflib import RDFS, Graph, Namespace, URIRef
+
+from exe_kg_lib.utils.cache_utils import get_cache_dir, write_atomically
+from exe_kg_lib.utils.string_utils import (class_name_to_method_name,
+                                           class_name_to_module_name)
+
+
+class SchemaIndex:
+    """
+    Precomputed lookups over the combined KG schemata, used for parsing ExeKGs with dict lookups instead of SPARQL queries.
+    It is built once per version of the KG schemata (see SchemaIndex.load_or_build()).
+    """
+
+    def __init__(self, schema_kg: Graph, namespace: Namespace):
+        """
+        Builds the index.
+
+        Args:
+            schema_kg (Graph): The combined KG schemata.
+            namespace (Namespace): The namespace of the top-level KG schema.
+        """
+        self.namespace = namespace
+
+        # direct super-classes of each class, in the order they appear in the KG
+        self.direct_superclasses: Dict[URIRef, List[URIRef]] = {}
+        for s, o in schema_kg.subject_objects(RDFS.subClassOf):
+            if isinstance(s, URIRef) and isinstance(o, URIRef):
+                self.direct_superclasses.setdefault(s, []).append(o)
+
+        # ancestors of each class in breadth-first order, including the class itself (i.e. rdfs:subClassOf*)
+        self.superclasses: Dict[URIRef, List[URIRef]] = {
+            class_iri: self._compute_superclasses(class_iri) for class_iri in self.direct_superclasses
+        }
+        self._superclass_sets: Dict[URIRef, Set[URIRef]] = {
+            class_iri: set(superclasses) for class_iri, superclasses in self.superclasses.items()
+        }
+
+        direct_superproperties: Dict[URIRef, Set[URIRef]] = {}
+        for s, o in schema_kg.subject_objects(RDFS.subPropertyOf):
+            direct_superproperties.setdefault(s, set()).add(o)
+
+        # sub-properties of the top-level properties, including the property itself (i.e. rdfs:subPropertyOf*)
+        self.input_properties = self._compute_subproperties(namespace.hasInput, direct_superproperties)
+        self.output_properties = self._compute_subproperties(namespace.hasOutput, direct_superproperties)
+        self.parameter_properties = self._compute_subproperties(namespace.hasParameter, direct_superproperties)
+        self.method_properties = self._compute_subproperties(namespace.hasMethod, direct_superproperties)
+
+        # data properties whose domain is each method class (i.e. the non-inherited method parameters)
+        self.method_params: Dict[URIRef, Set[URIRef]] = {}
+        for p in schema_kg.subjects(RDFS.subPropertyOf, namespace.hasParameter):
+            if schema_kg.value(p, RDFS.range) is None:
+                continue
+            for domain in schema_kg.objects(p, RDFS.domain):
+                self.method_params.setdefault(domain, set()).add(p)
+
+        # top-level task class of each task class
+        self.top_level_tasks: Dict[URIRef, URIRef] = {}
+        for class_iri in self.superclasses:
+            top_level_task_iri = self._compute_top_level_task(class_iri)
+            if top_level_task_iri is not None:
+                self.top_level_tasks[class_iri] = top_level_task_iri
+
+        # Python module chain of each method class
+        self.module_chains: Dict[URIRef, List[str]] = {}
+        for class_iri in self.superclasses:
+            if not self.is_subclass_of(class_iri, namespace.AtomicMethod):
+                continue
+            module_chain = self._compute_module_chain(class_iri)
+            if module_chain:
+                self.module_chains[class_iri] = module_chain
+
+    @classmethod
+    def load_or_build(cls, schema_kg: Graph, namespace: Namespace, fingerprint: str):
+        """
+        Loads the index for the given version of the KG schemata from the local cache, or builds and caches it.
+
+        Args:
+            schema_kg (Graph): The combined KG schemata.
+            namespace (Namespace): The namespace of the top-level KG schema.
+            fingerprint (str): The identifier of the version of the KG schemata.
+
+        Returns:
+            SchemaIndex: The index.
+        """
+        index_path = get_cache_dir("indexes") / f"{fingerprint}.pickle"
+        if index_path.exists():
+            try:
+                with open(index_path, "rb") as f:
+                    return pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+                pass  # corrupted or outdated cache entry, rebuild it
+
+        index = cls(schema_kg, namespace)
+        write_atomically(index_path, pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+
+        return index
+
+    def _compute_superclasses(self, class_iri: URIRef) -> List[URIRef]:
+        superclasses = [class_iri]
+        visited = {class_iri}
+        queue = deque([class_iri])
+        while queue:
+            for superclass_iri in self.direct_superclasses.get(queue.popleft(), []):
+                if superclass_iri not in visited:
+                    visited.add(superclass_iri)
+                    superclasses.append(superclass_iri)
+                    queue.append(superclass_iri)
+
+        return superclasses
+
+    @staticmethod
+    def _compute_subproperties(property_iri: URIRef, direct_superproperties: Dict[URIRef, Set[URIRef]]) -> Set[URIRef]:
+        subproperties = {property_iri}
+        changed = True
+        while changed:
+            changed = False
+            for p, superproperties in direct_superproperties.items():
+                if p not in subproperties and superproperties & subproperties:
+                    subproperties.add(p)
+                    changed = True
+
+        return subproperties
+
+    def _compute_top_level_task(self, class_iri: URIRef) -> Optional[URIRef]:
+        # equivalent of query_top_level_task_iri(), preferring the closest ancestor
+        for superclass_iri in self.superclasses[class_iri]:
+            if superclass_iri == self.namespace.AtomicTask:
+                continue
+            if self.namespace.Task in self.direct_superclasses.get(superclass_iri, []):
+                return superclass_iri
+
+        return None
+
+    def _compute_module_chain(self, method_iri: URIRef) -> Optional[List[str]]:
+        # equivalent of get_converted_module_hierarchy_chain()
+        module_iri = next(
+            (
+                superclass_iri
+                for superclass_iri in self.direct_superclasses.get(method_iri, [])
+                if self.is_strict_subclass_of(superclass_iri, self.namespace.Module)
+                and not self.is_strict_subclass_of(superclass_iri, self.namespace.Method)
+            ),
+            None,
+        )
+        if module_iri is None:
+            return None
+
+        module_chain_iris = [
+            superclass_iri
+            for superclass_iri in self.superclasses[module_iri]
+            if superclass_iri != self.namespace.Module
+        ]
+        module_chain_names = [class_name_to_module_name(iri.split("#")[-1]) for iri in module_chain_iris]
+        module_chain_names = [class_name_to_method_name(method_iri.split("#")[-1])] + module_chain_names
+        module_chain_names.reverse()
+
+        return module_chain_names
+
+    def is_subclass_of(self, class_iri: URIRef, upper_class_iri: URIRef) -> bool:
+        """
+        Checks if a class is equal to or a (transitive) subclass of another class, i.e. rdfs:subClassOf*.
+
+        Args:
+            class_iri (URIRef): The IRI of the class.
+            upper_class_iri (URIRef): The IRI of the upper class.
+
+        Returns:
+            bool: True if the class is equal to or a subclass of the upper class.
+        """
+        if class_iri == upper_class_iri:
+            return True
+
+        return upper_class_iri in self._superclass_sets.get(class_iri, ())
+
+    def is_strict_subclass_of(self, class_iri: URIRef, upper_class_iri: URIRef) -> bool:
+        """
+        Checks if a class is a (transitive) subclass of another class, i.e. rdfs:subClassOf+.
+
+        Args:
+            class_iri (URIRef): The IRI of the class.
+            upper_class_iri (URIRef): The IRI of the upper class.
+
+        Returns:
+            bool: True if the class is a subclass of the upper class.
+        """
+        return any(
+            self.is_subclass_of(superclass_iri, upper_class_iri)
+            for superclass_iri in self.direct_superclasses.get(class_iri, [])
+        )
+
+    def get_top_level_task_iri(self, task_class_iri: str) -> Optional[str]:
+        """
+        Returns the top-level task class of a given task class, i.e. its ancestor that is a direct subclass of Task.
+
+        Args:
+            task_class_iri (str): The IRI of the task class.
+
+        Returns:
+            Optional[str]: The IRI of the top-level task class if it exists, otherwise None.
+        """
+        top_level_task_iri = self.top_level_tasks.get(URIRef(task_class_iri))
+        return str(top_level_task_iri) if top_level_task_iri is not None else None
+
+    def get_module_chain(self, method_class_iri: str) -> Optional[List[str]]:
+        """
+        Returns the Python module chain of a given method class (see get_converted_module_hierarchy_chain()).
+
+        Args:
+            method_class_iri (str): The IRI of the method class.
+
+        Returns:
+            Optional[List[str]]: The module chain if it exists, otherwise None.
+        """
+        module_chain = self.module_chains.get(URIRef(method_class_iri))
+        if module_chain is None:
+            print(f"Cannot retrieve module chain for method class: {method_class_iri}. Proceeding without it...")
+            return None
+
+        return list(module_chain)
+
+    def get_method_params(self, method_class_iri: str) -> Set[URIRef]:
+        """
+        Returns the data properties whose domain is a given method class.
+
+        Args:
+            method_class_iri (str): The IRI of the method class.
+
+        Returns:
+            Set[URIRef]: The IRIs of the data properties.
+        """
+        return self.method_params.get(URIRef(method_class_iri), set())
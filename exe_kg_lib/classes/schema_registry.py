@@ -0,0 +1,147 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+from rdflib import Graph, URIRef
+from rdflib.graph import ReadOnlyGraphAggregate
+
+from exe_kg_lib.config import KG_SCHEMAS
+from exe_kg_lib.utils.cache_utils import hash_bytes
+
+from ..utils.query_utils import query_subclasses_of
+from .kg_schema import KGSchema
+from .schema_index import SchemaIndex
+
+
+class SchemaRegistry:
+    """
+    Process-wide collection of the parsed top-level and bottom-level KG schemata and their SHACL shapes.
+    It is shared by all ExeKGBase objects and must be treated as immutable.
+    """
+
+    def __init__(self):
+        self.top_level_schema = KGSchema.from_schema_info(KG_SCHEMAS["Data Science"])  # top-level KG schema
+        bottom_level_schemata = {}
+        for schema_name, schema_info in KG_SCHEMAS.items():
+            if schema_name == "Data Science":  # skip top-level KG schema
+                continue
+
+            bottom_level_schemata[schema_info["namespace_prefix"]] = KGSchema.from_schema_info(schema_info)
+        self.bottom_level_schemata: Mapping[str, KGSchema] = MappingProxyType(bottom_level_schemata)
+
+        # self.kg: combination of all KG schemas
+        self.kg = Graph(bind_namespaces="rdflib")
+        self.kg += self.top_level_schema.kg
+        for kg_schema in self.bottom_level_schemata.values():
+            self.kg += kg_schema.kg
+            self.kg += kg_schema.generated_schema_kg
+
+        # self.shacl_shapes_s: string containing SHACL shapes of all KG schemas
+        self.shacl_shapes_s = self.top_level_schema.shacl_shapes_s
+        for kg_schema in self.bottom_level_schemata.values():
+            self.shacl_shapes_s += kg_schema.shacl_shapes_s
+
+        # self.shacl_shapes_kg: parsed SHACL shapes of all KG schemas, reused by all validations of the process
+        self.shacl_shapes_kg = Graph(bind_namespaces="rdflib")
+        for kg_schema in [self.top_level_schema] + list(self.bottom_level_schemata.values()):
+            self.shacl_shapes_kg += kg_schema.shacl_shapes_kg
+            for prefix, namespace in kg_schema.shacl_shapes_kg.namespaces():
+                self.shacl_shapes_kg.bind(prefix, namespace, override=False)
+
+        # identifies the version of the combined KG schemata
+        self.fingerprint = hash_bytes(
+            "".join(
+                [self.top_level_schema.fingerprint]
+                + [kg_schema.fingerprint for kg_schema in self.bottom_level_schemata.values()]
+            ).encode()
+        )
+
+        # identifies the version of the combined KG schemata and SHACL shapes, see ValidationPolicy
+        self.validation_fingerprint = hash_bytes(
+            "".join(
+                [self.fingerprint, self.top_level_schema.shacl_shapes_fingerprint]
+                + [kg_schema.shacl_shapes_fingerprint for kg_schema in self.bottom_level_schemata.values()]
+            ).encode()
+        )
+
+        self.namespace_bindings = [(self.top_level_schema.namespace_prefix, self.top_level_schema.namespace)] + [
+            (kg_schema.namespace_prefix, kg_schema.namespace) for kg_schema in self.bottom_level_schemata.values()
+        ]
+        for prefix, namespace in self.namespace_bindings:
+            self.kg.bind(prefix, namespace)
+
+        # lookups used for parsing ExeKGs without SPARQL queries
+        self.index = SchemaIndex.load_or_build(self.kg, self.top_level_schema.namespace, self.fingerprint)
+
+        self._subclasses_cache: Dict[tuple, List[URIRef]] = {}
+        self._subclasses_lock = threading.Lock()
+
+    def get_subclasses(self, class_iri: URIRef, top_level_only: bool = False) -> List[URIRef]:
+        """
+        Returns the direct subclasses of a given class. Results are computed once per registry.
+
+        Args:
+            class_iri (URIRef): The IRI of the class.
+            top_level_only (bool, optional): Whether to search only the top-level KG schema. Defaults to False.
+
+        Returns:
+            List[URIRef]: The IRIs of the subclasses.
+        """
+        key = (class_iri, top_level_only)
+        with self._subclasses_lock:
+            if key not in self._subclasses_cache:
+                kg = self.top_level_schema.kg if top_level_only else self.kg
+                self._subclasses_cache[key] = [row[0] for row in query_subclasses_of(class_iri, kg)]
+
+            return list(self._subclasses_cache[key])
+
+    def layer(self, exe_kg: Graph) -> Graph:
+        """
+        Returns a read-only view of the KG schemata with the given ExeKG layered on top of them.
+        The schemata are not copied and changes to exe_kg are reflected in the view.
+
+        Args:
+            exe_kg (Graph): The ExeKG to layer on top of the KG schemata.
+
+        Returns:
+            Graph: The read-only combined view.
+        """
+        layered_kg = ReadOnlyGraphAggregate([self.kg, exe_kg])
+        for prefix, namespace in self.namespace_bindings:
+            layered_kg.namespace_manager.bind(prefix, namespace)
+
+        return layered_kg
+
+
+_schema_registry: Optional[SchemaRegistry] = None
+_schema_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """
+    Returns the process-wide schema registry and creates it on first use.
+
+    Returns:
+        SchemaRegistry: The schema registry.
+    """
+    global _schema_registry
+    with _schema_registry_lock:
+        if _schema_registry is None:
+            _schema_registry = SchemaRegistry()
+
+        return _schema_registry
+
+
+def reset_schema_registry() -> None:
+    """
+    Drops the process-wide schema registry, so that the KG schemata are reloaded on next use (e.g. after they changed).
+
+    Returns:
+        None
+    """
+    global _schema_registry
+    with _schema_registry_lock:
+        _schema_registry = None
@@ -2,12 +2,15 @@
 # SPDX-License-Identifier: AGPL-3.0
 
 from abc import abstractmethod
-from typing import Dict, Union
+from collections import ChainMap
+from typing import Any, Dict, List, Mapping, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from exe_kg_lib.classes.data_entity import DataEntity
 from exe_kg_lib.classes.method import Method
+from exe_kg_lib.utils.data_utils import select_columns
 
 from .entity import Entity
 
@@ -19,6 +22,17 @@ class Task(Entity):
     ❗ Important for contributors: See Section "Naming conventions" in README.md of "classes.tasks" package before extending the code's functionality.
     """
 
+    # True for tasks that modify shared state (e.g. a matplotlib figure) instead of only producing outputs.
+    # Such tasks are executed in the main process and in the order of hasNextTask relative to the other tasks
+    # that modify the same state (see shared_state).
+    is_side_effectful = False
+
+    # How the task processes input data that are read in chunks of rows (see ExecutionPlan.run_streaming()):
+    #   - "map": run_method() is applied to each chunk independently and its outputs are chunks as well
+    #   - "fit" or "reduce": the chunks are passed to consume_chunk() and the outputs are produced by finish_stream()
+    #   - None: the task needs all rows of its inputs at once and cannot be applied to chunks
+    stream_kind = None
+
     def __init__(
         self,
         iri: str,
@@ -32,6 +46,16 @@ class Task(Entity):
         self.input_dict = {}  # used for storing input DataEntity objects during KG creation
         self.output_dict = {}  # used for storing output DataEntity objects during KG creation
 
+    @property
+    def shared_state(self) -> Any:
+        """
+        The state that a side-effectful task modifies, e.g. the canvas of a plot.
+        None stands for process-wide state, which is only modified from the main thread and in the order of hasNextTask
+        relative to all side-effectful tasks. Tasks with other shared state may be executed in worker threads,
+        concurrently with tasks that modify different state.
+        """
+        return None
+
     @classmethod
     def from_entity(cls, entity: Entity):
         return cls(entity.iri, entity.parent_entity)
@@ -85,7 +109,7 @@ class Task(Entity):
                 try:
                     input_value = dict_to_search[input.reference]
                 except KeyError:
-                    input_value = fallback_df.loc[:, [input.source]]
+                    input_value = select_columns(fallback_df, [input.source])
             elif isinstance(input, Method):
                 input_name = input.type
                 input_value = input
@@ -94,6 +118,66 @@ class Task(Entity):
 
         return input_dict
 
+    def start_stream(self, other_task_output_dict: Mapping[str, Any]) -> None:
+        """
+        Prepares the Task for consuming chunks of its inputs (see stream_kind).
+        By default, the chunks of the inputs are collected and run_method() is executed on them in finish_stream(),
+        which is only suitable for inputs that are small compared to the input data (e.g. predicted values).
+
+        Args:
+            other_task_output_dict (Mapping[str, Any]): The outputs of other tasks that are not chunked. It must not be modified until finish_stream().
+
+        Returns:
+            None
+        """
+        self._stream_output_dict = other_task_output_dict
+        self._stream_chunks = {}
+
+    def get_stream_pass_count(self) -> int:
+        """
+        Returns the number of times that the chunks of the inputs are passed to consume_chunk(). Called after start_stream().
+
+        Returns:
+            int: The number of passes over the chunks.
+        """
+        return 1
+
+    def consume_chunk(self, chunk_output_dict: Mapping[str, Any], input_chunk: pd.DataFrame, pass_i: int) -> None:
+        """
+        Consumes one chunk of the inputs of the Task.
+
+        Args:
+            chunk_output_dict (Mapping[str, Any]): The outputs of other tasks, with the chunked ones restricted to the current chunk.
+            input_chunk (pd.DataFrame): The current chunk of the input data of the ExeKG's pipeline.
+            pass_i (int): The index of the current pass over the chunks (see get_stream_pass_count()).
+
+        Returns:
+            None
+        """
+        for input in self.inputs:
+            if not isinstance(input, DataEntity) or input.reference in self._stream_output_dict:
+                continue
+            try:
+                input_value = chunk_output_dict[input.reference]
+            except KeyError:
+                input_value = select_columns(input_chunk, [input.source])
+            self._stream_chunks.setdefault(input.reference, []).append(input_value)
+
+    def finish_stream(self) -> Optional[Dict[str, Any]]:
+        """
+        Produces the outputs of the Task after all chunks of its inputs have been consumed.
+
+        Returns:
+            Optional[Dict[str, Any]]: The outputs of the Task, like run_method().
+        """
+        collected_input_dict = {
+            reference: _concat_chunks(input_chunks) for reference, input_chunks in self._stream_chunks.items()
+        }
+        output_dict = self.run_method(ChainMap(collected_input_dict, self._stream_output_dict), None)
+        self._stream_output_dict = self._stream_chunks = None
+
+        return output_dict
+
     @abstractmethod
     def run_method(self, *args):
         """
@@ -103,3 +187,10 @@ class Task(Entity):
             *args: defined by sub-classes
         """
         raise NotImplementedError
+
+
+def _concat_chunks(chunks: List[Any]) -> Any:
+    if isinstance(chunks[0], (pd.DataFrame, pd.Series)):
+        return pd.concat(chunks)
+
+    return np.concatenate([np.asarray(chunk) for chunk in chunks])
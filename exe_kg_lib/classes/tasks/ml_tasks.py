@@ -3,11 +3,21 @@
 
 import importlib
 from abc import abstractmethod
-from typing import Any, Dict
+from functools import partial
+from typing import Any, Dict, Mapping, Optional
 
+import numpy as np
 import pandas as pd
 
+from exe_kg_lib import config
+from exe_kg_lib.utils.data_utils import select_columns
+from exe_kg_lib.utils.task_utils.fold_utils import (fit_clone, map_folds,
+                                                    predict)
+from exe_kg_lib.utils.task_utils.split_utils import SplitView
+
+from ..data_entity import DataEntity
 from ..entity import Entity
+from ..method import Method
 from ..task import Task
 
 """
@@ -22,6 +32,8 @@ class Train(Task):
     This class represents a training task for machine learning models.
     """
 
+    stream_kind = "fit"
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame):
         """
         Trains the machine learning model determined by self.method.module_chain.
@@ -34,6 +46,7 @@ class Train(Task):
 
         Returns:
             dict: A dictionary containing the trained model with the key "DataOutTrainModel".
+                  If the data consist of multiple splits and config.FOLD_PARALLEL_TRAINING is True, it contains a list with one model per split.
 
         Raises:
             NotImplementedError: If the model is not supported.
@@ -45,34 +58,96 @@ class Train(Task):
         # check if input dict contains a method representing an ML model to be optimized
         if "InputModelAsMethod" in input_dict:
             input_model_as_method = input_dict["InputModelAsMethod"][0]["value"]
-            input_model_as_method_module = input_model_as_method.resolve_module()
-
-        method_module = self.method.resolve_module()
-        if "sklearn" in method_module.__module__:
-            assert isinstance(method_module, type), "The method_module should be a class"
-            if input_model_as_method:
-                # HPO (e.g. GridSearchCV) or Boosting (e.g. AdaBoostClassifier)
-                model = method_module(
-                    input_model_as_method_module(**input_model_as_method.params_dict),
-                    **self.method.params_dict,
-                )
-            else:
-                # normal training
-                model = method_module(**self.method.params_dict)
 
-            if not isinstance(input_x, list):
+        model = self._create_model(input_model_as_method)
+        if model is not None:
+            model_name = model.__class__.__name__
+            if not isinstance(input_x, (list, SplitView)):
                 model.fit(input_x, input_y)
+            elif config.FOLD_PARALLEL_TRAINING:
+                # multiple splits, each one trained on an independent clone of the model
+                model = map_folds(fit_clone, [model] * len(input_x), input_x, input_y)
             else:
                 # multiple splits
                 for x, y in zip(input_x, input_y):
                     model.fit(x, y)
 
-            print(f"{model.__class__.__name__} training finished")
+            print(f"{model_name} training finished")
         else:
             raise NotImplementedError("Only sklearn models are supported for now")
 
         return self.create_output_dict({"DataOutTrainModel": model})
 
+    def _create_model(self, input_model_as_method: Method = None) -> Optional[Any]:
+        # returns None if the model is not supported
+        method_module = self.method.resolve_module()
+        if "sklearn" not in method_module.__module__:
+            return None
+
+        assert isinstance(method_module, type), "The method_module should be a class"
+        if input_model_as_method:
+            # HPO (e.g. GridSearchCV) or Boosting (e.g. AdaBoostClassifier)
+            input_model_as_method_module = input_model_as_method.resolve_module()
+            return method_module(
+                input_model_as_method_module(**input_model_as_method.params_dict),
+                **self.method.params_dict,
+            )
+
+        # normal training
+        return method_module(**self.method.params_dict)
+
+    def start_stream(self, other_task_output_dict: Mapping[str, Any]) -> None:
+        """
+        Creates the model that is trained incrementally on the chunks of the data with partial_fit().
+        Classifiers need all classes on the first call of partial_fit(), so they are collected in a first pass over the chunks.
+
+        Args:
+            other_task_output_dict (Mapping[str, Any]): The outputs of other tasks that are not chunked.
+
+        Raises:
+            NotImplementedError: If the model is not supported.
+            ValueError: If the model does not support incremental training with partial_fit().
+        """
+        input_model_as_method = next(
+            (input for input in self.inputs if isinstance(input, Method) and input.type == "InputModelAsMethod"), None
+        )
+        self._stream_model = self._create_model(input_model_as_method)
+        if self._stream_model is None:
+            raise NotImplementedError("Only sklearn models are supported for now")
+        if not hasattr(self._stream_model, "partial_fit"):
+            raise ValueError(
+                f"{self._stream_model.__class__.__name__} does not support partial_fit() and cannot be trained on chunks of "
+                f"data. Use a model with partial_fit() (e.g. SGDClassifier) or execute the pipeline without streaming"
+            )
+        from sklearn.base import \
+            is_classifier  # imported here, so that sklearn is loaded only for executing ML tasks
+
+        self._stream_classes = set() if is_classifier(self._stream_model) else None
+
+    def get_stream_pass_count(self) -> int:
+        return 2 if self._stream_classes is not None else 1
+
+    def consume_chunk(self, chunk_output_dict: Mapping[str, Any], input_chunk: pd.DataFrame, pass_i: int) -> None:
+        input_dict = self.get_inputs(chunk_output_dict, input_chunk)
+        input_x = input_dict["DataInTrainX"][0]["value"]
+        input_y = input_dict["DataInTrainY"][0]["value"]
+
+        if self._stream_classes is None:
+            self._stream_model.partial_fit(input_x, input_y)
+        elif pass_i == 0:
+            self._stream_classes.update(np.unique(np.asarray(input_y).ravel()).tolist())
+        else:
+            if isinstance(self._stream_classes, set):
+                self._stream_classes = np.array(sorted(self._stream_classes))
+            self._stream_model.partial_fit(input_x, input_y, classes=self._stream_classes)
+
+    def finish_stream(self) -> Dict[str, Any]:
+        model = self._stream_model
+        self._stream_model = self._stream_classes = None
+        print(f"{model.__class__.__name__} training finished")
+
+        return self.create_output_dict({"DataOutTrainModel": model})
+
 
 class Test(Task):
     """
@@ -81,11 +156,15 @@ class Test(Task):
     This class represents a test task for machine learning models.
     """
 
+    stream_kind = "map"
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame):
         """
         Tests the machine learning model.
         The model and data to use are determined by self.inputs.
         Expects one input data value with name "DataInTestModel" and one with name "DataInTestX".
+        If the model input contains one model per split (see Train.run_method()), each split is tested with its own model.
+        Data that are not split are tested with the model of the last split.
 
         Args:
             other_task_output_dict (dict): A dictionary containing the output of other tasks.
@@ -101,10 +180,17 @@ class Test(Task):
         model = input_dict["DataInTestModel"][0]["value"]
         input_x = input_dict["DataInTestX"][0]["value"]
 
+        models_per_split = model if isinstance(model, list) else None
+        if models_per_split is not None:
+            model = models_per_split[-1]
+
         # check if model belongs to sklearn library
         if "sklearn" in model.__module__:
-            if not isinstance(input_x, list):
+            if not isinstance(input_x, (list, SplitView)):
                 predicted_y = model.predict(input_x)
+            elif models_per_split is not None:
+                # multiple splits, each one with its own model
+                predicted_y = map_folds(predict, models_per_split, input_x)
             else:
                 # multiple splits
                 predicted_y = [model.predict(x) for x in input_x]
@@ -117,6 +203,9 @@ class Test(Task):
 
 
 class TrainAndTest(Train, Test):
+    # the model has to be trained on all chunks before any chunk can be tested
+    stream_kind = None
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame):
         input_dict = self.get_inputs(other_task_output_dict, input_data)
         input_x = input_dict["DataInTrainAndTestX"][0]["value"]
@@ -139,6 +228,8 @@ class PrepareTransformer(Task):
     This class represents a task for preparing a data transformer.
     """
 
+    stream_kind = "fit"
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame) -> Dict[str, Any]:
         """
         Prepares the transformer determined by self.method.module_chain.
@@ -163,7 +254,7 @@ class PrepareTransformer(Task):
             assert isinstance(method_module, type), "The method_module should be a class"
             transformer = method_module(**self.method.params_dict)
 
-            if not isinstance(input, list):
+            if not isinstance(input, (list, SplitView)):
                 transformer.fit(input)
             else:
                 # multiple splits
@@ -176,6 +267,40 @@ class PrepareTransformer(Task):
 
         return self.create_output_dict({"DataOutTransformer": transformer})
 
+    def start_stream(self, other_task_output_dict: Mapping[str, Any]) -> None:
+        """
+        Creates the transformer that is prepared incrementally on the chunks of the data with partial_fit().
+
+        Args:
+            other_task_output_dict (Mapping[str, Any]): The outputs of other tasks that are not chunked.
+
+        Raises:
+            NotImplementedError: If the transformer is not supported.
+            ValueError: If the transformer does not support incremental preparation with partial_fit().
+        """
+        method_module = self.method.resolve_module()
+        if "sklearn" not in method_module.__module__:
+            raise NotImplementedError("Only sklearn data transformers are supported for now")
+
+        self._stream_transformer = method_module(**self.method.params_dict)
+        if not hasattr(self._stream_transformer, "partial_fit"):
+            raise ValueError(
+                f"{self._stream_transformer.__class__.__name__} does not support partial_fit() and cannot be prepared on "
+                f"chunks of data. Use a transformer with partial_fit() (e.g. StandardScaler) or execute the pipeline "
+                f"without streaming"
+            )
+
+    def consume_chunk(self, chunk_output_dict: Mapping[str, Any], input_chunk: pd.DataFrame, pass_i: int) -> None:
+        input_dict = self.get_inputs(chunk_output_dict, input_chunk)
+        self._stream_transformer.partial_fit(input_dict["DataInToPrepareTransformer"][0]["value"])
+
+    def finish_stream(self) -> Dict[str, Any]:
+        transformer = self._stream_transformer
+        self._stream_transformer = None
+        print(f"{transformer.__class__.__name__} transforming finished")
+
+        return self.create_output_dict({"DataOutTransformer": transformer})
+
 
 class Transform(Task):
     """
@@ -184,6 +309,8 @@ class Transform(Task):
     This class represents a task for transforming data.
     """
 
+    stream_kind = "map"
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame) -> Dict[str, Any]:
         """
         Applies a transformation to the data.
@@ -206,7 +333,7 @@ class Transform(Task):
 
         # check if model belongs to sklearn library
         if "sklearn" in transformer.__module__:
-            if not isinstance(input, list):
+            if not isinstance(input, (list, SplitView)):
                 transformed_input = transformer.transform(input)
             else:  # multiple splits
                 transformed_input = [
@@ -222,6 +349,9 @@ class Transform(Task):
 
 
 class PrepareTransformerAndTransform(PrepareTransformer, Transform):
+    # the transformer has to be prepared on all chunks before any chunk can be transformed
+    stream_kind = None
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame):
         input_dict = self.get_inputs(other_task_output_dict, input_data)
         input = input_dict["DataInPrepareTransformAndTransform"][0]["value"]
@@ -255,6 +385,7 @@ class DataSplitting(Task):
 
         Returns:
             Dict[str, Any]: A dictionary containing the splitted data with the keys "DataOutSplittedTrainDataX", "DataOutSplittedTrainDataY", "DataOutSplittedTestDataX", and "DataOutSplittedTestDataY".
+                            If the splitter produces multiple splits, their values are SplitView objects i.e. lazily materialized lists of splits.
 
         Raises:
             NotImplementedError: If the data splitter is not supported.
@@ -285,23 +416,22 @@ class DataSplitting(Task):
                 assert isinstance(method_module, type), "The method_module should be a class"
                 splitter = method_module(**self.method.params_dict)
 
-                train_x_per_split = []
-                valid_x_per_split = []
-                train_y_per_split = []
-                valid_y_per_split = []
+                # the splits are stored as indices and materialized only when a downstream task accesses them
+                train_index_per_split = []
+                valid_index_per_split = []
                 for train_index, valid_index in splitter.split(input_x, input_y):
-                    train_x_per_split.append(input_x.iloc[train_index])
-                    valid_x_per_split.append(input_x.iloc[valid_index])
-                    train_y_per_split.append(input_y.iloc[train_index])
-                    valid_y_per_split.append(input_y.iloc[valid_index])
+                    train_index_per_split.append(train_index)
+                    valid_index_per_split.append(valid_index)
 
-                print(f"{splitter.__class__.__name__} splitting finished resulting in {len(train_x_per_split)} splits")
+                print(
+                    f"{splitter.__class__.__name__} splitting finished resulting in {len(train_index_per_split)} splits"
+                )
                 return self.create_output_dict(
                     {
-                        "DataOutSplittedTrainDataX": train_x_per_split,
-                        "DataOutSplittedTrainDataY": train_y_per_split,
-                        "DataOutSplittedTestDataX": valid_x_per_split,
-                        "DataOutSplittedTestDataY": valid_y_per_split,
+                        "DataOutSplittedTrainDataX": SplitView(input_x, train_index_per_split),
+                        "DataOutSplittedTrainDataY": SplitView(input_y, train_index_per_split),
+                        "DataOutSplittedTestDataX": SplitView(input_x, valid_index_per_split),
+                        "DataOutSplittedTestDataY": SplitView(input_y, valid_index_per_split),
                     }
                 )
         else:
@@ -315,6 +445,9 @@ class PerformanceCalculation(Task):
     This class represents a task for calculating the performance of a machine learning model.
     """
 
+    # the real and predicted values are collected from all chunks (see Task.start_stream())
+    stream_kind = "reduce"
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame) -> Dict[str, Any]:
         """
         Calculates a score using a metric determined by self.method.module_chain.
@@ -341,13 +474,13 @@ class PerformanceCalculation(Task):
 
         if "sklearn" in method_module.__module__:
             assert callable(method_module), "The method_module should be a function"
-            if not isinstance(input_real_y, list):
+            if not isinstance(input_real_y, (list, SplitView)):
                 metric_value = method_module(input_real_y, input_predicted_y, **self.method.params_dict)
             else:
                 # multiple splits
-                metric_values = [
-                    method_module(y, p, **self.method.params_dict) for y, p in zip(input_real_y, input_predicted_y)
-                ]
+                metric_values = map_folds(
+                    partial(method_module, **self.method.params_dict), input_real_y, input_predicted_y
+                )
                 metric_value = sum(metric_values) / len(metric_values)
         else:
             raise NotImplementedError("Only sklearn metrics are supported for now")
@@ -362,6 +495,8 @@ class Concatenation(Task):
     This class represents a task for concatenating data.
     """
 
+    stream_kind = "map"
+
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame) -> Dict[str, Any]:
         """
         Concatenates data. The data to use are determined by self.inputs.
@@ -374,10 +509,24 @@ class Concatenation(Task):
         Returns:
             Dict[str, Any]: A dictionary containing the concatenated data with the key "DataOutConcatenatedData".
         """
-        input_dict = self.get_inputs(other_task_output_dict, input_data)
-        inputs = input_dict["DataInConcatenation"]
-        input_values = [input["value"] for input in inputs]
+        # same order as in self.get_inputs(), but consecutive input data columns are selected in one operation
+        inputs = sorted(
+            (input for input in self.inputs if isinstance(input, DataEntity) and input.type == "DataInConcatenation"),
+            key=lambda x: x.name,
+        )
+        input_values = []
+        column_names = []
+        for input in inputs:
+            if input.reference in other_task_output_dict:
+                if column_names:
+                    input_values.append(select_columns(input_data, column_names))
+                    column_names = []
+                input_values.append(other_task_output_dict[input.reference])
+            else:
+                column_names.append(input.source)
+        if column_names:
+            input_values.append(select_columns(input_data, column_names))
 
-        concatenation_result = pd.concat(input_values, axis=1)
+        concatenation_result = input_values[0] if len(input_values) == 1 else pd.concat(input_values, axis=1)
 
         return self.create_output_dict({"DataOutConcatenatedData": concatenation_result})
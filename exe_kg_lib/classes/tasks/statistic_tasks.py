@@ -2,10 +2,16 @@
 # SPDX-License-Identifier: AGPL-3.0
 
 from abc import abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
+import numpy as np
 import pandas as pd
 
+from exe_kg_lib.utils.string_utils import prettify_data_entity_name
+from exe_kg_lib.utils.task_utils import statistic_utils
+from exe_kg_lib.utils.task_utils.statistic_utils import (MomentSketch,
+                                                         StatisticsSketch)
+
 from ..task import Task
 
 """
@@ -20,11 +26,27 @@ class StatisticCalculation(Task):
     This class represents a task for calculating a statistic.
     """
 
+    stream_kind = "reduce"
+
+    # numpy functions that can be calculated from the chunks of the data, with their allowed parameters
+    STREAMABLE_STATISTICS = {
+        "sum": set(),
+        "mean": set(),
+        "min": set(),
+        "amin": set(),
+        "max": set(),
+        "amax": set(),
+        "var": {"ddof"},
+        "std": {"ddof"},
+    }
+
     @abstractmethod
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame) -> Dict[str, Any]:
         """
         Calculates a statistic. The data to use are determined by self.inputs.
-        Expects one input data value with name "DataInStatisticCalculation".
+        Expects one input data value with name "DataInStatisticCalculation" for numpy methods,
+        or any number of them for the methods of exe_kg_lib/utils/task_utils/statistic_utils.py
+        (e.g. multi_statistics(), whose output is a DataFrame of statistics x inputs).
 
         Args:
             other_task_output_dict (dict): A dictionary containing the output of other tasks.
@@ -38,11 +60,88 @@ class StatisticCalculation(Task):
         """
         input_dict = self.get_inputs(other_task_output_dict, input_data)
         input_data = input_dict["DataInStatisticCalculation"]
-        input = input_data[0]["value"]  # assume one input
 
         method_module = self.method.resolve_module(module_name_to_snakecase=True)
         if "numpy" in method_module.__module__:
+            input = input_data[0]["value"]  # assume one input
             statistic_result = method_module(input, **self.method.params_dict)
             return self.create_output_dict({"DataOutStatisticCalculation": statistic_result})
+        elif method_module.__module__ == statistic_utils.__name__:
+            # methods of this library that calculate statistics of all inputs at once, e.g. multi_statistics()
+            statistic_result = method_module(
+                [input["value"] for input in input_data],
+                [_get_input_name(input["name"], input["value"]) for input in input_data],
+                **self.method.params_dict,
+            )
+            return self.create_output_dict({"DataOutStatisticCalculation": statistic_result})
+        else:
+            raise NotImplementedError("Only numpy library is supported for now")
+
+    def start_stream(self, other_task_output_dict: Mapping[str, Any]) -> None:
+        """
+        Prepares the calculation of the statistic from the chunks of the data, without holding all chunks in memory.
+        The numpy statistics in STREAMABLE_STATISTICS are calculated exactly by a MomentSketch, and the methods in
+        STREAMABLE_METHODS of exe_kg_lib/utils/task_utils/statistic_utils.py by a StatisticsSketch of all inputs,
+        i.e. approximately for percentiles and distinct counts.
+
+        Args:
+            other_task_output_dict (Mapping[str, Any]): The outputs of other tasks that are not chunked.
+
+        Raises:
+            NotImplementedError: If the statistic is not supported.
+            ValueError: If the statistic or its parameters cannot be calculated from chunks of data.
+        """
+        method_module = self.method.resolve_module(module_name_to_snakecase=True)
+        statistic_name = method_module.__name__
+        if method_module.__module__ == statistic_utils.__name__:
+            streamable_statistics = statistic_utils.STREAMABLE_METHODS
+        elif "numpy" in method_module.__module__:
+            streamable_statistics = self.STREAMABLE_STATISTICS
         else:
             raise NotImplementedError("Only numpy library is supported for now")
+
+        if statistic_name not in streamable_statistics or not set(self.method.params_dict).issubset(
+            streamable_statistics[statistic_name]
+        ):
+            raise ValueError(
+                f"Statistic {statistic_name} with parameters {self.method.params_dict} cannot be calculated on chunks "
+                f"of data. Supported statistics: {', '.join(streamable_statistics)}"
+            )
+
+        self._stream_statistic_name = statistic_name
+        self._stream_sketch = None if streamable_statistics is statistic_utils.STREAMABLE_METHODS else MomentSketch()
+
+    def consume_chunk(self, chunk_output_dict: Mapping[str, Any], input_chunk: pd.DataFrame, pass_i: int) -> None:
+        input_dict = self.get_inputs(chunk_output_dict, input_chunk)
+        input_data = input_dict["DataInStatisticCalculation"]
+        if isinstance(self._stream_sketch, MomentSketch):
+            input = input_data[0]["value"]  # assume one input
+            self._stream_sketch.update(input)  # NaN values are skipped, as by the pandas reductions
+            return
+
+        if self._stream_sketch is None:  # the names of the inputs are known from the first chunk
+            self._stream_sketch = StatisticsSketch(
+                [_get_input_name(input["name"], input["value"]) for input in input_data], **self.method.params_dict
+            )
+        self._stream_sketch.update([input["value"] for input in input_data])
+
+    def finish_stream(self) -> Dict[str, Any]:
+        sketch = self._stream_sketch
+        if isinstance(sketch, StatisticsSketch):
+            statistic_result = sketch.to_frame()
+        else:
+            statistic_name = {"amin": "min", "amax": "max"}.get(
+                self._stream_statistic_name, self._stream_statistic_name
+            )
+            statistic_result = sketch.get(statistic_name, self.method.params_dict.get("ddof", 0))
+        self._stream_sketch = self._stream_statistic_name = None
+
+        return self.create_output_dict({"DataOutStatisticCalculation": statistic_result})
+
+
+def _get_input_name(input_name: str, input_value: Any) -> str:
+    # the column name of input data columns, the prettified name of outputs of other tasks
+    if isinstance(input_value, pd.DataFrame) and len(input_value.columns) == 1:
+        return str(input_value.columns[0])
+
+    return prettify_data_entity_name(input_name)
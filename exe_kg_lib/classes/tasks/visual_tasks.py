@@ -3,10 +3,15 @@
 
 from abc import abstractmethod
 from pathlib import Path
+from typing import Any, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
 
+from exe_kg_lib import config
+from exe_kg_lib.utils.plot_utils import (bin_values, create_figure,
+                                         downsample_series, save_figure,
+                                         select_annotated_points)
 from exe_kg_lib.utils.string_utils import prettify_data_entity_name
 
 from ..entity import Entity
@@ -16,6 +21,9 @@ from ..task import Task
 ❗ Important for contributors: See the package's README.md before extending the code's functionality.
 """
 
+# total width of the bars of the columns of a multi-column input at one x position
+_GROUPED_BAR_WIDTH = 0.8
+
 
 class CanvasCreation(Task):
     """
@@ -24,6 +32,8 @@ class CanvasCreation(Task):
     This class represents a task for creating a canvas which can be used by Plotting tasks (defined in this file).
     """
 
+    is_side_effectful = True
+
     def __init__(self, iri: str, parent_entity: Entity):
         super().__init__(iri, parent_entity)
         self.fig = None
@@ -55,8 +65,16 @@ class CanvasCreation(Task):
             else (7, 5)
         )
 
-        self.fig = plt.figure(figsize=(figsize))
-        self.grid = None if (n_rows == n_cols and n_rows == 1) else plt.GridSpec(n_rows, n_cols, hspace=0.3, wspace=0.3)
+        self.fig = create_figure(figsize)
+        self.grid = (
+            None
+            if (n_rows == n_cols and n_rows == 1)
+            else self.fig.add_gridspec(n_rows, n_cols, hspace=0.3, wspace=0.3)
+        )
+
+    @property
+    def shared_state(self):
+        return self
 
 
 class Plotting(Task):
@@ -66,16 +84,31 @@ class Plotting(Task):
     This class represents a task for creating plots.
     """
 
+    is_side_effectful = True
+
     def __init__(self, iri: str, parent_entity: Entity, plots_output_dir: str, canvas_task: CanvasCreation):
         super().__init__(iri, parent_entity)
-        self.fig = canvas_task.fig
-        self.grid = canvas_task.grid
+        self.canvas_task = (
+            canvas_task  # the canvas is created when canvas_task runs, which may be after this object is created
+        )
         self.current_plot_pos = canvas_task.current_plot_pos
         self.layout = canvas_task.method.params_dict["layout"]
         self.plots_output_dir = plots_output_dir
 
         canvas_task.current_plot_pos += 1
 
+    @property
+    def shared_state(self):
+        return self.canvas_task
+
+    @property
+    def fig(self):
+        return self.canvas_task.fig
+
+    @property
+    def grid(self):
+        return self.canvas_task.grid
+
     @abstractmethod
     def run_method(self, other_task_output_dict: dict, input_data: pd.DataFrame):
         """
@@ -97,45 +130,51 @@ class Plotting(Task):
 
         method_module = self.method.resolve_module(module_name_to_snakecase=True)
         if "matplotlib" in method_module.__module__:
-            plot = None
-            if self.grid is not None:
-                plot = self.fig.add_subplot(self.grid[self.current_plot_pos])
+            # plots are drawn on the axes of the canvas' figure, so that the global state of pyplot is not used
+            plot = self.fig.add_subplot(self.grid[self.current_plot_pos]) if self.grid is not None else self.fig.gca()
+            method_to_call = getattr(plot, method_module.__name__)
 
             for input in input_data:
                 input_name = input["name"]
                 input_value = input["value"]
 
-                x = (
-                    input_value.index
-                    if isinstance(input_value, pd.DataFrame)
-                    else prettify_data_entity_name(input_name)
-                )
-
-                # assume input_value can contain either 1 column or a single number
-                y = input_value
-                if isinstance(input_value, pd.DataFrame):
-                    y = input_value[input_value.columns[0]].values
-                elif isinstance(input_value, pd.Series):
-                    y = input_value.values[0]
-
-                method_to_call = method_module if plot is None else getattr(plot, method_module.__name__)
-                method_to_call(x, y, **self.method.params_dict)
-                if plot is not None:
-                    if "title" in self.method.inherited_params_dict:
-                        plot.set_title(self.method.inherited_params_dict["title"])
-                    if "x_label" in self.method.inherited_params_dict:
-                        plot.set_xlabel(self.method.inherited_params_dict["x_label"])
-                    if "y_label" in self.method.inherited_params_dict:
-                        plot.set_ylabel(self.method.inherited_params_dict["y_label"])
-                    if "legend_name" in self.method.inherited_params_dict:
-                        plot.legend(title=self.method.inherited_params_dict["legend_name"])
+                for x, y, label in self._get_series(input_name, input_value, method_module.__name__):
+                    params_dict = dict(self.method.params_dict)
+                    if label is not None:
+                        params_dict.setdefault("label", label)
+                        if method_module.__name__ == "bar":
+                            params_dict.setdefault("width", _GROUPED_BAR_WIDTH / len(input_value.columns))
+
+                    if isinstance(input_value, pd.DataFrame) and method_module.__name__ == "hist":
+                        if len(y) > config.PLOT_MAX_POINTS:
+                            # the values are binned with NumPy, and the plot draws one weighted value per bin
+                            counts, edges = bin_values(y, params_dict.pop("bins", None), params_dict.pop("range", None))
+                            method_to_call(edges[:-1], bins=edges, weights=counts, **params_dict)
+                        else:
+                            counts, edges, _ = method_to_call(y, **params_dict)
+                        x, y = (edges[:-1] + edges[1:]) / 2, counts  # annotated with the counts of the bins
+                    else:
+                        if isinstance(input_value, pd.DataFrame):
+                            # the time for drawing is bounded regardless of the data size
+                            x, y = downsample_series(x, y)
+                        method_to_call(x, y, **params_dict)
 
                     if self.method.inherited_params_dict.get("annotate", False):
                         if isinstance(input_value, pd.DataFrame):
-                            for i, y_val in enumerate(y):
-                                y_to_show = round(y_val, 3) if isinstance(y_val, float) else y_val
+                            # at most config.PLOT_MAX_ANNOTATIONS labels, formatted at once
+                            annotated_is = select_annotated_points(len(y))
+                            y_to_show = y[annotated_is]
+                            if np.issubdtype(y_to_show.dtype, np.floating):
+                                y_to_show = y_to_show.round(3)
+                            for x_val, y_val, y_label in zip(
+                                np.asarray(x)[annotated_is], y[annotated_is], y_to_show.tolist()
+                            ):
                                 plot.annotate(
-                                    f"{y_val}", (x[i], y_val), textcoords="offset points", xytext=(0, 2), ha="center"
+                                    f"{y_label}",
+                                    (x_val, y_val),
+                                    textcoords="offset points",
+                                    xytext=(0, 2),
+                                    ha="center",
                                 )
                         else:
                             y_to_show = round(y, 3) if isinstance(y, float) else y
@@ -143,30 +182,57 @@ class Plotting(Task):
                                 f"{y_to_show}", (x, y), textcoords="offset points", xytext=(0, 2), ha="center"
                             )
 
-                else:
-                    if "title" in self.method.inherited_params_dict:
-                        plt.title(self.method.inherited_params_dict["title"])
-                    if "x_label" in self.method.inherited_params_dict:
-                        plt.xlabel(self.method.inherited_params_dict["x_label"])
-                    if "y_label" in self.method.inherited_params_dict:
-                        plt.ylabel(self.method.inherited_params_dict["y_label"])
-                    if "legend_name" in self.method.inherited_params_dict:
-                        plt.legend(title=self.method.inherited_params_dict["legend_name"])
-
-                    if self.method.inherited_params_dict.get("annotate", False):
-                        if isinstance(input_value, pd.DataFrame):
-                            for i, y_val in enumerate(y):
-                                y_to_show = round(y_val, 3) if isinstance(y_val, float) else y_val
-                                plt.annotate(
-                                    f"{y_val}", (x[i], y_val), textcoords="offset points", xytext=(0, 2), ha="center"
-                                )
-                        else:
-                            y_to_show = round(y, 3) if isinstance(y, float) else y
-                            plt.annotate(f"{y_to_show}", (x, y), textcoords="offset points", xytext=(0, 2), ha="center")
+                if isinstance(input_value, pd.DataFrame) and len(input_value.columns) > 1:
+                    if method_module.__name__ == "bar":
+                        plot.set_xticks(np.arange(len(input_value.index)), [str(i) for i in input_value.index])
+                    if "legend_name" not in self.method.inherited_params_dict:
+                        plot.legend()
+
+                if "title" in self.method.inherited_params_dict:
+                    plot.set_title(self.method.inherited_params_dict["title"])
+                if "x_label" in self.method.inherited_params_dict:
+                    plot.set_xlabel(self.method.inherited_params_dict["x_label"])
+                if "y_label" in self.method.inherited_params_dict:
+                    plot.set_ylabel(self.method.inherited_params_dict["y_label"])
+                if "legend_name" in self.method.inherited_params_dict:
+                    plot.legend(title=self.method.inherited_params_dict["legend_name"])
 
             output_dir = Path(self.plots_output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
-            plt.savefig(output_dir / f"{self.name}_plot.png")
+            save_figure(self.fig, output_dir / f"{self.name}_plot.png")  # the file is written in the background
             print(f"Plot saved in {output_dir / f'{self.name}_plot.png'}")
         else:
             raise NotImplementedError("Only matplotlib library is supported for now")
+
+    @staticmethod
+    def _get_series(input_name: str, input_value: Any, method_name: str) -> List[Tuple[Any, Any, Optional[str]]]:
+        """
+        Returns the series to draw for an input value.
+        Each column of a DataFrame is a series of its own (e.g. the columns of a multi-statistic calculation),
+        labelled with the column name if there are several columns. Grouped bars are placed side by side.
+
+        Args:
+            input_name (str): The name of the input.
+            input_value (Any): A DataFrame, a Series containing a single number or a single number.
+            method_name (str): The name of the plot method, e.g. "bar".
+
+        Returns:
+            List[Tuple[Any, Any, Optional[str]]]: The x values, y values and label of each series.
+        """
+        if not isinstance(input_value, pd.DataFrame):
+            y = input_value.values[0] if isinstance(input_value, pd.Series) else input_value
+            return [(prettify_data_entity_name(input_name), y, None)]
+
+        columns = list(input_value.columns)
+        if len(columns) == 1:
+            return [(input_value.index, input_value[columns[0]].values, None)]
+
+        series = []
+        for column_i, column in enumerate(columns):
+            x = input_value.index
+            if method_name == "bar":
+                width = _GROUPED_BAR_WIDTH / len(columns)
+                x = np.arange(len(input_value.index)) - _GROUPED_BAR_WIDTH / 2 + width * (column_i + 0.5)
+            series.append((x, input_value[column].values, str(column)))
+
+        return series
@@ -0,0 +1,126 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.compare import to_canonical_graph
+
+from exe_kg_lib import config
+from exe_kg_lib.utils.cache_utils import (get_cache_dir, hash_bytes,
+                                          write_atomically)
+from exe_kg_lib.utils.kg_validation_utils import check_pipeline_executability
+
+
+class ValidationPolicy:
+    """
+    Decides when ExeKGs are validated against the SHACL shapes during construction, execution, editing and saving:
+        - "always": on every check
+        - "once": once per content of the ExeKG and version of the KG schemata and SHACL shapes;
+          the hashes of the validated ExeKGs are recorded in record_dir, so an ExeKG that was validated e.g. in CI
+          is not validated again in production if the record is shared
+        - "never": never, for ExeKGs that are known to be executable
+    """
+
+    ALWAYS = "always"
+    ONCE = "once"
+    NEVER = "never"
+    MODES = (ALWAYS, ONCE, NEVER)
+
+    def __init__(self, mode: str = None, record_dir: Union[Path, str] = None):
+        """
+        Args:
+            mode (str, optional): "always", "once" or "never". Defaults to config.VALIDATION_POLICY.
+            record_dir (Union[Path, str], optional): The directory of the record of validated ExeKGs.
+                                                     Defaults to the "validated" sub-directory of config.CACHE_DIR.
+
+        Raises:
+            ValueError: If the mode is not supported.
+        """
+        self.mode = mode if mode is not None else config.VALIDATION_POLICY
+        if self.mode not in self.MODES:
+            raise ValueError(f"Validation policy {self.mode} is not supported. Supported policies: {self.MODES}")
+        self.record_dir = Path(record_dir) if record_dir is not None else None
+
+    @classmethod
+    def create(cls, validation_policy: Union["ValidationPolicy", str, None]) -> "ValidationPolicy":
+        """
+        Returns the given policy, or creates one from the given mode.
+
+        Args:
+            validation_policy (Union[ValidationPolicy, str, None]): The policy, its mode, or None for the default policy.
+
+        Returns:
+            ValidationPolicy: The policy.
+        """
+        if isinstance(validation_policy, ValidationPolicy):
+            return validation_policy
+
+        return cls(validation_policy)
+
+    @staticmethod
+    def hash_exe_kg(exe_kg: Graph, schema_fingerprint: str) -> str:
+        """
+        Computes the key under which the validation of an ExeKG is recorded.
+
+        Args:
+            exe_kg (Graph): The ExeKG.
+            schema_fingerprint (str): The identifier of the version of the KG schemata and SHACL shapes.
+
+        Returns:
+            str: The key.
+        """
+        if any(isinstance(term, BNode) for triple in exe_kg for term in triple):
+            exe_kg = to_canonical_graph(exe_kg)  # blank node labels differ between parses
+
+        triple_lines = sorted(" ".join(term.n3() for term in triple) for triple in exe_kg)
+        return hash_bytes("\n".join([schema_fingerprint] + triple_lines).encode())
+
+    def check_pipeline_executability(
+        self,
+        exe_kg: Graph,
+        schema_kg: Graph,
+        shacl_shapes: Union[str, Graph],
+        schema_fingerprint: str,
+        focus_nodes: Optional[Iterable[URIRef]] = None,
+    ) -> None:
+        """
+        Validates an ExeKG according to the policy (see check_pipeline_executability() in exe_kg_lib/utils/kg_validation_utils.py).
+        With focus nodes, the ExeKG is not recorded as validated because only part of it is validated.
+
+        Args:
+            exe_kg (Graph): The ExeKG to be validated.
+            schema_kg (Graph): The KG schemata that the ExeKG refers to.
+            shacl_shapes (Union[str, Graph]): The SHACL shapes to validate the ExeKG against.
+            schema_fingerprint (str): The identifier of the version of the KG schemata and SHACL shapes.
+            focus_nodes (Optional[Iterable[URIRef]], optional): The nodes to validate. Defaults to all nodes of the ExeKG.
+
+        Raises:
+            KGValidationError: If the ExeKG is not executable.
+
+        Returns:
+            None
+        """
+        if self.mode == self.NEVER:
+            return
+
+        if self.mode == self.ALWAYS:
+            check_pipeline_executability(exe_kg, schema_kg, shacl_shapes, focus_nodes)
+            return
+
+        record_path = self._get_record_dir() / self.hash_exe_kg(exe_kg, schema_fingerprint)
+        if record_path.exists():
+            print("Skipping validation of the ExeKG because it has already been validated")
+            return
+
+        check_pipeline_executability(exe_kg, schema_kg, shacl_shapes, focus_nodes)
+        if focus_nodes is None:
+            write_atomically(record_path, b"")
+
+    def _get_record_dir(self) -> Path:
+        if self.record_dir is None:
+            return get_cache_dir("validated")
+
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        return self.record_dir
@@ -11,10 +11,7 @@ from typing import Optional
 import typer
 from typing_extensions import Annotated
 
-from exe_kg_lib.classes.exe_kg_actors import (ExeKGConExe, ExeKGConstructor,
-                                              ExeKGConstructorCLI,
-                                              ExeKGExecutor)
-from exe_kg_lib.utils.cli_utils import input_pipeline_info
+from exe_kg_lib import config
 
 app = typer.Typer(name="ML pipeline creation and execution", no_args_is_help=True)
 
@@ -22,7 +19,23 @@ HERE = Path(__file__).resolve().parent
 
 
 @app.command()
-def create_pipeline(json_path: Annotated[Optional[str], typer.Argument()] = None):
+def create_pipeline(
+    json_path: Annotated[Optional[str], typer.Argument()] = None,
+    strict: Annotated[bool, typer.Option(help="Validate the pipeline with pyshacl only.")] = False,
+    validation_policy: Annotated[
+        Optional[str], typer.Option(help='When to validate the pipeline: "always", "once" or "never".')
+    ] = None,
+):
+    if strict:
+        config.STRICT_VALIDATION = True
+    if validation_policy:
+        config.VALIDATION_POLICY = validation_policy
+
+    # imported here, so that the CLI starts without loading the KG and pipeline machinery
+    from exe_kg_lib.classes.exe_kg_actors import (ExeKGConstructor,
+                                                  ExeKGConstructorCLI)
+    from exe_kg_lib.utils.cli_utils import input_pipeline_info
+
     if json_path:
         exe_kg = ExeKGConstructor()
         exe_kg.create_exe_kg_from_json(json_path)
@@ -38,7 +51,20 @@ def create_pipeline(json_path: Annotated[Optional[str], typer.Argument()] = None
 
 
 @app.command()
-def run_pipeline(path: str):
+def run_pipeline(
+    path: str,
+    strict: Annotated[bool, typer.Option(help="Validate the pipeline with pyshacl only.")] = False,
+    validation_policy: Annotated[
+        Optional[str], typer.Option(help='When to validate the pipeline: "always", "once" or "never".')
+    ] = None,
+):
+    if strict:
+        config.STRICT_VALIDATION = True
+    if validation_policy:
+        config.VALIDATION_POLICY = validation_policy
+
+    from exe_kg_lib.classes.exe_kg_actors import ExeKGConExe, ExeKGExecutor
+
     if path.endswith(".ttl"):
         exe_kg = ExeKGExecutor()
     else:
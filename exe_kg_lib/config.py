@@ -1,12 +1,22 @@
 # Copyright (c) 2022 Robert Bosch GmbH
 # SPDX-License-Identifier: AGPL-3.0
 
+import os
 from pathlib import Path
 
 from exe_kg_lib.utils.string_utils import concat_paths
 
 HERE = Path(__file__).parent
 
+# local cache for remote KG schemata and SHACL shapes, see exe_kg_lib/utils/cache_utils.py
+CACHE_DIR = Path(os.environ.get("EXE_KG_LIB_CACHE_DIR", Path.home() / ".cache" / "exe_kg_lib"))
+# if True, remote resources are never fetched and only the local cache is used
+OFFLINE_MODE = os.environ.get("EXE_KG_LIB_OFFLINE", "0").lower() in ("1", "true", "yes")
+# seconds after which a cached remote resource is revalidated against its ETag
+CACHE_MAX_AGE = int(os.environ.get("EXE_KG_LIB_CACHE_MAX_AGE", 24 * 60 * 60))
+# seconds to wait for a remote resource before falling back to the local cache
+CACHE_REQUEST_TIMEOUT = 10
+
 KG_SCHEMAS_DIR = "https://raw.githubusercontent.com/nsai-uio/ExeKGOntology/main"
 GENERATED_KG_SCHEMAS_DIR = concat_paths(KG_SCHEMAS_DIR, "generated_schemata")
 
@@ -44,3 +54,74 @@ KG_SCHEMAS = {
         "generated_shacl_shapes_path": concat_paths(GENERATED_KG_SCHEMAS_DIR, "generated_ml_shacl_shapes.ttl"),
     },
 }
+
+# pool for executing independent pipeline tasks concurrently: "thread", "process" or "sequential"
+EXECUTION_POOL_TYPE = os.environ.get("EXE_KG_LIB_EXECUTION_POOL", "thread")
+# maximum number of concurrently executed pipeline tasks, None lets concurrent.futures decide
+EXECUTION_MAX_WORKERS = None
+# if True, only the input data columns that the pipeline uses are loaded
+PROJECT_INPUT_COLUMNS = True
+# dtypes of the input data columns per DataSemantics sub-class, see exe_kg_lib/utils/data_utils.py
+# ("category" is only applied to object and string columns, other columns keep their dtype)
+DATA_SEMANTICS_DTYPES = {
+    "Numerical": "float64",
+    "Categorical": "category",
+}
+
+# rows per chunk for executing pipelines on input data read in chunks, None reads all rows at once,
+# see ExecutionPlan.run_streaming() in exe_kg_lib/classes/execution_plan.py
+STREAM_CHUNK_SIZE = (
+    int(os.environ["EXE_KG_LIB_STREAM_CHUNK_SIZE"]) if os.environ.get("EXE_KG_LIB_STREAM_CHUNK_SIZE") else None
+)
+
+# if True, task outputs are freed as soon as no later task needs them, see exe_kg_lib/classes/execution_plan.py
+FREE_INTERMEDIATE_OUTPUTS = True
+# if True, the peak memory of task outputs and of the process is printed after executing a pipeline
+REPORT_MEMORY_USAGE = os.environ.get("EXE_KG_LIB_REPORT_MEMORY_USAGE", "0").lower() in ("1", "true", "yes")
+# bytes of task outputs to hold in memory before spilling the least recently used ones to disk, None disables spilling,
+# see exe_kg_lib/classes/output_store.py
+OUTPUT_STORE_MEMORY_LIMIT = (
+    int(os.environ["EXE_KG_LIB_OUTPUT_MEMORY_LIMIT"]) if os.environ.get("EXE_KG_LIB_OUTPUT_MEMORY_LIMIT") else None
+)
+# directory for spilled task outputs, None uses the system's temporary directory
+OUTPUT_STORE_SPILL_DIR = os.environ.get("EXE_KG_LIB_OUTPUT_SPILL_DIR")
+
+# if True, task outputs are cached across pipeline runs and reused for unchanged tasks, see exe_kg_lib/classes/result_cache.py.
+# Off by default, since methods without a fixed seed (e.g. a RandomForestClassifier without random_state) would return
+# their first cached output in all later runs
+RESULT_CACHE_ENABLED = os.environ.get("EXE_KG_LIB_RESULT_CACHE", "0").lower() in ("1", "true", "yes")
+# bytes after which the least recently used task outputs are evicted from the cache
+RESULT_CACHE_MAX_SIZE = int(os.environ.get("EXE_KG_LIB_RESULT_CACHE_MAX_SIZE", 1024**3))
+
+# if True, each split of a cross-validation splitter is trained on an independent clone of the model (in parallel),
+# see exe_kg_lib/utils/task_utils/fold_utils.py
+FOLD_PARALLEL_TRAINING = os.environ.get("EXE_KG_LIB_FOLD_PARALLEL", "0").lower() in ("1", "true", "yes")
+# number of joblib workers used for processing splits in parallel, -1 uses all cores
+FOLD_N_JOBS = int(os.environ.get("EXE_KG_LIB_FOLD_N_JOBS", -1))
+
+# if True, ExeKGs are always validated with pyshacl instead of the native validator for the SHACL features that the
+# ExeKG shapes use, see exe_kg_lib/utils/native_validation_utils.py
+STRICT_VALIDATION = os.environ.get("EXE_KG_LIB_STRICT_VALIDATION", "0").lower() in ("1", "true", "yes")
+# when ExeKGs are validated: "always", "once" per ExeKG content (recorded in the cache directory) or "never",
+# see exe_kg_lib/classes/validation_policy.py
+VALIDATION_POLICY = os.environ.get("EXE_KG_LIB_VALIDATION_POLICY", "once")
+
+# if True, the Python modules of a pipeline's methods (e.g. sklearn, matplotlib) are imported in a background thread
+# while the input data are read, see ExecutionPlan.preload_modules() in exe_kg_lib/classes/execution_plan.py
+PRELOAD_METHOD_MODULES = os.environ.get("EXE_KG_LIB_PRELOAD_MODULES", "1").lower() in ("1", "true", "yes")
+
+# suffix of the compiled execution plans that are cached in CACHE_DIR, see ExecutionPlan.get_path() in
+# exe_kg_lib/classes/execution_plan.py
+EXECUTION_PLAN_SUFFIX = ".plan.pickle"
+
+# number of background threads that encode and write the PNG files of plots, 0 writes them synchronously,
+# see exe_kg_lib/utils/plot_utils.py
+PLOT_WRITER_THREADS = int(os.environ.get("EXE_KG_LIB_PLOT_WRITER_THREADS", 1))
+# maximum number of points of a plotted series, longer series are downsampled before drawing (see PLOT_DOWNSAMPLING)
+# and histograms of longer series are binned with NumPy, see exe_kg_lib/utils/plot_utils.py
+PLOT_MAX_POINTS = int(os.environ.get("EXE_KG_LIB_PLOT_MAX_POINTS", 5000))
+# how plotted series longer than PLOT_MAX_POINTS are downsampled: "lttb" (keeps the shape of lines),
+# "minmax" (keeps the extremes) or "none" (all points are drawn, which is the default as it changes no plot)
+PLOT_DOWNSAMPLING = os.environ.get("EXE_KG_LIB_PLOT_DOWNSAMPLING", "none")
+# maximum number of value labels per plotted series if a plot is annotated
+PLOT_MAX_ANNOTATIONS = int(os.environ.get("EXE_KG_LIB_PLOT_MAX_ANNOTATIONS", 100))
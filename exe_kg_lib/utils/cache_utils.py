@@ -0,0 +1,223 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+"""
+Content-addressed local cache for the (mostly remote) resources that are needed for building an ExeKG object,
+i.e. the KG schemata and their SHACL shapes.
+
+Layout of the cache directory:
+    - resources/<sha256 of path>.json: metadata of a fetched path (path, ETag, content hash, fetch time)
+    - blobs/<content hash>: raw content of a resource
+    - blobs/<content hash>.triples.pickle: parsed form of a resource that is an RDF graph
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from rdflib import Graph
+
+from exe_kg_lib import config
+
+
+class CacheMissError(Exception):
+    pass
+
+
+def hash_bytes(content: bytes) -> str:
+    """
+    Computes the hash that is used as key for storing content in the cache.
+
+    Args:
+        content (bytes): The content to hash.
+
+    Returns:
+        str: The hex digest of the content's SHA-256 hash.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_cache_dir(*sub_dirs: str) -> Path:
+    """
+    Returns the cache directory (or one of its sub-directories) and creates it if it does not exist.
+
+    Args:
+        *sub_dirs (str): Names of nested sub-directories of the cache directory.
+
+    Returns:
+        Path: The path of the directory.
+    """
+    cache_dir = Path(config.CACHE_DIR).joinpath(*sub_dirs)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def write_atomically(file_path: Path, content: bytes) -> None:
+    """
+    Writes content to a file via a temporary file, so that concurrent readers never see partial content.
+
+    Args:
+        file_path (Path): The path of the file to write.
+        content (bytes): The content to write.
+
+    Returns:
+        None
+    """
+    # a unique temporary file per call, so that concurrent writers (threads or processes) never share one
+    with tempfile.NamedTemporaryFile(
+        dir=file_path.parent, prefix=f"{file_path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp_file_path = f.name
+        try:
+            f.write(content)
+        except BaseException:
+            f.close()
+            os.remove(tmp_file_path)
+            raise
+    os.replace(tmp_file_path, file_path)
+
+
+def _read_resource_metadata(path: str) -> Optional[Dict[str, Any]]:
+    metadata_path = get_cache_dir("resources") / f"{hash_bytes(path.encode())}.json"
+    if not metadata_path.exists():
+        return None
+
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+
+    if not (get_cache_dir("blobs") / metadata["content_hash"]).exists():
+        return None
+
+    return metadata
+
+
+def _write_resource_metadata(path: str, metadata: Dict[str, Any]) -> None:
+    metadata_path = get_cache_dir("resources") / f"{hash_bytes(path.encode())}.json"
+    write_atomically(metadata_path, json.dumps(metadata).encode())
+
+
+def _read_blob(content_hash: str) -> bytes:
+    with open(get_cache_dir("blobs") / content_hash, "rb") as f:
+        return f.read()
+
+
+def fetch_resource(path: str) -> Tuple[bytes, str]:
+    """
+    Returns the content of a local or remote resource along with its content hash.
+    Remote resources are served from the local cache if they have been fetched less than config.CACHE_MAX_AGE seconds ago.
+    Otherwise, they are revalidated using their ETag and re-downloaded only if they have changed.
+    If config.OFFLINE_MODE is True or the remote host is unreachable, the cached content is used regardless of its age.
+
+    Args:
+        path (str): The local path or URL of the resource.
+
+    Returns:
+        Tuple[bytes, str]: The content of the resource and its hash.
+
+    Raises:
+        CacheMissError: If the resource is remote, cannot be fetched and is not in the cache.
+    """
+    if not path.startswith("http"):
+        with open(path, "rb") as f:
+            content = f.read()
+        return content, hash_bytes(content)
+
+    metadata = _read_resource_metadata(path)
+    if metadata is not None and (config.OFFLINE_MODE or time.time() - metadata["fetched_at"] < config.CACHE_MAX_AGE):
+        return _read_blob(metadata["content_hash"]), metadata["content_hash"]
+
+    if config.OFFLINE_MODE:
+        raise CacheMissError(f"Resource {path} is not in the local cache and cannot be fetched in offline mode")
+
+    headers = {}
+    if metadata is not None and metadata.get("etag"):
+        headers["If-None-Match"] = metadata["etag"]
+
+    try:
+        response = requests.get(path, headers=headers, timeout=config.CACHE_REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if metadata is None:
+            raise CacheMissError(f"Resource {path} is not in the local cache and cannot be fetched: {e}")
+        print(f"Cannot fetch {path}: {e}. Proceeding with cached version...")
+        return _read_blob(metadata["content_hash"]), metadata["content_hash"]
+
+    if response.status_code == 304:  # not modified since last fetch
+        content = _read_blob(metadata["content_hash"])
+    else:
+        content = response.content
+
+    content_hash = hash_bytes(content)
+    blob_path = get_cache_dir("blobs") / content_hash
+    if not blob_path.exists():
+        write_atomically(blob_path, content)
+
+    _write_resource_metadata(
+        path,
+        {
+            "path": path,
+            "etag": response.headers.get("ETag", metadata.get("etag") if metadata else None),
+            "content_hash": content_hash,
+            "fetched_at": time.time(),
+        },
+    )
+
+    return content, content_hash
+
+
+def read_cached_text(path: str) -> str:
+    """
+    Returns the content of a local or remote text resource, using the local cache for remote ones.
+
+    Args:
+        path (str): The local path or URL of the resource.
+
+    Returns:
+        str: The content of the resource.
+    """
+    content, _ = fetch_resource(path)
+    return content.decode("utf-8")
+
+
+def load_cached_graph(path: str, format: str = "n3") -> Tuple[Graph, str]:
+    """
+    Loads an RDF graph from a local or remote resource.
+    The parsed triples are stored in the cache in binary form keyed by the content hash of the resource,
+    so each version of a resource is parsed only once.
+
+    Args:
+        path (str): The local path or URL of the resource.
+        format (str, optional): The RDF serialization format of the resource. Defaults to "n3".
+
+    Returns:
+        Tuple[Graph, str]: The loaded graph and the content hash of the resource.
+    """
+    content, content_hash = fetch_resource(path)
+
+    graph = Graph(bind_namespaces="rdflib")
+    parsed_path = get_cache_dir("blobs") / f"{content_hash}.triples.pickle"
+    if parsed_path.exists():
+        try:
+            with open(parsed_path, "rb") as f:
+                triples, namespaces = pickle.load(f)
+            graph.addN((s, p, o, graph) for s, p, o in triples)
+            for prefix, namespace in namespaces:
+                graph.bind(prefix, namespace)
+            return graph, content_hash
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # corrupted cache entry, fall back to parsing
+            graph = Graph(bind_namespaces="rdflib")
+
+    graph.parse(data=content, format=format, publicID=path)
+    write_atomically(
+        parsed_path,
+        pickle.dumps((list(graph), list(graph.namespaces())), protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+    return graph, content_hash
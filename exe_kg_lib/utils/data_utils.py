@@ -0,0 +1,319 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import os
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+InputDataReader = Callable[[str, Optional[List[str]]], pd.DataFrame]
+InputDataChunkReader = Callable[[str, Optional[List[str]], int], Iterator[pd.DataFrame]]
+
+# readers of input data keyed by lower-case file extension (e.g. ".csv"), URI scheme (e.g. "s3://") or DIRECTORY_READER_KEY
+_input_data_readers: Dict[str, InputDataReader] = {}
+# readers of input data in chunks of rows, keyed like _input_data_readers
+_input_data_chunk_readers: Dict[str, InputDataChunkReader] = {}
+
+# key of the reader that is used for directories, e.g. partitioned Parquet datasets
+DIRECTORY_READER_KEY = "<directory>"
+
+
+def register_input_data_reader(key: str, reader: InputDataReader) -> None:
+    """
+    Registers a reader for input data files. Existing readers for the same key are replaced.
+
+    Args:
+        key (str): A file extension including the dot (e.g. ".csv"), a URI scheme including "://" (e.g. "s3://") or DIRECTORY_READER_KEY.
+        reader (InputDataReader): A function that receives the path and the columns to read (None for all columns)
+                                  and returns the data as DataFrame.
+
+    Returns:
+        None
+    """
+    _input_data_readers[key.lower()] = reader
+
+
+def register_input_data_chunk_reader(key: str, reader: InputDataChunkReader) -> None:
+    """
+    Registers a reader for input data files that yields the data in chunks of rows. Existing readers for the same key are replaced.
+
+    Args:
+        key (str): A file extension including the dot (e.g. ".csv"), a URI scheme including "://" (e.g. "s3://") or DIRECTORY_READER_KEY.
+        reader (InputDataChunkReader): A function that receives the path, the columns to read (None for all columns)
+                                       and the maximum number of rows per chunk, and yields the data as DataFrames.
+
+    Returns:
+        None
+    """
+    _input_data_chunk_readers[key.lower()] = reader
+
+
+def get_input_data_reader(input_data_path: str) -> InputDataReader:
+    """
+    Returns the reader for an input data path, based on its URI scheme, whether it is a directory, or its file extension.
+
+    Args:
+        input_data_path (str): The path to the input data.
+
+    Returns:
+        InputDataReader: The reader.
+
+    Raises:
+        ValueError: If the input data file format is not supported.
+    """
+    reader = _find_reader(_input_data_readers, input_data_path)
+    if reader is None:
+        raise ValueError(f"Unsupported file format for input data: {input_data_path}")
+
+    return reader
+
+
+def _find_reader(readers: Dict[str, Callable], input_data_path: str) -> Optional[Callable]:
+    scheme = urlparse(input_data_path).scheme
+    if len(scheme) > 1 and f"{scheme}://".lower() in readers:  # single letters are Windows drives
+        return readers[f"{scheme}://".lower()]
+
+    if os.path.isdir(input_data_path) and DIRECTORY_READER_KEY in readers:
+        return readers[DIRECTORY_READER_KEY]
+
+    extension = os.path.splitext(input_data_path.rstrip("/"))[1].lower()
+    return readers.get(extension)
+
+
+def read_input_data(
+    input_data_path: str, columns: Optional[List[str]] = None, dtypes: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Reads the input data of a pipeline using the registered reader for its path (see get_input_data_reader()).
+
+    Args:
+        input_data_path (str): The path to the input data.
+        columns (List[str], optional): The columns to read. Defaults to all columns.
+        dtypes (Dict[str, str], optional): The dtypes to convert columns to. Columns that cannot be converted keep their dtype.
+
+    Returns:
+        pd.DataFrame: The input data.
+
+    Raises:
+        ValueError: If the input data file format is not supported.
+    """
+    input_data = get_input_data_reader(input_data_path)(input_data_path, columns)
+
+    if dtypes:
+        input_data = convert_dtypes(input_data, dtypes)
+
+    return input_data
+
+
+def read_input_data_chunks(
+    input_data_path: str, chunk_size: int, columns: Optional[List[str]] = None, dtypes: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads the input data of a pipeline in chunks of rows using the registered chunk reader for its path.
+    If no chunk reader is registered for the path, the data are read at once with read_input_data() and then split into chunks.
+    The index of the chunks continues across chunks, i.e. the chunks can be concatenated to the whole data.
+
+    Args:
+        input_data_path (str): The path to the input data.
+        chunk_size (int): The maximum number of rows per chunk.
+        columns (List[str], optional): The columns to read. Defaults to all columns.
+        dtypes (Dict[str, str], optional): The dtypes to convert columns to. Columns that cannot be converted keep their dtype.
+
+    Yields:
+        pd.DataFrame: The chunks of the input data.
+
+    Raises:
+        ValueError: If the input data file format is not supported.
+    """
+    chunk_reader = _find_reader(_input_data_chunk_readers, input_data_path)
+    if chunk_reader is None:
+        print(f"No chunk reader for input data: {input_data_path}. Reading it at once...")
+        chunks = _split_into_chunks(read_input_data(input_data_path, columns), chunk_size)
+    else:
+        chunks = chunk_reader(input_data_path, columns, chunk_size)
+
+    row_count = 0
+    for chunk in chunks:
+        if isinstance(chunk.index, pd.RangeIndex):
+            chunk.index = pd.RangeIndex(row_count, row_count + len(chunk))
+        row_count += len(chunk)
+        yield convert_dtypes(chunk, dtypes) if dtypes else chunk
+
+
+def _split_into_chunks(input_data: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(input_data), chunk_size):
+        yield input_data.iloc[start : start + chunk_size].copy()
+
+
+def _read_csv(input_data_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    return pd.read_csv(input_data_path, delimiter=",", encoding="ISO-8859-1", usecols=columns)
+
+
+def _read_csv_chunks(input_data_path: str, columns: Optional[List[str]], chunk_size: int) -> Iterator[pd.DataFrame]:
+    with pd.read_csv(
+        input_data_path, delimiter=",", encoding="ISO-8859-1", usecols=columns, chunksize=chunk_size
+    ) as reader:
+        yield from reader
+
+
+def _read_parquet(input_data_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    # works for single files and for (partitioned) directories of Parquet files
+    return pd.read_parquet(input_data_path, columns=columns)
+
+
+def _read_parquet_chunks(input_data_path: str, columns: Optional[List[str]], chunk_size: int) -> Iterator[pd.DataFrame]:
+    try:
+        from pyarrow import dataset
+    except ImportError:
+        raise ImportError(f"pyarrow is required for reading {input_data_path}. Install it with: pip install pyarrow")
+
+    # only one batch of rows is held in memory at a time
+    for batch in dataset.dataset(input_data_path, format="parquet").to_batches(columns=columns, batch_size=chunk_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def _read_arrow_ipc(input_data_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    try:
+        from pyarrow import feather
+    except ImportError:
+        raise ImportError(f"pyarrow is required for reading {input_data_path}. Install it with: pip install pyarrow")
+
+    # the file is memory-mapped and split_blocks allows zero-copy conversion of columns without nulls
+    table = feather.read_table(input_data_path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def _read_arrow_ipc_chunks(
+    input_data_path: str, columns: Optional[List[str]], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    # slices of the memory-mapped table are zero-copy, so only the rows of the current chunk are read from disk
+    return _split_into_chunks(_read_arrow_ipc(input_data_path, columns), chunk_size)
+
+
+def _read_npy(input_data_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    # the array is memory-mapped, so only the accessed columns are read from disk
+    array = np.load(input_data_path, mmap_mode="r")
+    if array.dtype.names is not None:  # structured array with named fields
+        names = columns if columns is not None else list(array.dtype.names)
+        return pd.DataFrame({name: array[name] for name in names}, copy=False)
+
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    input_data = pd.DataFrame(array, columns=[str(i) for i in range(array.shape[1])], copy=False)
+    return input_data[columns] if columns is not None else input_data
+
+
+def _read_npy_chunks(input_data_path: str, columns: Optional[List[str]], chunk_size: int) -> Iterator[pd.DataFrame]:
+    # the array is memory-mapped, so each chunk is copied into memory only when it is used
+    return _split_into_chunks(_read_npy(input_data_path, columns), chunk_size)
+
+
+def _read_file_uri(input_data_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    local_path = urlparse(input_data_path).path
+    return get_input_data_reader(local_path)(local_path, columns)
+
+
+def _read_file_uri_chunks(
+    input_data_path: str, columns: Optional[List[str]], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    local_path = urlparse(input_data_path).path
+    return read_input_data_chunks(local_path, chunk_size, columns)
+
+
+register_input_data_reader("file://", _read_file_uri)
+register_input_data_reader(".csv", _read_csv)
+register_input_data_reader(".pq", _read_parquet)
+register_input_data_reader(".parquet", _read_parquet)
+register_input_data_reader(DIRECTORY_READER_KEY, _read_parquet)
+register_input_data_reader(".feather", _read_arrow_ipc)
+register_input_data_reader(".arrow", _read_arrow_ipc)
+register_input_data_reader(".ipc", _read_arrow_ipc)
+register_input_data_reader(".npy", _read_npy)
+
+register_input_data_chunk_reader("file://", _read_file_uri_chunks)
+register_input_data_chunk_reader(".csv", _read_csv_chunks)
+register_input_data_chunk_reader(".pq", _read_parquet_chunks)
+register_input_data_chunk_reader(".parquet", _read_parquet_chunks)
+register_input_data_chunk_reader(DIRECTORY_READER_KEY, _read_parquet_chunks)
+register_input_data_chunk_reader(".feather", _read_arrow_ipc_chunks)
+register_input_data_chunk_reader(".arrow", _read_arrow_ipc_chunks)
+register_input_data_chunk_reader(".ipc", _read_arrow_ipc_chunks)
+register_input_data_chunk_reader(".npy", _read_npy_chunks)
+
+
+def select_columns(data: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Selects columns of a DataFrame without creating intermediate copies.
+    A single column is returned as a view of the data. Multiple columns are selected as one block in one operation,
+    which is considerably cheaper than selecting each column separately and concatenating the results.
+
+    Args:
+        data (pd.DataFrame): The data to select the columns from.
+        columns (List[str]): The names of the columns to select, in the order of the returned DataFrame.
+
+    Returns:
+        pd.DataFrame: The selected columns. It must not be modified, since it may share memory with data.
+
+    Raises:
+        KeyError: If a column does not exist in the data.
+    """
+    if len(columns) == 1:
+        return data[columns[0]].to_frame()
+
+    return data.loc[:, columns]
+
+
+def convert_dtypes(input_data: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Converts columns of the input data to the given dtypes.
+    Only object and string columns are converted to "category", so that e.g. numerical label columns keep their numeric dtype.
+
+    Args:
+        input_data (pd.DataFrame): The input data.
+        dtypes (Dict[str, str]): The dtype to convert each column to.
+
+    Returns:
+        pd.DataFrame: The input data with converted columns. Columns that cannot be converted keep their dtype.
+    """
+    for column, dtype in dtypes.items():
+        if column not in input_data.columns or input_data[column].dtype == dtype:
+            continue
+        if dtype == "category" and not (
+            pd.api.types.is_object_dtype(input_data[column]) or pd.api.types.is_string_dtype(input_data[column])
+        ):
+            continue
+        try:
+            input_data[column] = input_data[column].astype(dtype)
+        except (ValueError, TypeError):
+            print(
+                f"Cannot convert input data column {column} to {dtype}. Proceeding with {input_data[column].dtype}..."
+            )
+
+    return input_data
+
+
+def get_data_semantics_dtypes(
+    column_data_semantics: Dict[str, Optional[str]], data_semantics_dtypes: Dict[str, str]
+) -> Dict[str, str]:
+    """
+    Maps input data columns to dtypes based on their data semantics.
+
+    Args:
+        column_data_semantics (Dict[str, Optional[str]]): The IRI of the DataSemantics sub-class of each column, if any.
+        data_semantics_dtypes (Dict[str, str]): The dtype for each DataSemantics sub-class name (e.g. "Numerical").
+
+    Returns:
+        Dict[str, str]: The dtype of each column that has known data semantics.
+    """
+    dtypes = {}
+    for column, data_semantics_iri in column_data_semantics.items():
+        if data_semantics_iri is None:
+            continue
+        data_semantics_name = data_semantics_iri.split("#")[-1]
+        if data_semantics_name in data_semantics_dtypes:
+            dtypes[column] = data_semantics_dtypes[data_semantics_name]
+
+    return dtypes
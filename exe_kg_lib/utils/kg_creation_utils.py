@@ -5,7 +5,7 @@ import os
 import re
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Callable, Dict, List, Union
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
 from rdflib import RDF, XSD, Graph, Literal, Namespace, URIRef
 
@@ -13,7 +13,7 @@ from exe_kg_lib.classes.exe_kg_serialization.method import \
     Method as MethodSerializable
 from exe_kg_lib.classes.exe_kg_serialization.pipeline import Pipeline
 from exe_kg_lib.classes.method import Method
-from exe_kg_lib.utils.kg_validation_utils import check_kg_executability
+from exe_kg_lib.utils.kg_validation_utils import check_pipeline_executability
 from exe_kg_lib.utils.string_utils import (TASK_OUTPUT_NAME_REGEX,
                                            get_instance_name)
 
@@ -332,16 +332,17 @@ def field_value_to_literal(field_value: Union[str, int, float, bool]) -> Literal
 def save_exe_kg(
     exe_kg: Graph,
     input_kg: Graph,
-    shacl_shapes_s: str,
+    shacl_shapes: Union[str, Graph],
     pipeline_serializable: Pipeline,
     dir_path: str,
     pipeline_name: str,
     check_executability: bool = True,
     save_to_ttl: bool = True,
     save_to_json: bool = True,
+    focus_nodes: Optional[Iterable[URIRef]] = None,
 ) -> None:
     if check_executability:
-        check_kg_executability(exe_kg + input_kg, shacl_shapes_s)
+        check_pipeline_executability(exe_kg, input_kg, shacl_shapes, focus_nodes)
 
     os.makedirs(dir_path, exist_ok=True)
 
@@ -1,11 +1,17 @@
 # Copyright (c) 2022 Robert Bosch GmbH
 # SPDX-License-Identifier: AGPL-3.0
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Optional, Set, Union
 
 import rdflib
-from pyshacl import validate
+from rdflib import URIRef
+from rdflib.graph import ReadOnlyGraphAggregate
+
+from exe_kg_lib import config
+from exe_kg_lib.utils.native_validation_utils import (RecursiveShapeError,
+                                                      compile_shacl_shapes)
 
 HERE = Path(__file__).parent
 
@@ -14,13 +20,23 @@ class KGValidationError(Exception):
     pass
 
 
-def check_kg_executability(kg: Union[rdflib.Graph, str], shacl_shapes_s: str) -> None:
+def check_kg_executability(
+    kg: Union[rdflib.Graph, str],
+    shacl_shapes: Union[str, rdflib.Graph],
+    focus_nodes: Optional[Iterable[URIRef]] = None,
+    strict: bool = None,
+) -> None:
     """
     Checks the executability of a KG by validating it against a set of SHACL shapes.
+    Unless in strict mode, the KG is first checked by the native validator (see exe_kg_lib/utils/native_validation_utils.py)
+    and pyshacl is used only if the KG does not conform to the shapes (for the validation report) or if the shapes use
+    SHACL features that the native validator does not support (including recursive shapes).
 
     Args:
         kg (Union[rdflib.Graph, str]): The KG to be validated. It can be either an rdflib.Graph object or a string representing the path to the KG file.
-        shacl_shapes_s (str): The SHACL shapes to validate the KG against.
+        shacl_shapes (Union[str, rdflib.Graph]): The SHACL shapes to validate the KG against, either parsed (e.g. ExeKGBase.shacl_shapes_kg) or in Turtle format.
+        focus_nodes (Optional[Iterable[URIRef]], optional): If given, only these nodes are validated. Defaults to all nodes targeted by the shapes.
+        strict (bool, optional): If True, the KG is validated with pyshacl only. Defaults to config.STRICT_VALIDATION.
 
     Raises:
         KGValidationError: If the KG is not executable, an exception is raised with an error message.
@@ -28,10 +44,102 @@ def check_kg_executability(kg: Union[rdflib.Graph, str], shacl_shapes_s: str) ->
     Returns:
         None: This function does not return any value.
     """
-    r = validate(data_graph=kg, shacl_graph=shacl_shapes_s)
+    if focus_nodes is not None:
+        focus_nodes = [node for node in focus_nodes if isinstance(node, URIRef)]
+        if not focus_nodes:  # pyshacl would validate all nodes
+            return
+
+    if strict is None:
+        strict = config.STRICT_VALIDATION
+    if isinstance(shacl_shapes, str):
+        shacl_shapes = get_shacl_shapes_graph(shacl_shapes)
+
+    if not strict and isinstance(kg, rdflib.Graph):
+        compiled_shapes = compile_shacl_shapes(shacl_shapes)
+        try:
+            if compiled_shapes is not None and compiled_shapes.conforms(kg, focus_nodes):
+                return
+        except RecursiveShapeError:
+            pass  # recursive shapes are left to pyshacl
+
+    from pyshacl import \
+        validate  # imported here, since pyshacl is needed only if the native validator cannot decide
+
+    r = validate(data_graph=kg, shacl_graph=shacl_shapes, focus_nodes=focus_nodes)
     conforms, _, results_text = r
     if not conforms:
         raise KGValidationError(
             f"{results_text}\n\nThe KG is not executable. To ensure executability of the KG as an ML pipeline, please fix the above error(s) and try again."
         )
     return
+
+
+def check_pipeline_executability(
+    exe_kg: rdflib.Graph,
+    schema_kg: rdflib.Graph,
+    shacl_shapes: Union[str, rdflib.Graph],
+    focus_nodes: Optional[Iterable[URIRef]] = None,
+) -> None:
+    """
+    Checks the executability of an ExeKG by validating its own nodes against a set of SHACL shapes.
+    The ExeKG is layered on top of the KG schemata instead of being merged with them, and nodes of the KG schemata are not validated.
+
+    Args:
+        exe_kg (rdflib.Graph): The ExeKG to be validated.
+        schema_kg (rdflib.Graph): The KG schemata that the ExeKG refers to. It may already include exe_kg (see SchemaRegistry.layer()).
+        shacl_shapes (Union[str, rdflib.Graph]): The SHACL shapes to validate the ExeKG against, either parsed or in Turtle format.
+        focus_nodes (Optional[Iterable[URIRef]], optional): The nodes to validate, e.g. the nodes touched by an edit. Defaults to get_pipeline_nodes(exe_kg).
+
+    Raises:
+        KGValidationError: If the ExeKG is not executable.
+
+    Returns:
+        None
+    """
+    if focus_nodes is None:
+        focus_nodes = get_pipeline_nodes(exe_kg)
+
+    check_kg_executability(_layer_graphs(schema_kg, exe_kg), shacl_shapes, focus_nodes)
+
+
+def get_pipeline_nodes(exe_kg: rdflib.Graph) -> Set[URIRef]:
+    """
+    Returns the nodes that an ExeKG describes, i.e. the subjects of its triples.
+
+    Args:
+        exe_kg (rdflib.Graph): The ExeKG.
+
+    Returns:
+        Set[URIRef]: The IRIs of the nodes.
+    """
+    return {s for s in exe_kg.subjects(unique=True) if isinstance(s, URIRef)}
+
+
+@lru_cache(maxsize=8)
+def get_shacl_shapes_graph(shacl_shapes_s: str) -> rdflib.Graph:
+    """
+    Parses SHACL shapes in Turtle format. The result is cached per process and must not be modified.
+
+    Args:
+        shacl_shapes_s (str): The SHACL shapes.
+
+    Returns:
+        rdflib.Graph: The parsed shapes graph.
+    """
+    return rdflib.Graph().parse(data=shacl_shapes_s, format="turtle")
+
+
+def _layer_graphs(*kgs: rdflib.Graph) -> rdflib.Graph:
+    # read-only view of the graphs without copying them, flattening views that are already layered
+    graphs = []
+    for kg in kgs:
+        for graph in kg.graphs if isinstance(kg, ReadOnlyGraphAggregate) else [kg]:
+            if not any(graph is existing_graph for existing_graph in graphs):
+                graphs.append(graph)
+
+    layered_kg = ReadOnlyGraphAggregate(graphs)
+    for kg in kgs:
+        for prefix, namespace in kg.namespaces():
+            layered_kg.namespace_manager.bind(prefix, namespace, override=False)
+
+    return layered_kg
@@ -0,0 +1,92 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import sys
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from exe_kg_lib.utils.task_utils.split_utils import SplitView
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def get_size_in_bytes(value: Any) -> int:
+    """
+    Estimates the memory that a task output occupies (see get_object_sizes()).
+
+    Args:
+        value (Any): The value to estimate the size of.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    return sum(get_object_sizes(value).values())
+
+
+def get_object_sizes(value: Any) -> Dict[int, int]:
+    """
+    Estimates the memory of the objects that a task output holds, keyed by object id,
+    so that objects shared by several outputs (e.g. the base of SplitView objects) can be counted once.
+    The estimation is shallow, i.e. the buffers of pandas and numpy objects are counted, but not the Python objects
+    that object columns refer to, and the objects that other objects (e.g. fitted models) refer to are not counted.
+
+    Args:
+        value (Any): The value to estimate the sizes of.
+
+    Returns:
+        Dict[int, int]: The estimated size in bytes of each object, keyed by its id.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        memory_usage = value.memory_usage(index=True, deep=False)
+        return {id(value): int(memory_usage.sum()) if isinstance(value, pd.DataFrame) else int(memory_usage)}
+    if isinstance(value, np.ndarray):
+        return {id(value): int(value.nbytes)}
+    if isinstance(value, SplitView):
+        object_sizes = get_object_sizes(value.base)
+        object_sizes[id(value)] = sum(int(indices.nbytes) for indices in value.indices_per_split)
+        return object_sizes
+    if isinstance(value, (list, tuple)):
+        object_sizes = {id(value): sys.getsizeof(value)}
+        for elem in value:
+            object_sizes.update(get_object_sizes(elem))
+        return object_sizes
+
+    return {id(value): sys.getsizeof(value)}
+
+
+def get_peak_rss_in_bytes() -> Optional[int]:
+    """
+    Returns the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: The peak RSS in bytes, or None if it cannot be determined on this platform.
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # bytes on macOS, kilobytes on Linux
+
+
+def format_size(size_in_bytes: int) -> str:
+    """
+    Formats a size in bytes as a human-readable string.
+
+    Args:
+        size_in_bytes (int): The size in bytes.
+
+    Returns:
+        str: The formatted size, e.g. "12.3 MB".
+    """
+    size = float(size_in_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} TB"
@@ -0,0 +1,416 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import rdflib
+from rdflib import OWL, RDF, RDFS, XSD, BNode, Literal, URIRef
+from rdflib.collection import Collection
+from rdflib.namespace import SH
+
+"""
+Native validator for the subset of SHACL that the ExeKG shapes use (targets, cardinalities, value types, sh:in, sh:node,
+logical constraints and property paths). The shapes are compiled once into Python checks that are evaluated over
+memoized lookups of the data graph, instead of pyshacl's generic shape and constraint machinery.
+
+The native validator only decides whether a KG conforms. It is conservative: shapes with SHACL features that it does not
+support are not compiled at all, recursive shape references raise RecursiveShapeError, and on non-conformance or
+RecursiveShapeError the caller is expected to run pyshacl for the authoritative result and the validation report
+(see check_kg_executability() in exe_kg_lib/utils/kg_validation_utils.py).
+"""
+
+# SHACL terms that do not affect conformance
+_IGNORED_SHAPE_PREDICATES = {
+    SH.name,
+    SH.description,
+    SH.message,
+    SH.severity,
+    SH.order,
+    SH.group,
+    SH.defaultValue,
+}
+_TARGET_PREDICATES = {SH.targetClass, SH.targetNode, SH.targetSubjectsOf, SH.targetObjectsOf}
+_NODE_KINDS = {
+    SH.IRI: (URIRef,),
+    SH.BlankNode: (BNode,),
+    SH.Literal: (Literal,),
+    SH.BlankNodeOrIRI: (BNode, URIRef),
+    SH.BlankNodeOrLiteral: (BNode, Literal),
+    SH.IRIOrLiteral: (URIRef, Literal),
+}
+_PATTERN_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}
+
+# value nodes reached from a focus node via a property path
+_Path = Callable[["_TripleView", rdflib.term.Node], Set[rdflib.term.Node]]
+# checks the value nodes of a focus node
+_Check = Callable[["_TripleView", Set[rdflib.term.Node]], bool]
+
+
+class UnsupportedShapeError(Exception):
+    pass
+
+
+# raised when a shape is checked again for a focus node while it is being checked for it (e.g. via sh:node),
+# since the conformance then depends on recursive SHACL semantics, which are left to pyshacl
+class RecursiveShapeError(Exception):
+    pass
+
+
+class _TripleView:
+    """
+    Memoized lookups over a data graph for the duration of one validation.
+    """
+
+    def __init__(self, kg: rdflib.Graph):
+        self.kg = kg
+        self._objects: Dict[tuple, Set[rdflib.term.Node]] = {}
+        self._subjects: Dict[tuple, Set[rdflib.term.Node]] = {}
+        self._superclasses: Dict[rdflib.term.Node, Set[rdflib.term.Node]] = {}
+        self._subclasses: Dict[rdflib.term.Node, Set[rdflib.term.Node]] = {}
+        self.active_shapes: Set[tuple] = set()  # (shape, focus node) pairs being checked, for detecting recursion
+
+    def objects(self, s: rdflib.term.Node, p: URIRef) -> Set[rdflib.term.Node]:
+        key = (s, p)
+        if key not in self._objects:
+            self._objects[key] = set(self.kg.objects(s, p))
+        return self._objects[key]
+
+    def subjects(self, p: URIRef, o: rdflib.term.Node) -> Set[rdflib.term.Node]:
+        key = (p, o)
+        if key not in self._subjects:
+            self._subjects[key] = set(self.kg.subjects(p, o))
+        return self._subjects[key]
+
+    def superclasses(self, class_iri: rdflib.term.Node) -> Set[rdflib.term.Node]:
+        # rdfs:subClassOf*
+        if class_iri not in self._superclasses:
+            self._superclasses[class_iri] = set(self.kg.transitive_objects(class_iri, RDFS.subClassOf))
+        return self._superclasses[class_iri]
+
+    def subclasses(self, class_iri: rdflib.term.Node) -> Set[rdflib.term.Node]:
+        # inverse of rdfs:subClassOf*
+        if class_iri not in self._subclasses:
+            self._subclasses[class_iri] = set(self.kg.transitive_subjects(RDFS.subClassOf, class_iri))
+        return self._subclasses[class_iri]
+
+    def classes(self, node: rdflib.term.Node) -> Set[rdflib.term.Node]:
+        # rdf:type/rdfs:subClassOf*
+        classes = set()
+        for type_iri in self.objects(node, RDF.type):
+            classes |= self.superclasses(type_iri)
+        return classes
+
+
+class _CompiledShape:
+    def __init__(self, node: rdflib.term.Node):
+        self.node = node
+        self.path: Optional[_Path] = None  # None for node shapes
+        self.checks: List[_Check] = []
+        self.property_shapes: List["_CompiledShape"] = []
+        self.target_classes: Set[rdflib.term.Node] = set()
+        self.target_nodes: Set[rdflib.term.Node] = set()
+        self.target_subjects_of: Set[URIRef] = set()
+        self.target_objects_of: Set[URIRef] = set()
+        self.deactivated = False
+
+    @property
+    def has_targets(self) -> bool:
+        return bool(self.target_classes or self.target_nodes or self.target_subjects_of or self.target_objects_of)
+
+    def get_focus_nodes(self, view: _TripleView) -> Set[rdflib.term.Node]:
+        focus_nodes = set(self.target_nodes)
+        for class_iri in self.target_classes:
+            for subclass_iri in view.subclasses(class_iri):
+                focus_nodes |= view.subjects(RDF.type, subclass_iri)
+        for p in self.target_subjects_of:
+            focus_nodes.update(s for s, _ in view.kg.subject_objects(p))
+        for p in self.target_objects_of:
+            focus_nodes.update(o for _, o in view.kg.subject_objects(p))
+
+        return focus_nodes
+
+    def targets(self, view: _TripleView, node: rdflib.term.Node) -> bool:
+        return (
+            node in self.target_nodes
+            or bool(self.target_classes & view.classes(node))
+            or any(view.objects(node, p) for p in self.target_subjects_of)
+            or any(view.subjects(p, node) for p in self.target_objects_of)
+        )
+
+    def conforms(self, view: _TripleView, focus_node: rdflib.term.Node) -> bool:
+        if self.deactivated:
+            return True
+
+        key = (self.node, focus_node)
+        if key in view.active_shapes:
+            # not a boolean, since sh:not and sh:xone would turn it into a (wrong) conforming result
+            raise RecursiveShapeError(f"Shape {self.node} is recursive for focus node {focus_node}")
+        view.active_shapes.add(key)
+        try:
+            value_nodes = {focus_node} if self.path is None else self.path(view, focus_node)
+            if not all(check(view, value_nodes) for check in self.checks):
+                return False
+
+            return all(
+                property_shape.conforms(view, value_node)
+                for property_shape in self.property_shapes
+                for value_node in value_nodes
+            )
+        finally:
+            view.active_shapes.discard(key)
+
+
+class CompiledShapes:
+    """
+    SHACL shapes compiled into Python checks, see compile_shacl_shapes().
+    """
+
+    def __init__(self, shapes_kg: rdflib.Graph):
+        """
+        Compiles the shapes.
+
+        Args:
+            shapes_kg (rdflib.Graph): The SHACL shapes graph.
+
+        Raises:
+            UnsupportedShapeError: If a shape uses SHACL features that are not supported by the native validator.
+        """
+        self._shapes_kg = shapes_kg
+        self._compiled: Dict[rdflib.term.Node, _CompiledShape] = {}
+
+        shape_nodes = set()
+        for p in _TARGET_PREDICATES:
+            shape_nodes.update(self._shapes_kg.subjects(p, None))
+        for class_type in (RDFS.Class, OWL.Class):  # implicit class targets
+            for shape_type in (SH.NodeShape, SH.PropertyShape):
+                shape_nodes.update(
+                    s for s in self._shapes_kg.subjects(RDF.type, class_type) if (s, RDF.type, shape_type) in shapes_kg
+                )
+
+        # only shapes with targets are validated directly, the others are referenced by them
+        self.root_shapes = [self._compile_shape(shape_node) for shape_node in shape_nodes]
+        self.root_shapes = [shape for shape in self.root_shapes if shape.has_targets and not shape.deactivated]
+
+    def conforms(self, kg: rdflib.Graph, focus_nodes: Optional[Iterable[rdflib.term.Node]] = None) -> bool:
+        """
+        Checks whether a KG conforms to the shapes.
+
+        Args:
+            kg (rdflib.Graph): The data graph.
+            focus_nodes (Optional[Iterable[rdflib.term.Node]], optional): If given, only these nodes are validated.
+                                                                           Defaults to all nodes targeted by the shapes.
+
+        Raises:
+            RecursiveShapeError: If the conformance depends on a recursive shape, which is left to pyshacl.
+
+        Returns:
+            bool: True if the KG conforms to the shapes.
+        """
+        view = _TripleView(kg)
+        if focus_nodes is None:
+            return all(
+                shape.conforms(view, focus_node)
+                for shape in self.root_shapes
+                for focus_node in shape.get_focus_nodes(view)
+            )
+
+        return all(
+            shape.conforms(view, focus_node)
+            for focus_node in set(focus_nodes)
+            for shape in self.root_shapes
+            if shape.targets(view, focus_node)
+        )
+
+    def _compile_shape(self, shape_node: rdflib.term.Node) -> _CompiledShape:
+        if shape_node in self._compiled:
+            return self._compiled[shape_node]
+
+        shape = _CompiledShape(shape_node)
+        self._compiled[shape_node] = shape  # before compiling the constraints, for shapes that refer to themselves
+
+        if any((shape_node, RDF.type, class_type) in self._shapes_kg for class_type in (RDFS.Class, OWL.Class)):
+            shape.target_classes.add(shape_node)
+
+        # constraints with several parameters are compiled once
+        min_count = self._get_single_value(shape_node, SH.minCount)
+        max_count = self._get_single_value(shape_node, SH.maxCount)
+        if min_count is not None or max_count is not None:
+            shape.checks.append(_compile_count(min_count, max_count))
+
+        pattern = self._get_single_value(shape_node, SH.pattern)
+        if pattern is not None:
+            shape.checks.append(_compile_pattern(pattern, self._get_single_value(shape_node, SH.flags) or ""))
+
+        for p, o in self._shapes_kg.predicate_objects(shape_node):
+            if p in (RDF.type, SH.minCount, SH.maxCount, SH.pattern, SH.flags) or p in _IGNORED_SHAPE_PREDICATES:
+                continue
+            elif p == SH.path:
+                shape.path = self._compile_path(o)
+            elif p == SH.targetClass:
+                shape.target_classes.add(o)
+            elif p == SH.targetNode:
+                shape.target_nodes.add(o)
+            elif p == SH.targetSubjectsOf:
+                shape.target_subjects_of.add(o)
+            elif p == SH.targetObjectsOf:
+                shape.target_objects_of.add(o)
+            elif p == SH.deactivated:
+                shape.deactivated = isinstance(o, Literal) and o.toPython() is True
+            elif p == SH.property:
+                shape.property_shapes.append(self._compile_shape(o))
+            else:
+                shape.checks.append(self._compile_constraint(p, o))
+
+        return shape
+
+    def _compile_constraint(self, p: URIRef, o: rdflib.term.Node) -> _Check:
+        if p == SH["class"]:
+            return lambda view, value_nodes: all(
+                not isinstance(value_node, Literal) and o in view.classes(value_node) for value_node in value_nodes
+            )
+        if p == SH.datatype:
+            return lambda view, value_nodes: all(_has_datatype(value_node, o) for value_node in value_nodes)
+        if p == SH.nodeKind:
+            if o not in _NODE_KINDS:
+                raise UnsupportedShapeError(f"Unknown node kind {o}")
+            node_kinds = _NODE_KINDS[o]
+            return lambda view, value_nodes: all(isinstance(value_node, node_kinds) for value_node in value_nodes)
+        if p == SH["in"]:
+            allowed_values = set(Collection(self._shapes_kg, o))
+            return lambda view, value_nodes: value_nodes <= allowed_values
+        if p == SH.hasValue:
+            return lambda view, value_nodes: o in value_nodes
+        if p in (SH.minLength, SH.maxLength):
+            length = o.toPython()
+            compare = (lambda n: n >= length) if p == SH.minLength else (lambda n: n <= length)
+            return lambda view, value_nodes: all(
+                not isinstance(value_node, BNode) and compare(len(str(value_node))) for value_node in value_nodes
+            )
+        if p == SH.node:
+            node_shape = self._compile_shape(o)
+            return lambda view, value_nodes: all(node_shape.conforms(view, value_node) for value_node in value_nodes)
+        if p == SH["not"]:
+            node_shape = self._compile_shape(o)
+            return lambda view, value_nodes: not any(
+                node_shape.conforms(view, value_node) for value_node in value_nodes
+            )
+        if p in (SH["or"], SH["and"], SH.xone):
+            member_shapes = [self._compile_shape(member) for member in Collection(self._shapes_kg, o)]
+            combine = {
+                SH["or"]: lambda n: n >= 1,
+                SH["and"]: lambda n: n == len(member_shapes),
+                SH.xone: lambda n: n == 1,
+            }[p]
+            return lambda view, value_nodes: all(
+                combine(sum(member_shape.conforms(view, value_node) for member_shape in member_shapes))
+                for value_node in value_nodes
+            )
+        if p.startswith(str(SH)):
+            raise UnsupportedShapeError(f"Unsupported SHACL constraint {p}")
+
+        return lambda view, value_nodes: True  # not a SHACL term
+
+    def _compile_path(self, path_node: rdflib.term.Node) -> _Path:
+        if isinstance(path_node, URIRef):
+            return lambda view, node: view.objects(node, path_node)
+
+        if (path_node, RDF.first, None) in self._shapes_kg:  # sequence path
+            step_paths = [self._compile_path(step_node) for step_node in Collection(self._shapes_kg, path_node)]
+
+            def evaluate_sequence_path(view: _TripleView, node: rdflib.term.Node) -> Set[rdflib.term.Node]:
+                nodes = {node}
+                for step_path in step_paths:
+                    nodes = set().union(*(step_path(view, n) for n in nodes))
+                return nodes
+
+            return evaluate_sequence_path
+
+        path_predicates = list(self._shapes_kg.predicate_objects(path_node))
+        if len(path_predicates) != 1:
+            raise UnsupportedShapeError(f"Unsupported property path {path_node}")
+        p, o = path_predicates[0]
+
+        if p == SH.inversePath and isinstance(o, URIRef):
+            return lambda view, node: view.subjects(o, node)
+        if p == SH.alternativePath:
+            alternative_paths = [self._compile_path(member) for member in Collection(self._shapes_kg, o)]
+            return lambda view, node: set().union(*(path(view, node) for path in alternative_paths))
+        if p in (SH.zeroOrMorePath, SH.oneOrMorePath, SH.zeroOrOnePath):
+            step_path = self._compile_path(o)
+
+            def evaluate_repeated_path(view: _TripleView, node: rdflib.term.Node) -> Set[rdflib.term.Node]:
+                reached = step_path(view, node)
+                if p == SH.zeroOrOnePath:
+                    return reached | {node}
+                frontier = set(reached)
+                while frontier:
+                    frontier = set().union(*(step_path(view, n) for n in frontier)) - reached
+                    reached |= frontier
+                return reached | {node} if p == SH.zeroOrMorePath else reached
+
+            return evaluate_repeated_path
+
+        raise UnsupportedShapeError(f"Unsupported property path {path_node}")
+
+    def _get_single_value(self, node: rdflib.term.Node, p: URIRef):
+        values = list(self._shapes_kg.objects(node, p))
+        if len(values) > 1:
+            raise UnsupportedShapeError(f"Multiple values of {p} for shape {node}")
+
+        return values[0].toPython() if values else None
+
+
+@lru_cache(maxsize=8)
+def compile_shacl_shapes(shapes_kg: rdflib.Graph) -> Optional[CompiledShapes]:
+    """
+    Compiles SHACL shapes for native validation. The result is cached per shapes graph, which must not be modified.
+
+    Args:
+        shapes_kg (rdflib.Graph): The SHACL shapes graph.
+
+    Returns:
+        Optional[CompiledShapes]: The compiled shapes, or None if the shapes use SHACL features that are not supported.
+    """
+    try:
+        return CompiledShapes(shapes_kg)
+    except UnsupportedShapeError as e:
+        print(f"Cannot compile SHACL shapes for native validation: {e}. Proceeding with pyshacl...")
+        return None
+
+
+def _compile_count(min_count: Optional[int], max_count: Optional[int]) -> _Check:
+    def check_count(view: _TripleView, value_nodes: Set[rdflib.term.Node]) -> bool:
+        if min_count is not None and len(value_nodes) < min_count:
+            return False
+        return max_count is None or len(value_nodes) <= max_count
+
+    return check_count
+
+
+def _compile_pattern(pattern: str, flags: str) -> _Check:
+    regex_flags = 0
+    for flag in flags:
+        if flag not in _PATTERN_FLAGS:
+            raise UnsupportedShapeError(f"Unsupported regular expression flag {flag}")
+        regex_flags |= _PATTERN_FLAGS[flag]
+    regex = re.compile(pattern, regex_flags)
+
+    return lambda view, value_nodes: all(
+        not isinstance(value_node, BNode) and regex.search(str(value_node)) is not None for value_node in value_nodes
+    )
+
+
+def _has_datatype(value_node: rdflib.term.Node, datatype: rdflib.term.Node) -> bool:
+    if not isinstance(value_node, Literal):
+        return False
+    if value_node.language is not None:
+        return datatype == RDF.langString
+    if (value_node.datatype or XSD.string) != datatype:
+        return False
+
+    # ill-typed literals (e.g. "abc"^^xsd:integer) are not converted by rdflib, which is treated as a violation
+    return datatype in (XSD.string, RDF.langString) or (
+        value_node.value is not None and not getattr(value_node, "ill_typed", False)
+    )
@@ -0,0 +1,250 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import atexit
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from exe_kg_lib import config
+
+_writer: Optional[ThreadPoolExecutor] = None
+_pending_writes: List[Future] = []
+_lock = threading.Lock()
+
+
+def create_figure(figsize: Tuple[float, float]):
+    """
+    Creates a matplotlib figure that is rendered by the Agg backend, without using the global state of pyplot.
+    Such figures are not registered in pyplot (i.e. they are freed when they are no longer referenced),
+    and different figures can be modified and rendered concurrently from different threads.
+
+    Args:
+        figsize (Tuple[float, float]): The width and height of the figure in inches.
+
+    Returns:
+        matplotlib.figure.Figure: The figure.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)  # attaches itself to the figure as fig.canvas
+    return fig
+
+
+def save_figure(fig, path: Path) -> None:
+    """
+    Saves a figure created by create_figure() as a PNG file.
+    The figure is rendered immediately, so it can be modified afterwards, while the PNG encoding and the writing of the file
+    are done in the background by config.PLOT_WRITER_THREADS threads (see wait_for_plot_writes()).
+
+    Args:
+        fig (matplotlib.figure.Figure): The figure.
+        path (Path): The path of the PNG file.
+
+    Returns:
+        None
+    """
+    fig.canvas.draw()
+    rgba = np.array(fig.canvas.buffer_rgba())  # copy of the rendered pixels, independent of later changes of the figure
+    dpi = fig.dpi
+
+    writer = _get_writer()
+    if writer is None:
+        _write_png(rgba, dpi, path)
+        return
+
+    future = writer.submit(_write_png, rgba, dpi, path)
+    with _lock:
+        _pending_writes.append(future)
+
+
+def wait_for_plot_writes() -> None:
+    """
+    Waits until all PNG files passed to save_figure() have been written.
+
+    Raises:
+        Exception: The first exception raised while writing a file, if any.
+
+    Returns:
+        None
+    """
+    with _lock:
+        futures = list(_pending_writes)
+        _pending_writes.clear()
+
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+
+
+def downsample_series(x: Any, y: np.ndarray, max_points: int = None, method: str = None) -> Tuple[Any, np.ndarray]:
+    """
+    Reduces a series to at most max_points points before it is drawn, so that the time for drawing it is bounded.
+    Supported methods:
+        - "lttb": Largest-Triangle-Three-Buckets, which keeps the visual shape of a line
+        - "minmax": the minimum and maximum of equally-sized buckets, which keeps the extremes (e.g. spikes)
+        - "none": no downsampling
+    Non-numeric series and series with at most max_points points are returned unchanged.
+
+    Args:
+        x (Any): The x values, e.g. a pandas Index. Non-numeric x values are treated as equally spaced.
+        y (np.ndarray): The y values.
+        max_points (int, optional): The maximum number of points. Defaults to config.PLOT_MAX_POINTS.
+        method (str, optional): "lttb", "minmax" or "none". Defaults to config.PLOT_DOWNSAMPLING.
+
+    Raises:
+        ValueError: If the method is not supported.
+
+    Returns:
+        Tuple[Any, np.ndarray]: The selected x and y values, in their original order.
+    """
+    if max_points is None:
+        max_points = config.PLOT_MAX_POINTS
+    if method is None:
+        method = config.PLOT_DOWNSAMPLING
+    if method not in ("lttb", "minmax", "none"):
+        raise ValueError(f"Downsampling method {method} is not supported. Supported methods: lttb, minmax, none")
+
+    y = np.asarray(y)
+    if method == "none" or len(y) <= max(max_points, 3) or not np.issubdtype(y.dtype, np.number):
+        return x, y
+
+    if method == "lttb":
+        positions = np.asarray(x, dtype=float) if np.issubdtype(np.asarray(x).dtype, np.number) else None
+        selected_is = _select_lttb(positions, y.astype(float), max_points)
+    else:
+        selected_is = _select_min_max(y.astype(float), max_points)
+
+    return x[selected_is], y[selected_is]
+
+
+def bin_values(
+    values: np.ndarray, bins: Any = None, range: Tuple[float, float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the histogram of values with NumPy, so that a histogram plot draws one weighted value per bin
+    (i.e. Axes.hist(edges[:-1], bins=edges, weights=counts)) instead of processing all values.
+    NaN values are ignored.
+
+    Args:
+        values (np.ndarray): The values.
+        bins (Any, optional): The bins as accepted by np.histogram(). Defaults to matplotlib's rcParams["hist.bins"].
+        range (Tuple[float, float], optional): The lower and upper range of the bins. Defaults to the range of the values.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The counts and the edges of the bins.
+    """
+    if bins is None:
+        from matplotlib import rcParams
+
+        bins = rcParams["hist.bins"]
+
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.floating):
+        values = values[~np.isnan(values)]
+
+    return np.histogram(values, bins=bins, range=range)
+
+
+def select_annotated_points(n_points: int, max_annotations: int = None) -> np.ndarray:
+    """
+    Selects equally spaced points of a series to annotate, so that the number of labels is bounded.
+
+    Args:
+        n_points (int): The number of points of the series.
+        max_annotations (int, optional): The maximum number of labels. Defaults to config.PLOT_MAX_ANNOTATIONS.
+
+    Returns:
+        np.ndarray: The indices of the points to annotate.
+    """
+    if max_annotations is None:
+        max_annotations = config.PLOT_MAX_ANNOTATIONS
+    if n_points <= max_annotations:
+        return np.arange(n_points)
+
+    return np.unique(np.linspace(0, n_points - 1, max_annotations).round().astype(int))
+
+
+def _select_lttb(positions: Optional[np.ndarray], y: np.ndarray, max_points: int) -> np.ndarray:
+    # the first and last points are always kept, the others are split into max_points - 2 buckets,
+    # from each of which the point forming the largest triangle with the previously selected point
+    # and the average of the next bucket is selected
+    n = len(y)
+    if positions is None:
+        positions = np.arange(n, dtype=float)
+    y = np.where(np.isnan(y), 0.0, y)  # NaN areas would never be the largest
+
+    bucket_bounds = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected_is = np.empty(max_points, dtype=int)
+    selected_is[0] = 0
+    selected_is[-1] = n - 1
+    previous_i = 0
+    for bucket_i in range(max_points - 2):
+        start, end = bucket_bounds[bucket_i], bucket_bounds[bucket_i + 1]
+        next_end = bucket_bounds[bucket_i + 2] if bucket_i + 2 < len(bucket_bounds) else n
+        next_x = positions[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (positions[previous_i] - next_x) * (y[start:end] - y[previous_i])
+            - (positions[previous_i] - positions[start:end]) * (next_y - y[previous_i])
+        )
+        previous_i = start + int(np.argmax(areas))
+        selected_is[bucket_i + 1] = previous_i
+
+    return selected_is
+
+
+def _select_min_max(y: np.ndarray, max_points: int) -> np.ndarray:
+    # indices of the minimum and maximum of each of max_points // 2 buckets, and of the first and last points
+    n = len(y)
+    bucket_size = -(-n // max(max_points // 2 - 1, 1))
+    bucket_count = -(-n // bucket_size)
+    padding = bucket_count * bucket_size - n
+
+    is_nan = np.isnan(y)
+    y_for_min = np.concatenate([np.where(is_nan, np.inf, y), np.full(padding, np.inf)]).reshape(bucket_count, -1)
+    y_for_max = np.concatenate([np.where(is_nan, -np.inf, y), np.full(padding, -np.inf)]).reshape(bucket_count, -1)
+    bucket_starts = np.arange(bucket_count) * bucket_size
+
+    selected_is = np.concatenate(
+        [[0, n - 1], bucket_starts + y_for_min.argmin(axis=1), bucket_starts + y_for_max.argmax(axis=1)]
+    )
+    return np.unique(np.minimum(selected_is, n - 1))
+
+
+def _write_png(rgba: np.ndarray, dpi: float, path: Path) -> None:
+    from matplotlib.image import imsave
+
+    imsave(path, rgba, format="png", origin="upper", dpi=dpi)  # the same encoding as Figure.savefig() with Agg
+
+
+def _get_writer() -> Optional[ThreadPoolExecutor]:
+    global _writer
+    if config.PLOT_WRITER_THREADS <= 0:
+        return None
+
+    with _lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=config.PLOT_WRITER_THREADS, thread_name_prefix="plot-writer")
+        return _writer
+
+
+def _reset_after_fork() -> None:
+    # the writer threads of the parent do not exist in a forked child process
+    global _writer, _lock
+    _writer = None
+    _pending_writes.clear()
+    _lock = threading.Lock()
+
+
+atexit.register(wait_for_plot_writes)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
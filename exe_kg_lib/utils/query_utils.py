@@ -99,7 +99,7 @@ def query_hierarchy_chain(kg: Graph, entity_iri: str) -> query.Result:
         query.Result: The result of the query.
     """
     return kg.query(
-        f"SELECT ?m2 WHERE {{ ?m1 rdfs:subClassOf+ ?m2 . }}",
+        f"SELECT DISTINCT ?m2 WHERE {{ ?m1 rdfs:subClassOf+ ?m2 . }}",
         initBindings={
             "m1": URIRef(entity_iri),
         },
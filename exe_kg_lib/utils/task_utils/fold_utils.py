@@ -0,0 +1,61 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+from typing import Any, Callable, List
+
+from exe_kg_lib import config
+
+"""
+Helpers for processing the splits of a cross-validation splitter (see ml_tasks.DataSplitting) in parallel.
+They are used by ml_tasks when config.FOLD_PARALLEL_TRAINING is True.
+"""
+
+
+def map_folds(func: Callable, *per_split_args: List[Any]) -> List[Any]:
+    """
+    Applies a function to the values of each split, using config.FOLD_N_JOBS joblib workers.
+
+    Args:
+        func (Callable): The function to apply. It must be picklable, e.g. a module-level function or a method of a picklable object.
+        *per_split_args (List[Any]): Lists with one value per split, passed to func as positional arguments.
+
+    Returns:
+        List[Any]: The results of func, one per split.
+    """
+    if not config.FOLD_PARALLEL_TRAINING or config.FOLD_N_JOBS == 1:
+        return [func(*args) for args in zip(*per_split_args)]
+
+    from joblib import Parallel, delayed
+
+    return Parallel(n_jobs=config.FOLD_N_JOBS)(delayed(func)(*args) for args in zip(*per_split_args))
+
+
+def fit_clone(model: Any, x: Any, y: Any) -> Any:
+    """
+    Fits an unfitted clone of a model, leaving the given model untouched.
+
+    Args:
+        model (Any): The sklearn model to clone.
+        x (Any): The training data.
+        y (Any): The training labels.
+
+    Returns:
+        Any: The fitted clone.
+    """
+    from sklearn.base import clone
+
+    return clone(model).fit(x, y)
+
+
+def predict(model: Any, x: Any) -> Any:
+    """
+    Predicts the values for the given data with a fitted model.
+
+    Args:
+        model (Any): The fitted sklearn model.
+        x (Any): The data to predict values for.
+
+    Returns:
+        Any: The predicted values.
+    """
+    return model.predict(x)
@@ -0,0 +1,47 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+from collections.abc import Sequence
+from typing import Any, List, Union
+
+import numpy as np
+import pandas as pd
+
+
+class SplitView(Sequence):
+    """
+    Splits of a DataFrame or Series (e.g. the training parts of a k-fold splitter), stored as index arrays into the shared base object.
+    It behaves like a read-only list of the splits, but each split is materialized (using .iloc) only when it is accessed,
+    so k splits hold one copy of the data plus k index arrays instead of k copies of the data.
+    """
+
+    def __init__(self, base: Union[pd.DataFrame, pd.Series], indices_per_split: List[np.ndarray]):
+        self.base = base
+        self._indices_per_split = list(indices_per_split)
+
+    @property
+    def indices_per_split(self) -> List[np.ndarray]:
+        return list(self._indices_per_split)
+
+    def _materialize(self, indices: np.ndarray) -> Union[pd.DataFrame, pd.Series]:
+        return self.base.iloc[indices]
+
+    def __len__(self) -> int:
+        return len(self._indices_per_split)
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return SplitView(self.base, self._indices_per_split[i])
+
+        return self._materialize(self._indices_per_split[i])
+
+    def __iter__(self):
+        for indices in self._indices_per_split:
+            yield self._materialize(indices)
+
+    def __reduce__(self):
+        # pickle the base object and the indices instead of the materialized splits
+        return self.__class__, (self.base, self._indices_per_split)
+
+    def __repr__(self) -> str:
+        return f"SplitView({len(self)} splits of {self.base.__class__.__name__} with shape {self.base.shape})"
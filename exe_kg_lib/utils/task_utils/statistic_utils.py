@@ -0,0 +1,553 @@
+# Copyright (c) 2022 Robert Bosch GmbH
+# SPDX-License-Identifier: AGPL-3.0
+
+import re
+import warnings
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# statistics calculated by multi_statistics() if none are requested, similar to pandas.DataFrame.describe()
+DEFAULT_STATISTICS = "count mean std min p25 median p75 max"
+
+# e.g. "p25" for the 25th percentile
+_PERCENTILE_REGEX = re.compile(r"^p(\d+(?:\.\d+)?)$")
+
+
+def multi_statistics(
+    values: Sequence[Any],
+    names: Sequence[str] = None,
+    statistics: Union[str, Sequence[str]] = DEFAULT_STATISTICS,
+    ddof: int = 0,
+) -> pd.DataFrame:
+    """
+    Calculates several statistics of several inputs at once.
+    The inputs are stacked as the columns of one array, and each statistic is calculated for all of them by a single
+    NumPy reduction (all percentiles by a single np.quantile() call). Intermediate results are shared,
+    e.g. the variance reuses the sums of the mean. Inputs of different lengths are padded and NaN values are ignored.
+
+    Supported statistics: "count", "sum", "mean", "var", "std", "min", "max", "distinct" (number of distinct values),
+    "median" and percentiles "p<percent>" (e.g. "p25", "p99.9").
+
+    Args:
+        values (Sequence[Any]): The inputs, e.g. single-column DataFrames, Series or arrays.
+        names (Sequence[str], optional): The names of the inputs. Defaults to the column names of DataFrame inputs,
+                                         the names of Series inputs and the positions of other inputs.
+        statistics (Union[str, Sequence[str]], optional): The statistics to calculate, as a space-separated string or a sequence.
+                                                          Defaults to DEFAULT_STATISTICS.
+        ddof (int, optional): The delta degrees of freedom of "var" and "std". Defaults to 0, as in NumPy.
+
+    Raises:
+        ValueError: If a statistic is not supported.
+
+    Returns:
+        pd.DataFrame: The statistics (rows, in the requested order) of the inputs (columns).
+    """
+    statistic_names = statistics.split() if isinstance(statistics, str) else list(statistics)
+    quantiles = {name: _get_quantile(name) for name in statistic_names if name not in _REDUCTIONS}
+    if names is None:
+        names = [_get_input_name(value, i) for i, value in enumerate(values)]
+
+    data = _stack_columns([np.asarray(value, dtype=np.float64).ravel() for value in values])
+
+    results = {}
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # e.g. statistics of empty or all-NaN inputs are NaN
+        context = _ReductionContext(data, ddof)
+        for name in statistic_names:
+            if name in _REDUCTIONS:
+                results[name] = context.get(name)
+
+        if quantiles and not len(data):
+            results.update((name, np.full(data.shape[1], np.nan)) for name in quantiles)
+        elif quantiles:
+            quantile_function = np.nanquantile if context.has_nan else np.quantile
+            quantile_results = quantile_function(data, list(quantiles.values()), axis=0)
+            results.update(zip(quantiles, quantile_results))
+
+    return pd.DataFrame([results[name] for name in statistic_names], index=statistic_names, columns=list(names))
+
+
+def sketch_statistics(
+    values: Sequence[Any],
+    names: Sequence[str] = None,
+    statistics: Union[str, Sequence[str]] = DEFAULT_STATISTICS,
+    ddof: int = 0,
+    k: int = 1000,
+    precision: int = 14,
+) -> pd.DataFrame:
+    """
+    Calculates several statistics of several inputs like multi_statistics(), but with the mergeable estimators of
+    StatisticsSketch, i.e. exactly for the moments and extrema and approximately for percentiles and distinct counts.
+    Whether the inputs are processed at once or chunk by chunk (see StatisticsSketch), the results agree within
+    the error of the estimators, so this method suits inputs that do not fit in memory (see ExecutionPlan.run_streaming()).
+
+    Args:
+        values (Sequence[Any]): The inputs, e.g. single-column DataFrames, Series or arrays.
+        names (Sequence[str], optional): The names of the inputs. Defaults as in multi_statistics().
+        statistics (Union[str, Sequence[str]], optional): The statistics to calculate, as in multi_statistics().
+        ddof (int, optional): The delta degrees of freedom of "var" and "std". Defaults to 0.
+        k (int, optional): The accuracy parameter of the percentiles (see QuantileSketch). Defaults to 1000.
+        precision (int, optional): The accuracy parameter of the distinct counts (see DistinctCountSketch). Defaults to 14.
+
+    Raises:
+        ValueError: If a statistic is not supported.
+
+    Returns:
+        pd.DataFrame: The statistics (rows, in the requested order) of the inputs (columns).
+    """
+    if names is None:
+        names = [_get_input_name(value, i) for i, value in enumerate(values)]
+
+    sketch = StatisticsSketch(names, statistics, ddof, k, precision)
+    sketch.update(values)
+    return sketch.to_frame()
+
+
+# methods of this module that can be calculated from chunks of the inputs with StatisticsSketch, with their allowed parameters
+STREAMABLE_METHODS = {
+    "multi_statistics": {"statistics", "ddof"},
+    "sketch_statistics": {"statistics", "ddof", "k", "precision"},
+}
+
+
+class StatisticsSketch:
+    """
+    Mergeable estimators of several statistics of several inputs, which are updated with chunks of the inputs
+    and can be merged with the sketches of other chunks (e.g. calculated in other processes, since sketches can be pickled).
+    Per input, it holds:
+        - a MomentSketch for "count", "sum", "mean", "var", "std", "min" and "max" (exact)
+        - a QuantileSketch for "median" and percentiles (approximate), if requested
+        - a DistinctCountSketch for "distinct" (approximate), if requested
+    NaN values are ignored, as in multi_statistics().
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        statistics: Union[str, Sequence[str]] = DEFAULT_STATISTICS,
+        ddof: int = 0,
+        k: int = 1000,
+        precision: int = 14,
+    ):
+        """
+        Args:
+            names (Sequence[str]): The names of the inputs.
+            statistics (Union[str, Sequence[str]], optional): The statistics to calculate, as in multi_statistics().
+            ddof (int, optional): The delta degrees of freedom of "var" and "std". Defaults to 0.
+            k (int, optional): The accuracy parameter of the percentiles (see QuantileSketch). Defaults to 1000.
+            precision (int, optional): The accuracy parameter of the distinct counts (see DistinctCountSketch). Defaults to 14.
+
+        Raises:
+            ValueError: If a statistic is not supported.
+        """
+        self.names = list(names)
+        self.statistic_names = statistics.split() if isinstance(statistics, str) else list(statistics)
+        self.quantiles = {name: _get_quantile(name) for name in self.statistic_names if name not in _REDUCTIONS}
+        self.ddof = ddof
+
+        self.moment_sketches = [MomentSketch() for _ in self.names]
+        self.quantile_sketches = [QuantileSketch(k) for _ in self.names] if self.quantiles else None
+        self.distinct_count_sketches = (
+            [DistinctCountSketch(precision) for _ in self.names] if "distinct" in self.statistic_names else None
+        )
+
+    def update(self, values: Sequence[Any]) -> None:
+        """
+        Updates the estimators with a chunk of each input.
+
+        Args:
+            values (Sequence[Any]): The chunks of the inputs, in the order of self.names.
+
+        Returns:
+            None
+        """
+        for i, value in enumerate(values):
+            column = np.asarray(value, dtype=np.float64).ravel()
+            column = column[~np.isnan(column)]
+            self.moment_sketches[i].update(column)
+            if self.quantile_sketches is not None:
+                self.quantile_sketches[i].update(column)
+            if self.distinct_count_sketches is not None:
+                self.distinct_count_sketches[i].update(column)
+
+    def merge(self, other: "StatisticsSketch") -> None:
+        """
+        Merges the estimators of another sketch of the same statistics and inputs into this sketch.
+
+        Args:
+            other (StatisticsSketch): The other sketch, e.g. of other chunks of the inputs.
+
+        Returns:
+            None
+        """
+        for sketches, other_sketches in (
+            (self.moment_sketches, other.moment_sketches),
+            (self.quantile_sketches, other.quantile_sketches),
+            (self.distinct_count_sketches, other.distinct_count_sketches),
+        ):
+            for sketch, other_sketch in zip(sketches or [], other_sketches or []):
+                sketch.merge(other_sketch)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: The statistics (rows, in the requested order) of the inputs (columns), as in multi_statistics().
+        """
+        rows = []
+        for name in self.statistic_names:
+            if name == "distinct":
+                rows.append([sketch.count() for sketch in self.distinct_count_sketches])
+            elif name in self.quantiles:
+                rows.append([sketch.quantile(self.quantiles[name]) for sketch in self.quantile_sketches])
+            else:
+                rows.append([sketch.get(name, self.ddof) for sketch in self.moment_sketches])
+
+        return pd.DataFrame(rows, index=self.statistic_names, columns=self.names, dtype=np.float64)
+
+
+class MomentSketch:
+    """
+    Count, sum, extrema and sum of squared deviations from the mean of a stream of values.
+    Chunks and other sketches are merged with the parallel algorithm of Chan et al. (a generalization of Welford's algorithm),
+    which is numerically stable. NaN values are skipped, as by the pandas reductions (e.g. DataFrame.mean()).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = np.float64(0)
+        self.mean = np.float64(np.nan)
+        self.m2 = np.float64(0)
+        self.min = np.float64(np.nan)
+        self.max = np.float64(np.nan)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Args:
+            values (np.ndarray): A chunk of the values, possibly with NaN values.
+
+        Returns:
+            None
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+
+        chunk_mean = values.mean()
+        self._combine(
+            len(values), values.sum(), chunk_mean, np.square(values - chunk_mean).sum(), values.min(), values.max()
+        )
+
+    def merge(self, other: "MomentSketch") -> None:
+        """
+        Args:
+            other (MomentSketch): The sketch of other values.
+
+        Returns:
+            None
+        """
+        if other.count:
+            self._combine(other.count, other.sum, other.mean, other.m2, other.min, other.max)
+
+    def get(self, statistic_name: str, ddof: int = 0) -> np.float64:
+        """
+        Args:
+            statistic_name (str): "count", "sum", "mean", "var", "std", "min" or "max".
+            ddof (int, optional): The delta degrees of freedom of "var" and "std". Defaults to 0.
+
+        Returns:
+            np.float64: The statistic of the values so far.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if statistic_name == "var":
+                return self.m2 / (self.count - ddof) if self.count else np.float64(np.nan)
+            if statistic_name == "std":
+                return np.sqrt(self.get("var", ddof))
+
+        return np.float64(getattr(self, statistic_name))
+
+    def _combine(
+        self,
+        other_count: int,
+        other_sum: np.float64,
+        other_mean: np.float64,
+        other_m2: np.float64,
+        other_min: np.float64,
+        other_max: np.float64,
+    ) -> None:
+        if self.count == 0:
+            self.mean, self.m2 = other_mean, other_m2
+            self.min, self.max = other_min, other_max
+        else:
+            total_count = self.count + other_count
+            delta = other_mean - self.mean
+            self.mean = self.mean + delta * other_count / total_count
+            self.m2 = self.m2 + other_m2 + delta**2 * self.count * other_count / total_count
+            self.min, self.max = np.minimum(self.min, other_min), np.maximum(self.max, other_max)
+
+        self.count += other_count
+        self.sum = self.sum + other_sum
+
+
+class QuantileSketch:
+    """
+    KLL sketch (Karnin, Lang and Liberty) of the quantiles of a stream of numbers.
+    Values are kept in levels, where a value at level h stands for 2^h values of the stream. When a level exceeds
+    its capacity (k for the top level, decreasing by a factor of 2/3 per level below), it is sorted and every other value
+    is promoted to the next level. The rank error is roughly 2 / k of the number of values (0.2% for the default k of 1000),
+    independently of their number, and the memory is O(k). Sketches of different values are merged by concatenating their levels.
+    Quantiles are interpolated linearly between the values, so that they match np.quantile() as long as no level was compacted.
+    """
+
+    def __init__(self, k: int = 1000, seed: int = 0):
+        """
+        Args:
+            k (int, optional): The capacity of the top level, which determines the accuracy. Defaults to 1000.
+            seed (int, optional): The seed for choosing the promoted values, so that the results are reproducible. Defaults to 0.
+        """
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Args:
+            values (np.ndarray): A chunk of the values, without NaN values.
+
+        Returns:
+            None
+        """
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Args:
+            other (QuantileSketch): The sketch of other values.
+
+        Returns:
+            None
+        """
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+
+    def quantile(self, q: float) -> np.float64:
+        """
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            np.float64: The estimated quantile of the values so far, or NaN if there are none.
+        """
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return np.float64(np.nan)
+
+        weights = np.concatenate([np.full(len(level), 2**h, dtype=np.float64) for h, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative_weights = values[order], np.cumsum(weights[order])
+
+        # rank of the quantile among the represented values, and the values that hold the ranks around it
+        rank = q * (cumulative_weights[-1] - 1)
+        lower_i, upper_i = np.searchsorted(cumulative_weights, [np.floor(rank), np.ceil(rank)], side="right")
+        lower_i, upper_i = min(lower_i, len(values) - 1), min(upper_i, len(values) - 1)
+        return values[lower_i] + (rank - np.floor(rank)) * (values[upper_i] - values[lower_i])
+
+    def _get_capacity(self, h: int) -> int:
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - h))))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self._get_capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(level)
+                kept = level[len(level) - len(level) % 2 :]  # with an odd number of values, the largest one stays
+                promoted = level[int(self._rng.integers(2)) : len(level) - len(kept) : 2]
+                self.levels[h] = kept
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+
+class DistinctCountSketch:
+    """
+    HyperLogLog sketch (Flajolet et al.) of the number of distinct values of a stream.
+    Each value is hashed to 64 bits, whose first precision bits select one of 2^precision registers, which holds
+    the maximum position of the first 1-bit in the remaining bits of the hashes it received. The relative error is about
+    1.04 / sqrt(2^precision) (0.8% for the default precision of 14, with 16 KB of registers), and small counts are
+    estimated by linear counting. Sketches of different values are merged by the maximum of their registers.
+    Values are hashed by pandas.util.hash_array(), so that the hashes are the same in all processes.
+    """
+
+    # powers of two, for calculating the bit length of 64-bit hashes without converting them to floats
+    _POWERS_OF_TWO = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+
+    def __init__(self, precision: int = 14):
+        """
+        Args:
+            precision (int, optional): The number of bits that select the register, between 4 and 18. Defaults to 14.
+
+        Raises:
+            ValueError: If the precision is out of range.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"The precision of a distinct count sketch must be between 4 and 18, got {precision}")
+
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Args:
+            values (np.ndarray): A chunk of the values.
+
+        Returns:
+            None
+        """
+        if not len(values):
+            return
+
+        hashes = pd.util.hash_array(np.asarray(values))
+        register_is = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        remaining_bits = hashes << np.uint64(self.precision)
+        bit_lengths = np.searchsorted(self._POWERS_OF_TWO, remaining_bits, side="right")
+        ranks = np.minimum(64 - bit_lengths + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, register_is, ranks)
+
+    def merge(self, other: "DistinctCountSketch") -> None:
+        """
+        Args:
+            other (DistinctCountSketch): The sketch of other values, with the same precision.
+
+        Returns:
+            None
+        """
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> np.float64:
+        """
+        Returns:
+            np.float64: The estimated number of distinct values so far.
+        """
+        register_count = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / register_count)
+        estimate = alpha * register_count**2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        empty_register_count = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * register_count and empty_register_count:
+            estimate = register_count * np.log(register_count / empty_register_count)
+
+        return np.float64(np.round(estimate))
+
+
+class _ReductionContext:
+    """
+    The stacked inputs with the reductions that several statistics share, each calculated at most once.
+    """
+
+    def __init__(self, data: np.ndarray, ddof: int):
+        self.data = data
+        self.ddof = ddof
+        self.has_nan = bool(np.isnan(data).any())
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str) -> np.ndarray:
+        if name not in self._cache:
+            self._cache[name] = _REDUCTIONS[name](self)
+        return self._cache[name]
+
+
+def _count(context: _ReductionContext) -> np.ndarray:
+    if context.has_nan:
+        return (~np.isnan(context.data)).sum(axis=0).astype(np.float64)
+    return np.full(context.data.shape[1], context.data.shape[0], dtype=np.float64)
+
+
+def _sum(context: _ReductionContext) -> np.ndarray:
+    return np.nansum(context.data, axis=0) if context.has_nan else context.data.sum(axis=0)
+
+
+def _mean(context: _ReductionContext) -> np.ndarray:
+    return context.get("sum") / context.get("count")
+
+
+def _var(context: _ReductionContext) -> np.ndarray:
+    squared_deviations = np.square(context.data - context.get("mean"))
+    sum_of_squares = np.nansum(squared_deviations, axis=0) if context.has_nan else squared_deviations.sum(axis=0)
+    return sum_of_squares / (context.get("count") - context.ddof)
+
+
+def _std(context: _ReductionContext) -> np.ndarray:
+    return np.sqrt(context.get("var"))
+
+
+def _min(context: _ReductionContext) -> np.ndarray:
+    return np.nanmin(context.data, axis=0) if context.has_nan else context.data.min(axis=0)
+
+
+def _max(context: _ReductionContext) -> np.ndarray:
+    return np.nanmax(context.data, axis=0) if context.has_nan else context.data.max(axis=0)
+
+
+def _distinct(context: _ReductionContext) -> np.ndarray:
+    return np.array([len(np.unique(column[~np.isnan(column)])) for column in context.data.T], dtype=np.float64).reshape(
+        context.data.shape[1]
+    )
+
+
+_REDUCTIONS = {
+    "count": _count,
+    "sum": _sum,
+    "mean": _mean,
+    "var": _var,
+    "std": _std,
+    "min": _min,
+    "max": _max,
+    "distinct": _distinct,
+}
+
+
+def _get_quantile(statistic_name: str) -> float:
+    if statistic_name == "median":
+        return 0.5
+
+    match = _PERCENTILE_REGEX.match(statistic_name)
+    if match is None or float(match.group(1)) > 100:
+        raise ValueError(
+            f"Statistic {statistic_name} is not supported. Supported statistics: "
+            f"{', '.join(_REDUCTIONS)}, median and percentiles (e.g. p25)"
+        )
+
+    return float(match.group(1)) / 100
+
+
+def _get_input_name(value: Any, i: int) -> str:
+    if isinstance(value, pd.DataFrame) and len(value.columns) == 1:
+        return str(value.columns[0])
+    if isinstance(value, pd.Series) and value.name is not None:
+        return str(value.name)
+
+    return str(i)
+
+
+def _stack_columns(columns: List[np.ndarray]) -> np.ndarray:
+    # one (rows x inputs) array, with inputs shorter than the longest one padded with NaN
+    if not columns:
+        return np.empty((0, 0))
+
+    row_count = max(len(column) for column in columns)
+    if all(len(column) == row_count for column in columns):
+        return np.column_stack(columns)
+
+    data = np.full((row_count, len(columns)), np.nan)
+    for i, column in enumerate(columns):
+        data[: len(column), i] = column
+
+    return data